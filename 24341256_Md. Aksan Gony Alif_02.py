@@ -4,6 +4,9 @@ from OpenGL.GLU import *
 import random
 import sys
 import time
+import numpy
+from midpoint import stepped_line_points, octant_circle_points, draw_points
+from bitmap_text import BitmapText
 
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
@@ -46,9 +49,7 @@ buttons = [
 ]
 
 def draw_button_text(x, y, text):
-    glRasterPos2f(x, y)
-    for char in text:
-        glutBitmapCharacter(GLUT_BITMAP_HELVETICA_18, ord(char))
+    text_renderer.draw(GLUT_BITMAP_HELVETICA_18, text, x, y)
 
 def midpoint_line(x0, y0, x1, y1):
     dx = abs(x1 - x0)
@@ -111,12 +112,12 @@ def draw_bullets():
     glEnd()
 
 def draw_circles():
-    for circle in circles:
-        if circle.get("bonus"):
-            glColor3f(0, 0, 1)
-        else:
-            glColor3f(1, 1, 1)
-        midpoint_circle(circle["x"], circle["y"], circle["radius"])
+    #All circles in one batch (the pixels midpoint_circle would plot), blue for bonus and white otherwise
+    if not circles:
+        return
+    points, counts = octant_circle_points([(c["x"], c["y"], c["radius"]) for c in circles], return_counts=True)
+    colors = [(0, 0, 1) if c.get("bonus") else (1, 1, 1) for c in circles]
+    draw_points(points, numpy.repeat(numpy.asarray(colors, dtype=numpy.float32), counts, axis=0))
 
 def update_expanding_circles():
     global expanding_circles
@@ -138,10 +139,8 @@ def update_expanding_circles():
 
 def draw_score():
     glColor3f(1, 1, 1)
-    glRasterPos2f(10, WINDOW_HEIGHT - 30)
     score_text = f"Score: {score}"
-    for char in score_text:
-        glutBitmapCharacter(GLUT_BITMAP_HELVETICA_18, ord(char))
+    text_renderer.draw(GLUT_BITMAP_HELVETICA_18, score_text, 10, WINDOW_HEIGHT - 30)
 
 def restart_game():
     global shooter_x, bullets, circles, score, missed_circles, game_over, expanding_circles, circle_base_speed
@@ -269,23 +268,23 @@ def mouse(button, state, x, y):
 def draw_game_over():
 
     glColor3f(1, 1, 1)
-    glRasterPos2f(300, 300)
-    for char in "GAME OVER!":
-        glutBitmapCharacter(GLUT_BITMAP_HELVETICA_18, ord(char))
-    glRasterPos2f(300, 250)
-    for char in f"Your Score: {score}":
-        glutBitmapCharacter(GLUT_BITMAP_HELVETICA_18, ord(char))
-    glRasterPos2f(300, 200)
-    for char in "Press 'R' to Restart or 'Q' to Quit":
-        glutBitmapCharacter(GLUT_BITMAP_HELVETICA_18, ord(char))
+    text_renderer.draw(GLUT_BITMAP_HELVETICA_18, "GAME OVER!", 300, 300)
+    text_renderer.draw(GLUT_BITMAP_HELVETICA_18, f"Your Score: {score}", 300, 250)
+    text_renderer.draw(GLUT_BITMAP_HELVETICA_18, "Press 'R' to Restart or 'Q' to Quit", 300, 200)
 
 def draw_buttons():
+    #Outlines of every button in one batch (the pixels midpoint_line would plot)
+    outlines = []
+    for button in buttons:
+        outlines += [
+            (button["x"], button["y"], button["x"] + button_width, button["y"]),
+            (button["x"], button["y"], button["x"], button["y"] + button_height),
+            (button["x"], button["y"] + button_height, button["x"] + button_width, button["y"] + button_height),
+            (button["x"] + button_width, button["y"], button["x"] + button_width, button["y"] + button_height),
+        ]
+    glColor3f(1, 1, 1)
+    draw_points(stepped_line_points(outlines))
     for button in buttons:
-        glColor3f(1, 1, 1)
-        midpoint_line(button["x"], button["y"], button["x"] + button_width, button["y"])
-        midpoint_line(button["x"], button["y"], button["x"], button["y"] + button_height)
-        midpoint_line(button["x"], button["y"] + button_height, button["x"] + button_width, button["y"] + button_height)
-        midpoint_line(button["x"] + button_width, button["y"], button["x"] + button_width, button["y"] + button_height)
         glColor3f(0, 1, 0)
         draw_button_text(button["x"] + 12, button["y"] + 15, button["label"])
 
@@ -304,8 +303,10 @@ def timer(value):
     glutTimerFunc(16, timer, 0)  #60 FPS
 
 def init():
+    global text_renderer
     glClearColor(0, 0, 0, 1)
     gluOrtho2D(0, WINDOW_WIDTH, 0, WINDOW_HEIGHT)
+    text_renderer = BitmapText()
 
 glutInit(sys.argv)
 glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB)
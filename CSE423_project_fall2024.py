@@ -1,9 +1,24 @@
 from OpenGL.GL import *
 from OpenGL.GLUT import *
 from OpenGL.GLU import *
+# Record glBegin/glEnd point runs and draw each one with a single array call
+from OpenGL.GL.immediate import *
 import random
 import time
 import math
+import numpy
+from midpoint import line_points, circle_points, draw_points
+from collision import LaneGrid
+from entities import EntityPool, EntityView, Field
+from timestep import FixedTimestep
+from bitmap_text import BitmapText
+from layers import ScrollingLayer
+import replay
+import argparse
+import atexit
+import hashlib
+import os
+import sys
 
 # Game constants
 WINDOW_WIDTH = 800
@@ -14,17 +29,23 @@ TOTAL_LANES = LANE_COUNT * 2
 CAR_WIDTH = 40
 CAR_HEIGHT = 60
 FPS = 60
-FRAME_TIME = 1500 // FPS
+FRAME_TIME = 1000 // FPS
+MAX_CATCH_UP_STEPS = 5
 SAFE_DISTANCE = CAR_HEIGHT * 1.2
 BASE_TRAFFIC_DENSITY = 0.3
 DIFFICULTY_INCREASE_INTERVAL = 1000
 MAX_TRAFFIC_DENSITY = 0.6
 BASE_CAR_SPEED = 2
 MAX_CAR_SPEED = 8
+MARKER_HEIGHT = 40
+MARKER_GAP = 30
+MARKER_PERIOD = MARKER_HEIGHT + MARKER_GAP
 BULLET_SPEED = 10
 BULLET_SIZE = 5
+MAX_BULLETS = 200
+MAX_CARS = 8
 EXPLOSION_DURATION = 15
-EXPLOSION_PARTICLES = 15
+EXPLOSION_PARTICLES = 1000
 BOSS_HEALTH = 10
 BOSS_SPAWN_INTERVAL = 2
 BOSS_SHOOT_INTERVAL = 30
@@ -98,74 +119,114 @@ def draw_circle(x_center, y_center, radius):
     glEnd()
 
 
-class Bullet:
+def draw_lines(lines, colours=None):
+    """Draw many midpoint lines with one call, optionally one colour per line"""
+    points, counts = line_points(lines, return_counts=True)
+    if colours is not None:
+        colours = numpy.repeat(numpy.asarray(colours, dtype=numpy.float32), counts, axis=0)
+    draw_points(points, colours)
+
+
+def draw_circles(circles, colours=None):
+    """Draw many midpoint circles with one call, optionally one colour per circle"""
+    points, counts = circle_points(circles, return_counts=True)
+    if colours is not None:
+        colours = numpy.repeat(numpy.asarray(colours, dtype=numpy.float32), counts, axis=0)
+    draw_points(points, colours)
+
+
+# Entity storage: one array per field, updated in bulk every frame
+CAR_POOL = EntityPool(64)
+BULLET_POOL = EntityPool(256)
+PARTICLE_POOL = EntityPool(4096)
+PARTICLE_RNG = numpy.random.default_rng()
+PARTICLE_PALETTE = numpy.array([
+    (1.0, 0.3, 0.0),  # Orange
+    (1.0, 0.0, 0.0),  # Red
+    (1.0, 1.0, 0.0),  # Yellow
+    (1.0, 0.5, 0.0),  # Light orange
+    (0.8, 0.2, 0.0),  # Dark orange
+])
+
+
+def seed_game(seed):
+    """Seed every random source the game uses, for reproducible runs"""
+    global PARTICLE_RNG
+    random.seed(seed)
+    PARTICLE_RNG = numpy.random.default_rng(seed)
+
+
+class Bullet(EntityView):
+    pool = BULLET_POOL
+    speed = Field('dy')
+
     def __init__(self, x, y, player_id=1, is_boss=False):
-        self.x = x
-        self.y = y
-        self.speed = BOSS_BULLET_SPEED if is_boss else BULLET_SPEED
+        super().__init__(x=x, y=y, dy=BOSS_BULLET_SPEED if is_boss else BULLET_SPEED)
         self.is_boss = is_boss
         self.player_id = player_id  # 1 for red player, 2 for blue player
 
-    def update(self):
-        self.y += self.speed
-
-    def draw(self):
+    def get_color(self):
         if self.is_boss:
-            glColor3f(1.0, 0.5, 0.0)
-        else:
-            # Color bullets based on player
-            if self.player_id == 1:
-                glColor3f(1.0, 0.0, 0.0)  # Red
-            else:
-                glColor3f(0.0, 0.0, 1.0)  # Blue
-        draw_circle(int(self.x), int(self.y), BULLET_SIZE)
+            return (1.0, 0.5, 0.0)
+        # Color bullets based on player
+        if self.player_id == 1:
+            return (1.0, 0.0, 0.0)  # Red
+        return (0.0, 0.0, 1.0)  # Blue
+
 
 
+class ExplosionParticle(EntityView):
+    pool = PARTICLE_POOL
+    lifetime = Field('lifetime')
+    size = Field('size')
 
-class ExplosionParticle:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(3, 8)  # Increased speed range
-        self.dx = math.cos(angle) * speed
-        self.dy = math.sin(angle) * speed
-        self.lifetime = EXPLOSION_DURATION
+    @classmethod
+    def burst(cls, x, y, count, group):
+        """Spawn count particles flying out from (x, y) in one step"""
+        angle = PARTICLE_RNG.uniform(0, 2 * math.pi, count)
+        speed = PARTICLE_RNG.uniform(3, 8, count)  # Increased speed range
+        colour = numpy.ones((count, 4))
         # Random color from a vibrant palette
-        self.color = random.choice([
-            (1.0, 0.3, 0.0),  # Orange
-            (1.0, 0.0, 0.0),  # Red
-            (1.0, 1.0, 0.0),  # Yellow
-            (1.0, 0.5, 0.0),  # Light orange
-            (0.8, 0.2, 0.0),  # Dark orange
-        ])
-        self.size = random.randint(2, 4)  # Random particle size
+        colour[:, :3] = PARTICLE_PALETTE[PARTICLE_RNG.integers(len(PARTICLE_PALETTE), size=count)]
+        cls.pool.allocate(
+            count, x=x, y=y,
+            dx=numpy.cos(angle) * speed, dy=numpy.sin(angle) * speed,
+            lifetime=EXPLOSION_DURATION,
+            size=PARTICLE_RNG.integers(2, 5, size=count),  # Random particle size
+            group=group, colour=colour,
+        )
 
-    def update(self):
-        self.x += self.dx
-        self.y += self.dy
-        self.dx *= 0.98  # Add slight deceleration
-        self.dy *= 0.98
-        self.lifetime -= 1
+    @classmethod
+    def update_all(cls):
+        cls.pool.advance()
+        cls.pool.damp(0.98)  # Add slight deceleration
+        cls.pool.age()
+
+    @classmethod
+    def draw_all(cls, alpha=1.0):
+        live = cls.pool.live()
+        if not len(live):
+            return
+        # Draw larger particles using small circles that fade out
+        x, y = cls.pool.interpolate(live, alpha)
+        circles = numpy.column_stack((x, y, cls.pool.size[live]))
+        colours = cls.pool.colour[live]
+        colours[:, 3] = cls.pool.lifetime[live] / EXPLOSION_DURATION
+        draw_circles(circles.astype(numpy.int64), colours)
 
-    def draw(self):
-        alpha = self.lifetime / EXPLOSION_DURATION
-        r, g, b = self.color
-        glColor4f(r, g, b, alpha)
-        # Draw larger particle using a small circle
-        draw_circle(int(self.x), int(self.y), self.size)
 
+class Car(EntityView):
+    pool = CAR_POOL
+    health = Field('health')
+    explosions = 0
 
-class Car:
     def __init__(self, x, y, color, speed=0, direction=1, is_boss=False, is_player2=False):
-        self.x = x
-        self.y = y
+        super().__init__(x=x, y=y, health=BOSS_HEALTH if is_boss else 3)
         self.color = color
-        self.speed = speed
         self.lane = LANE_COUNT - 1
         self.direction = direction
-        self.health = BOSS_HEALTH if is_boss else 3
-        self.explosion_particles = []
+        self.speed = speed
+        self.explosion_group = 0
         self.is_boss = is_boss
         self.shoot_cooldown = 0
         self.is_player2 = is_player2
@@ -174,6 +235,15 @@ class Car:
         self.is_respawning = False
         self.respawn_timer = 0
 
+    @property
+    def speed(self):
+        return -self.dy * self.direction
+
+    @speed.setter
+    def speed(self, value):
+        # Traffic (direction 1) drives down the screen, oncoming cars drive up
+        self.dy = -value * self.direction
+
     def hit(self):
         if self.is_exploded:
             return False
@@ -196,81 +266,75 @@ class Car:
             self.health = BOSS_HEALTH
             self.is_exploded = False
             self.is_respawning = False
-            self.explosion_particles = []
+            PARTICLE_POOL.release(PARTICLE_POOL.alive & (PARTICLE_POOL.group == self.explosion_group))
             return True
         return False
 
 
     def create_explosion(self):
-        self.explosion_particles = [ExplosionParticle(self.x, self.y)
-                                  for _ in range(EXPLOSION_PARTICLES)]
-
-    def draw(self):
-        # Draw explosion particles if they exist
-        for particle in self.explosion_particles[:]:
-            particle.draw()
-            particle.update()
-            if particle.lifetime <= 0:
-                self.explosion_particles.remove(particle)
+        Car.explosions += 1
+        self.explosion_group = Car.explosions
+        ExplosionParticle.burst(self.x, self.y, EXPLOSION_PARTICLES, self.explosion_group)
 
+    def draw(self, alpha=1.0):
         if self.health > 0:
+            x, y = self.render_position(alpha)
+
+            # Collect every outline segment with its colour and draw them in one batch
+            lines = []
+            colors = []
+
             # Draw car body with boss modifications if it's a boss
-            glColor3f(*self.color)
-            x1 = int(self.x - CAR_WIDTH // 2)
-            y1 = int(self.y - CAR_HEIGHT // 2)
-            x2 = int(self.x + CAR_WIDTH // 2)
-            y2 = int(self.y + CAR_HEIGHT // 2)
+            x1 = int(x - CAR_WIDTH // 2)
+            y1 = int(y - CAR_HEIGHT // 2)
+            x2 = int(x + CAR_WIDTH // 2)
+            y2 = int(y + CAR_HEIGHT // 2)
 
             # Draw car body
-            draw_line(x1, y1, x2, y1)
-            draw_line(x2, y1, x2, y2)
-            draw_line(x2, y2, x1, y2)
-            draw_line(x1, y2, x1, y1)
+            lines += [(x1, y1, x2, y1), (x2, y1, x2, y2), (x2, y2, x1, y2), (x1, y2, x1, y1)]
+            colors += [self.color] * 4
 
             # Draw windows
-            glColor3f(0.7, 0.9, 1.0)
             window_height = CAR_HEIGHT // 4
-            window_y = int(self.y + window_height // 2 if self.direction == 1
-                           else self.y - window_height // 2)
+            window_y = int(y + window_height // 2 if self.direction == 1
+                           else y - window_height // 2)
 
-            wx1 = int(self.x - CAR_WIDTH // 3)
-            wx2 = int(self.x + CAR_WIDTH // 3)
+            wx1 = int(x - CAR_WIDTH // 3)
+            wx2 = int(x + CAR_WIDTH // 3)
             wy2 = window_y + window_height
 
-            draw_line(wx1, window_y, wx2, window_y)
-            draw_line(wx2, window_y, wx2, wy2)
-            draw_line(wx2, wy2, wx1, wy2)
-            draw_line(wx1, wy2, wx1, window_y)
+            lines += [(wx1, window_y, wx2, window_y), (wx2, window_y, wx2, wy2),
+                      (wx2, wy2, wx1, wy2), (wx1, wy2, wx1, window_y)]
+            colors += [(0.7, 0.9, 1.0)] * 4
 
             # Draw boss car modifications
             if self.is_boss:
                 # Add extra width to boss car
                 extra_width = 10
-                glColor3f(*self.color)
-                draw_line(x1 - extra_width, y1, x2 + extra_width, y1)
-                draw_line(x2 + extra_width, y1, x2 + extra_width, y2)
-                draw_line(x2 + extra_width, y2, x1 - extra_width, y2)
-                draw_line(x1 - extra_width, y2, x1 - extra_width, y1)
+                lines += [(x1 - extra_width, y1, x2 + extra_width, y1),
+                          (x2 + extra_width, y1, x2 + extra_width, y2),
+                          (x2 + extra_width, y2, x1 - extra_width, y2),
+                          (x1 - extra_width, y2, x1 - extra_width, y1)]
+                colors += [self.color] * 4
 
             # Draw health bar with position based on direction
             health_width = int((CAR_WIDTH * self.health) / (BOSS_HEALTH if self.is_boss else 3))
-            glColor3f(0.0, 1.0, 0.0)
 
             if self.direction == 1:  # Downward moving cars
-                hx1 = int(self.x - CAR_WIDTH / 2)
-                hy1 = int(self.y - CAR_HEIGHT / 2 - 8)
+                hx1 = int(x - CAR_WIDTH / 2)
+                hy1 = int(y - CAR_HEIGHT / 2 - 8)
                 hx2 = int(hx1 + health_width)
                 hy2 = hy1 + 3
             else:  # Upward moving cars
-                hx1 = int(self.x - CAR_WIDTH / 2)
-                hy1 = int(self.y + CAR_HEIGHT / 2 + 5)
+                hx1 = int(x - CAR_WIDTH / 2)
+                hy1 = int(y + CAR_HEIGHT / 2 + 5)
                 hx2 = int(hx1 + health_width)
                 hy2 = hy1 + 3
 
-            draw_line(hx1, hy1, hx2, hy1)
-            draw_line(hx2, hy1, hx2, hy2)
-            draw_line(hx2, hy2, hx1, hy2)
-            draw_line(hx1, hy2, hx1, hy1)
+            lines += [(hx1, hy1, hx2, hy1), (hx2, hy1, hx2, hy2), (hx2, hy2, hx1, hy2), (hx1, hy2, hx1, hy1)]
+            colors += [(0.0, 1.0, 0.0)] * 4
+
+            draw_lines(lines, colors)
 
 class Game:
     def __init__(self):
@@ -299,6 +363,11 @@ class Game:
         self.show_controls = True
         self.control_timer = 180  # Show for 3 seconds (60 FPS * 3)
 
+        # Game logic runs at a fixed FPS steps per second regardless of drawing speed
+        self.timestep = FixedTimestep(1.0 / FPS, MAX_CATCH_UP_STEPS)
+
+        self.road_layer = ScrollingLayer(self.draw_road_surface, self.draw_lane_markers, MARKER_PERIOD)
+
     def draw_pause_menu(self):
         # Draw semi-transparent overlay
         glColor4f(0.0, 0.0, 0.0, 0.5)
@@ -314,9 +383,7 @@ class Game:
         x_pos = (WINDOW_WIDTH - text_width) // 2
         y_pos = WINDOW_HEIGHT // 2 + 50
 
-        glRasterPos2f(x_pos, y_pos)
-        for c in pause_text:
-            glutBitmapCharacter(GLUT_BITMAP_TIMES_ROMAN_24, ord(c))
+        text_renderer.draw(GLUT_BITMAP_TIMES_ROMAN_24, pause_text, x_pos, y_pos)
 
         # Draw pause menu options
         for i, option in enumerate(self.pause_options):
@@ -329,9 +396,7 @@ class Game:
             x_pos = (WINDOW_WIDTH - text_width) // 2
             y_pos = WINDOW_HEIGHT // 2 - i * 30
 
-            glRasterPos2f(x_pos, y_pos)
-            for c in option:
-                glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(c))
+            text_renderer.draw(GLUT_BITMAP_9_BY_15, option, x_pos, y_pos)
 
 
     def get_current_difficulty(self):
@@ -415,9 +480,9 @@ class Game:
     def spawn_new_car(self, is_traffic):
         difficulty = self.get_current_difficulty()
 
-        if is_traffic and len(self.traffic_cars) >= 10:
+        if is_traffic and len(self.traffic_cars) >= MAX_CARS:
             return
-        if not is_traffic and len(self.oncoming_cars) >= 10:
+        if not is_traffic and len(self.oncoming_cars) >= MAX_CARS:
             return
 
         if is_traffic:
@@ -446,33 +511,41 @@ class Game:
                 abs(car1.y - car2.y) < CAR_HEIGHT * 0.8)
 
     def draw_road(self):
+        # Surface and markers are rasterised once into textures, see layers.py
+        offset = -self.lane_offset % MARKER_PERIOD
+        self.road_layer.draw(WINDOW_WIDTH, WINDOW_HEIGHT, offset,
+                             key=(ROAD_WIDTH, TOTAL_LANES, LANE_COUNT))
+
+    def draw_road_surface(self):
         road_x = (WINDOW_WIDTH - ROAD_WIDTH) // 2
         center_line_x = WINDOW_WIDTH // 2
 
         # Road surface
         glColor3f(0.3, 0.3, 0.3)
-        for y in range(0, WINDOW_HEIGHT, 2):
-            draw_line(road_x, y, road_x + ROAD_WIDTH, y)
+        draw_lines([(road_x, y, road_x + ROAD_WIDTH, y) for y in range(0, WINDOW_HEIGHT, 2)])
 
         # Center line
         glColor3f(1, 1, 0)
-        draw_line(center_line_x - 2, 0, center_line_x - 2, WINDOW_HEIGHT)
-        draw_line(center_line_x + 2, 0, center_line_x + 2, WINDOW_HEIGHT)
+        draw_lines([(center_line_x - 2, 0, center_line_x - 2, WINDOW_HEIGHT),
+                    (center_line_x + 2, 0, center_line_x + 2, WINDOW_HEIGHT)])
 
-        # Lane markers
+    def draw_lane_markers(self):
+        """One marker per lane boundary at y=0, the layer repeats it every MARKER_PERIOD"""
+        road_x = (WINDOW_WIDTH - ROAD_WIDTH) // 2
         glColor3f(1, 1, 1)
-        marker_height = 40
-        marker_gap = 30
-        offset = -self.lane_offset % (marker_height + marker_gap)
-
+        markers = []
         for lane in range(1, TOTAL_LANES):
             if lane != LANE_COUNT:
                 x = road_x + (lane * self.lane_width)
-                for y in range(int(offset), WINDOW_HEIGHT, marker_height + marker_gap):
-                    draw_line(x - 1, y, x - 1, y + marker_height)
-                    draw_line(x + 1, y, x + 1, y + marker_height)
+                markers.append((x - 1, 0, x - 1, MARKER_HEIGHT))
+                markers.append((x + 1, 0, x + 1, MARKER_HEIGHT))
+        draw_lines(markers)
 
     def start_game(self, multiplayer=False):
+        CAR_POOL.clear()
+        BULLET_POOL.clear()
+        PARTICLE_POOL.clear()
+
         center_lane = LANE_COUNT - 1
         start_x = (WINDOW_WIDTH - ROAD_WIDTH) // 2 + (center_lane * self.lane_width) + (self.lane_width // 2)
 
@@ -507,9 +580,7 @@ class Game:
         # Draw title
         glColor3f(1, 1, 1)
         title = "CAR DESTROYER"
-        glRasterPos2f(WINDOW_WIDTH // 2 - 50, WINDOW_HEIGHT - 100)
-        for c in title:
-            glutBitmapCharacter(GLUT_BITMAP_TIMES_ROMAN_24, ord(c))
+        text_renderer.draw(GLUT_BITMAP_TIMES_ROMAN_24, title, WINDOW_WIDTH // 2 - 50, WINDOW_HEIGHT - 100)
 
         # Draw menu options
         for i, option in enumerate(self.menu_options):
@@ -518,9 +589,7 @@ class Game:
             else:
                 glColor3f(1, 1, 1)  # White for unselected options
 
-            glRasterPos2f(WINDOW_WIDTH // 2 - 40, WINDOW_HEIGHT // 2 - i * 30)
-            for c in option:
-                glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(c))
+            text_renderer.draw(GLUT_BITMAP_9_BY_15, option, WINDOW_WIDTH // 2 - 40, WINDOW_HEIGHT // 2 - i * 30)
 
         glutSwapBuffers()
 
@@ -559,9 +628,7 @@ class Game:
         glColor3f(1.0, 0.0, 0.0)
         main_text = "Game Over!"
         x_pos = (WINDOW_WIDTH - len(main_text) * 15) // 2
-        glRasterPos2f(x_pos, WINDOW_HEIGHT // 2 + 60)
-        for c in main_text:
-            glutBitmapCharacter(GLUT_BITMAP_TIMES_ROMAN_24, ord(c))
+        text_renderer.draw(GLUT_BITMAP_TIMES_ROMAN_24, main_text, x_pos, WINDOW_HEIGHT // 2 + 60)
 
         # Multiplayer specific display
         if self.game_state == STATE_GAME_OVER and self.player2 is not None:
@@ -569,16 +636,12 @@ class Game:
             # Player 1 score
             score1_text = f"Red Player: {self.player.score}"
             x_pos = (WINDOW_WIDTH - len(score1_text) * 10) // 2
-            glRasterPos2f(x_pos, WINDOW_HEIGHT // 2)
-            for c in score1_text:
-                glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(c))
+            text_renderer.draw(GLUT_BITMAP_9_BY_15, score1_text, x_pos, WINDOW_HEIGHT // 2)
 
             # Player 2 score
             score2_text = f"Blue Player: {self.player2.score}"
             x_pos = (WINDOW_WIDTH - len(score2_text) * 10) // 2
-            glRasterPos2f(x_pos, WINDOW_HEIGHT // 2 - 30)
-            for c in score2_text:
-                glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(c))
+            text_renderer.draw(GLUT_BITMAP_9_BY_15, score2_text, x_pos, WINDOW_HEIGHT // 2 - 30)
 
             # Winner announcement
             if self.winner == "Red":
@@ -592,25 +655,19 @@ class Game:
                 winner_text = "It's a Tie!"
 
             x_pos = (WINDOW_WIDTH - len(winner_text) * 10) // 2
-            glRasterPos2f(x_pos, WINDOW_HEIGHT // 2 - 60)
-            for c in winner_text:
-                glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(c))
+            text_renderer.draw(GLUT_BITMAP_9_BY_15, winner_text, x_pos, WINDOW_HEIGHT // 2 - 60)
         else:
             # Single player score
             glColor3f(1.0, 1.0, 1.0)
             score_text = f"Final Score: {self.player.score}"
             x_pos = (WINDOW_WIDTH - len(score_text) * 10) // 2
-            glRasterPos2f(x_pos, WINDOW_HEIGHT // 2 - 20)
-            for c in score_text:
-                glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(c))
+            text_renderer.draw(GLUT_BITMAP_9_BY_15, score_text, x_pos, WINDOW_HEIGHT // 2 - 20)
 
         # Continue prompt
         glColor3f(1.0, 1.0, 1.0)
         continue_text = "Press ENTER to return to menu"
         x_pos = (WINDOW_WIDTH - len(continue_text) * 10) // 2
-        glRasterPos2f(x_pos, WINDOW_HEIGHT // 2 - 100)
-        for c in continue_text:
-            glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(c))
+        text_renderer.draw(GLUT_BITMAP_9_BY_15, continue_text, x_pos, WINDOW_HEIGHT // 2 - 100)
 
         glutSwapBuffers()
 
@@ -644,19 +701,20 @@ class Game:
         y_pos = WINDOW_HEIGHT // 2 + 100
         for line in controls:
             x_pos = (WINDOW_WIDTH - len(line) * 9) // 2
-            glRasterPos2f(x_pos, y_pos)
-            for c in line:
-                glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(c))
+            text_renderer.draw(GLUT_BITMAP_9_BY_15, line, x_pos, y_pos)
             y_pos -= 30
 
         # Press any key message
         any_key = "Press any key to start"
         x_pos = (WINDOW_WIDTH - len(any_key) * 9) // 2
-        glRasterPos2f(x_pos, y_pos - 30)
-        for c in any_key:
-            glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(c))
+        text_renderer.draw(GLUT_BITMAP_9_BY_15, any_key, x_pos, y_pos - 30)
 
     def update(self):
+        # Positions from the previous step, for interpolated drawing
+        CAR_POOL.snapshot()
+        BULLET_POOL.snapshot()
+        PARTICLE_POOL.snapshot()
+
         if self.show_controls:
             self.control_timer -= 1
             if self.control_timer <= 0:
@@ -681,28 +739,42 @@ class Game:
             self.spawn_boss_car(random.choice([True, False]))
             self.last_boss_spawn = max_score
 
-        # Update bullets in a single pass
-        self.bullets = [bullet for bullet in self.bullets if bullet.y <= WINDOW_HEIGHT and bullet.y >= 0]
+        # Drop off-screen bullets in a single pass
+        BULLET_POOL.release((BULLET_POOL.y > WINDOW_HEIGHT) | (BULLET_POOL.y < 0))
+        self.bullets = [bullet for bullet in self.bullets if bullet.alive]
 
         # Limit max bullets for performance
-        if len(self.bullets) > 20:
-            self.bullets = self.bullets[-20:]  # Keep only most recent bullets
+        if len(self.bullets) > MAX_BULLETS:
+            for bullet in self.bullets[:-MAX_BULLETS]:
+                bullet.release()
+            self.bullets = self.bullets[-MAX_BULLETS:]  # Keep only most recent bullets
+
+        # Move every bullet at once
+        BULLET_POOL.advance()
+
+        # Index cars and players by lane and y band so each bullet is only
+        # tested against the objects around it
+        road_left = (WINDOW_WIDTH - ROAD_WIDTH) // 2
+        car_grid = LaneGrid(road_left, self.lane_width, CAR_HEIGHT)
+        car_grid.extend(self.traffic_cars + self.oncoming_cars)
+        player_grid = LaneGrid(road_left, self.lane_width, CAR_HEIGHT)
+        player_grid.extend(active_players)
 
-        for bullet in self.bullets[:]:
-            bullet.update()
+        remaining_bullets = []
+        for bullet in self.bullets:
+            hit_something = False
 
             if bullet.is_boss:
                 # Boss bullets check against players only
-                for player in active_players:
+                for player in player_grid.nearby(bullet.x, bullet.y, CAR_WIDTH / 2, CAR_HEIGHT / 2):
                     if (abs(bullet.x - player.x) < CAR_WIDTH / 2 and
                             abs(bullet.y - player.y) < CAR_HEIGHT / 2):
                         player.health -= 1
-                        self.bullets.remove(bullet)
+                        hit_something = True
                         break
             else:
                 # Player bullets check against cars only
-                # Use simplified collision check for performance
-                for car in self.traffic_cars + self.oncoming_cars:
+                for car in car_grid.nearby(bullet.x, bullet.y, CAR_WIDTH / 2, CAR_HEIGHT / 2):
                     if not car.is_exploded and car.health > 0:
                         if (abs(bullet.x - car.x) < CAR_WIDTH / 2 and
                                 abs(bullet.y - car.y) < CAR_HEIGHT / 2):
@@ -712,29 +784,32 @@ class Game:
                                     self.player.score += score
                                 else:
                                     self.player2.score += score
-                            self.bullets.remove(bullet)
+                            hit_something = True
                             break
 
-        # Optimize car updates
-        max_cars = 8  # maximum cars for performance
-
-        # Update traffic cars
-        self.traffic_cars = [car for car in self.traffic_cars if car.y >= -CAR_HEIGHT]
-        for car in self.traffic_cars:
-            car.y -= car.speed
-            if car.health > 0:
-                for player in active_players:
-                    if self.check_collision(player, car):
-                        player.health = 0
-
-        # Update oncoming cars
-        self.oncoming_cars = [car for car in self.oncoming_cars if car.y <= WINDOW_HEIGHT + CAR_HEIGHT]
-        for car in self.oncoming_cars:
-            car.y += car.speed
-            if car.health > 0:
-                for player in active_players:
-                    if self.check_collision(player, car):
-                        player.health = 0
+            if hit_something:
+                bullet.release()
+            else:
+                remaining_bullets.append(bullet)
+        self.bullets = remaining_bullets
+
+        # Drop traffic cars that left the bottom and oncoming cars that left the top
+        CAR_POOL.release(((CAR_POOL.dy < 0) & (CAR_POOL.y < -CAR_HEIGHT)) |
+                         ((CAR_POOL.dy > 0) & (CAR_POOL.y > WINDOW_HEIGHT + CAR_HEIGHT)))
+        self.traffic_cars = [car for car in self.traffic_cars if car.alive]
+        self.oncoming_cars = [car for car in self.oncoming_cars if car.alive]
+
+        # Move all cars at once (players have no velocity)
+        CAR_POOL.advance()
+        ExplosionParticle.update_all()
+
+        # Crash check against the cars around each player at their new positions
+        car_grid = LaneGrid(road_left, self.lane_width, CAR_HEIGHT)
+        car_grid.extend(self.traffic_cars + self.oncoming_cars)
+        for player in active_players:
+            for car in car_grid.nearby(player.x, player.y, CAR_WIDTH * 0.8, CAR_HEIGHT * 0.8):
+                if car.health > 0 and self.check_collision(player, car):
+                    player.health = 0
 
         # Update boss cars efficiently
         for car in self.traffic_cars + self.oncoming_cars:
@@ -747,7 +822,7 @@ class Game:
                                          default=None)
                     if closest_player:
                         # Shoot at closest player
-                        if len(self.bullets) < 20:  # Limit boss bullets
+                        if len(self.bullets) < MAX_BULLETS:  # Limit boss bullets
                             bullet = Bullet(car.x, car.y, is_boss=True)
                             bullet.speed = BOSS_BULLET_SPEED if closest_player.y > car.y else -BOSS_BULLET_SPEED
                             self.bullets.append(bullet)
@@ -766,9 +841,9 @@ class Game:
         # Spawn new cars only when needed and ensure boss cars remain
         difficulty = self.get_current_difficulty()
 
-        if len(self.traffic_cars) < max_cars and random.random() < difficulty['traffic_density']:
+        if len(self.traffic_cars) < MAX_CARS and random.random() < difficulty['traffic_density']:
             self.spawn_new_car(True)
-        if len(self.oncoming_cars) < max_cars and random.random() < difficulty['traffic_density']:
+        if len(self.oncoming_cars) < MAX_CARS and random.random() < difficulty['traffic_density']:
             self.spawn_new_car(False)
 
         # Update scores
@@ -795,38 +870,59 @@ class Game:
         # Draw game state
         self.draw_road()
 
+        # Draw moving objects part way between the last two logic steps
+        alpha = self.timestep.alpha
+        self.draw_cars(alpha)
+        self.draw_bullets(alpha)
+        self.draw_hud()
+
+        glutSwapBuffers()
+
+    def draw_cars(self, alpha):
         # Draw all game objects
         all_cars = self.traffic_cars + self.oncoming_cars + [self.player]
         if self.player2:
             all_cars.append(self.player2)
 
+        ExplosionParticle.draw_all(alpha)
         for car in sorted(all_cars, key=lambda x: x.y):
-            car.draw()
+            car.draw(alpha)
 
-        for bullet in self.bullets:
-            bullet.draw()
+    def draw_bullets(self, alpha):
+        if self.bullets:
+            slots = [b.slot for b in self.bullets]
+            x, y = BULLET_POOL.interpolate(slots, alpha)
+            draw_circles(numpy.column_stack((x, y, numpy.full(len(slots), BULLET_SIZE))).astype(numpy.int64),
+                         [b.get_color() for b in self.bullets])
 
+    def draw_hud(self):
         # Draw scores
         glColor3f(1, 1, 1)
         difficulty_level = max(self.player.score,
                              self.player2.score if self.player2 else 0) // DIFFICULTY_INCREASE_INTERVAL
 
         if self.game_state == STATE_MULTIPLAYER:
-            glRasterPos2f(10, WINDOW_HEIGHT - 20)
             score_text = f"P1 Score: {self.player.score} | P2 Score: {self.player2.score} | Level: {difficulty_level + 1}"
         else:
-            glRasterPos2f(10, WINDOW_HEIGHT - 20)
             score_text = f"Score: {self.player.score} | Level: {difficulty_level + 1}"
-
-        for c in score_text:
-            glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(c))
+        text_renderer.draw(GLUT_BITMAP_9_BY_15, score_text, 10, WINDOW_HEIGHT - 20)
 
         if self.game_state == STATE_PAUSED:
             self.draw_pause_menu()
         elif self.show_controls:
             self.draw_controls()
 
-        glutSwapBuffers()
+    def state_hash(self):
+        """Digest of the simulation state, for checking that replays match"""
+        players = [p for p in (self.player, self.player2) if p is not None]
+        state = (
+            self.game_state,
+            [(p.x, p.y, p.health, p.score) for p in players],
+            [(car.x, car.y, car.health, car.is_boss) for car in self.traffic_cars + self.oncoming_cars],
+            [(bullet.x, bullet.y, bullet.is_boss) for bullet in self.bullets],
+            len(PARTICLE_POOL.live()),
+        )
+        return hashlib.sha256(repr(state).encode()).hexdigest()
 
     def keyboard(self, key, x, y):
         if self.show_controls:
@@ -899,20 +995,174 @@ class Game:
 
 
 def init():
+    global text_renderer
     glClearColor(0.0, 0.0, 0.0, 1.0)
     gluOrtho2D(0, WINDOW_WIDTH, 0, WINDOW_HEIGHT)
     glEnable(GL_BLEND)
     glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    # Display lists need the context, so the text cache is made here
+    text_renderer = BitmapText(glutBitmapCharacter)
 
 def timer(value):
     current_time = time.time()
-    game.update()
+    # Run however many fixed logic steps have come due since the last tick
+    game.timestep.advance(game.update)
     glutPostRedisplay()
     # Maintain consistent frame rate
     next_frame = max(0, FRAME_TIME - int((time.time() - current_time) * 1000))
     glutTimerFunc(next_frame, timer, 0)
 
-def main():
+
+def run_headless(ticks, multiplayer=False):
+    """Run Game.update as fast as possible without a window and report ticks/sec"""
+    game = Game()
+    game.start_game(multiplayer=multiplayer)
+    game.show_controls = False
+    restarts = 0
+
+    start = time.perf_counter()
+    for tick in range(ticks):
+        if game.game_state == STATE_GAME_OVER:
+            game.start_game(multiplayer=multiplayer)
+            game.show_controls = False
+            restarts += 1
+        # Keep firing so collisions and explosions are part of the workload
+        if tick % 5 == 0:
+            game.keyboard(b' ', 0, 0)
+        game.update()
+    elapsed = time.perf_counter() - start
+
+    print(f"{ticks} ticks in {elapsed:.3f}s: {ticks / elapsed:.0f} ticks/sec "
+          f"({elapsed / ticks * 1000:.3f} ms/tick, {restarts} restarts)")
+
+HEADLESS_GLYPH = b'\xff' * 4 * 15  # 15 rows, each padded to the default 4 byte alignment
+
+
+def headless_bitmap_character(font, character):
+    """Stand-in for glutBitmapCharacter without a window: one solid 9x15 glBitmap per glyph"""
+    glBitmap(9, 15, 0, 3, 9, 0, HEADLESS_GLYPH)
+
+
+def run_replay(path, capture=None):
+    """Re-run a recorded session offscreen and report where the time went
+
+    With capture set to a directory every frame is also saved there as a
+    numbered PNG, read back through a ring of pixel buffers and written by
+    a background thread.  Run with PYOPENGL_STATE_CACHE=1 to also see how
+    many redundant state calls OpenGL.GL.statecache dropped.
+    """
+    global glutSwapBuffers, glutBitmapCharacter
+    from OpenGL.GL import statecache
+    seed, events, end_tick = replay.load_replay(path)
+    context = replay.HeadlessContext(WINDOW_WIDTH, WINDOW_HEIGHT)
+
+    # GLUT needs a window: finish instead of swapping so timings include the GL work
+    glutSwapBuffers = glFinish
+    glutBitmapCharacter = headless_bitmap_character
+    init()
+
+    seed_game(seed)
+    game = Game()
+    calls = replay.CallCounter(sys.modules[__name__], sys.modules['midpoint'], sys.modules['bitmap_text'],
+                                 sys.modules['layers'])
+    phases = replay.PhaseTimer(game, {
+        'update': 'update',
+        'draw_road': 'road',
+        'draw_cars': 'cars',
+        'draw_bullets': 'bullets',
+        'draw_hud': 'hud text',
+        'draw_menu': 'menus',
+        'draw_game_over': 'menus',
+    })
+
+    if capture:
+        from OpenGL.GL.readback import PixelPackRing
+        from OpenGL.framewriters import FrameWriter
+        os.makedirs(capture, exist_ok=True)
+        ring = PixelPackRing()
+        writer = FrameWriter(os.path.join(capture, 'frame%05d.png'))
+
+    pending = list(reversed(events))
+    start = time.perf_counter()
+    for tick in range(end_tick + 1):
+        while pending and pending[-1][0] == tick:
+            _, kind, key = pending.pop()
+            if kind == replay.KEYBOARD:
+                game.keyboard(key, 0, 0)
+            else:
+                game.special_keys(key, 0, 0)
+        if tick == end_tick:
+            break
+        game.update()
+        game.display()
+        if statecache.STATE is not None:
+            statecache.STATE.endFrame()
+        if capture:
+            image = ring.read(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+            if image is not None:
+                writer.write(image)
+    if capture:
+        for image in ring.flush():
+            writer.write(image)
+        writer.close()
+        ring.delete()
+    elapsed = time.perf_counter() - start
+
+    frames = max(end_tick, 1)
+    print(f"{end_tick} ticks in {elapsed:.3f}s ({elapsed / frames * 1000:.3f} ms/tick) "
+          f"on {glGetString(GL_RENDERER).decode()}")
+    print(f"{'phase':<10} {'calls':>7} {'total s':>9} {'ms/tick':>9}")
+    for phase, total in phases.totals.items():
+        print(f"{phase:<10} {phases.calls[phase]:>7} {total:>9.3f} {total / frames * 1000:>9.3f}")
+    print(f"GL calls: {calls.total} ({calls.total / frames:.1f}/tick)")
+    for name, count in calls.counts.most_common(10):
+        print(f"  {name:<24} {count:>9}")
+    if statecache.STATE is not None:
+        issued, elided = statecache.STATE.totals()
+        print(f"state calls elided: {sum(elided.values())} ({sum(elided.values()) / frames:.1f}/tick), "
+              f"issued: {sum(issued.values())} ({sum(issued.values()) / frames:.1f}/tick)")
+        for name, count in elided.most_common(5):
+            print(f"  {name:<24} {count:>9}")
+    print(f"state hash: {game.state_hash()}")
+    return context
+
+
+def run_text_benchmark(frames):
+    """Time every text overlay drawn together each frame, per-glyph calls vs cached lists"""
+    global glutSwapBuffers, glutBitmapCharacter
+    context = replay.HeadlessContext(WINDOW_WIDTH, WINDOW_HEIGHT)
+    glutSwapBuffers = glFinish
+    glutBitmapCharacter = headless_bitmap_character
+    init()
+
+    game = Game()
+    game.start_game(multiplayer=True)
+    game.winner = "Red"
+    budget = 1000 / FPS
+    for cached in (False, True):
+        text_renderer.cached = cached
+        text = replay.PhaseTimer(text_renderer, {'draw': 'text'})
+        start = time.perf_counter()
+        for frame in range(frames):
+            # Scores change every frame, like they do in play
+            game.player.score = game.player2.score = frame
+            game.game_state = STATE_MULTIPLAYER
+            game.show_controls = True
+            game.draw_hud()
+            game.draw_pause_menu()
+            game.draw_menu()
+            game.game_state = STATE_GAME_OVER
+            game.draw_game_over()
+        elapsed = (time.perf_counter() - start) / frames * 1000
+        text_time = text.totals['text'] / frames * 1000
+        print(f"{'cached' if cached else 'per-glyph':<10} {text.calls['text'] // frames} strings: "
+              f"{text_time:.3f} ms/frame drawing text ({text_time / budget:.1%} of a {FPS} FPS frame), "
+              f"{elapsed:.3f} ms/frame with the overlays' shapes")
+        del text_renderer.draw
+    return context
+
+
+def main(record_path=None, seed=None):
     global game
 
     glutInit()
@@ -921,15 +1171,60 @@ def main():
     glutCreateWindow(b"Car Destroyer")
 
     init()
+    if seed is None and record_path:
+        seed = random.randrange(2 ** 32)
+    if seed is not None:
+        seed_game(seed)
     game = Game()
 
+    keyboard = game.keyboard
+    special_keys = game.special_keys
+    if record_path:
+        # Log every key with the logic tick it arrived before
+        recorder = replay.ReplayRecorder(record_path, seed)
+        atexit.register(lambda: recorder.close(game.timestep.ticks))
+
+        def keyboard(key, x, y):
+            recorder.record(game.timestep.ticks, replay.KEYBOARD, key)
+            game.keyboard(key, x, y)
+
+        def special_keys(key, x, y):
+            recorder.record(game.timestep.ticks, replay.SPECIAL, key)
+            game.special_keys(key, x, y)
+
     glutDisplayFunc(game.display)
-    glutKeyboardFunc(game.keyboard)
-    glutSpecialFunc(game.special_keys)
+    glutKeyboardFunc(keyboard)
+    glutSpecialFunc(special_keys)
     glutTimerFunc(0, timer, 0)
 
     glutMainLoop()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Car Destroyer")
+    parser.add_argument("--headless", type=int, metavar="TICKS",
+                        help="run TICKS simulation steps without a window and report ticks/sec")
+    parser.add_argument("--multiplayer", action="store_true",
+                        help="use the two player game for --headless")
+    parser.add_argument("--max-cars", type=int, default=MAX_CARS, metavar="N",
+                        help=f"cars allowed in each direction (default {MAX_CARS}; "
+                             "replays only match with the value they were recorded with)")
+    parser.add_argument("--record", metavar="FILE",
+                        help="play normally and save the seed and inputs as a replay")
+    parser.add_argument("--seed", type=int, help="seed for the random number generators")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="re-run a replay offscreen (PYOPENGL_PLATFORM=osmesa) and report timings")
+    parser.add_argument("--capture", metavar="DIR",
+                        help="with --replay, also save every frame to DIR as PNG files")
+    parser.add_argument("--text-benchmark", type=int, metavar="FRAMES",
+                        help="draw every text overlay FRAMES times offscreen, uncached and cached")
+    args = parser.parse_args()
+    MAX_CARS = args.max_cars
+    if args.headless:
+        run_headless(args.headless, args.multiplayer)
+    elif args.replay:
+        run_replay(args.replay, args.capture)
+    elif args.text_benchmark:
+        run_text_benchmark(args.text_benchmark)
+    else:
+        main(args.record, args.seed)
 
@@ -32,20 +32,12 @@ def write_ppm(buf, filename):
     
     This lets us write a simple image format without
     using any libraries that can be viewed on most
-    linux workstations.
+    linux workstations.  The rows are written last to
+    first, turning glReadPixels' bottom-up order upright.
     """
-    with open(filename, "w") as f:
-        (h, w, c) = buf.shape
-        f.write("P3\n")
-        f.write("# ascii ppm file created by pyopengl\n")
-        f.write("%i %i\n" % (w, h))
-        f.write("255\n")
-        for y in range(h - 1, -1, -1):
-            for x in range(w):
-                pixel = buf[y, x]
-                l = " %3d %3d %3d" % (pixel[0], pixel[1], pixel[2])
-                f.write(l)
-            f.write("\n")
+    from OpenGL import framewriters
+
+    framewriters.write_ppm(filename, buf, flip=True)
 
 
 def debug_config(display, config):
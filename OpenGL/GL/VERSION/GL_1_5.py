@@ -62,6 +62,7 @@ glGetBufferPointerv=wrapper.wrapper(glGetBufferPointerv).setOutput(
 ### END AUTOGENERATED SECTION
 from OpenGL.lazywrapper import lazy as _lazy
 from OpenGL.arrays import ArrayDatatype
+from OpenGL.arrays.arraydatatype import handlerCache as _handlerCache
 from OpenGL._bytes import integer_types
 
 @_lazy( glBufferData )
@@ -83,10 +84,12 @@ def glBufferData( baseOperation, target, size, data=None, usage=None ):
         usage = data
         data = size
         size = None
-    data = ArrayDatatype.asArray( data )
+    data = _bufferDataHandler( data ).asArray( data )
     if size is None:
-        size = ArrayDatatype.arrayByteCount( data )
+        size = _bufferDataSizeHandler( data ).arrayByteCount( data )
     return baseOperation( target, size, data, usage )
+_bufferDataHandler = _handlerCache()
+_bufferDataSizeHandler = _handlerCache()
 
 @_lazy( glBufferSubData )
 def glBufferSubData( baseOperation, target, offset, size=None, data=None ):
@@ -119,10 +122,12 @@ def glBufferSubData( baseOperation, target, offset, size=None, data=None ):
             )
         data = size
         size = None
-    data = ArrayDatatype.asArray( data )
+    data = _bufferSubDataHandler( data ).asArray( data )
     if size is None:
-        size = ArrayDatatype.arrayByteCount( data )
+        size = _bufferSubDataSizeHandler( data ).arrayByteCount( data )
     return baseOperation( target, offset, size, data )
+_bufferSubDataHandler = _handlerCache()
+_bufferSubDataSizeHandler = _handlerCache()
 
 @_lazy( glGetBufferPointerv )
 def glGetBufferPointerv( baseOperation, target, pname, params=None ):
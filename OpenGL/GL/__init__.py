@@ -1,4 +1,12 @@
-"""OpenGL.GL, the core GL library and extensions to it"""
+"""OpenGL.GL, the core GL library and extensions to it
+
+GL 1.1 (with the pointer, image, exceptional and glGet wrappers) is loaded
+when OpenGL.GL is imported.  The later core version modules (GL_1_2 through
+GL_4_6) are only imported when one of their names is first looked up, using
+the prebuilt index in OpenGL.GL._symbols, so "from OpenGL.GL import glClear"
+does not pay for thousands of GL 3.x/4.x declarations.
+"from OpenGL.GL import *" still binds every name (loading every module).
+"""
 # early import of our modules to prevent import loops...
 from OpenGL import error as _error
 from OpenGL.GL.VERSION.GL_1_1 import *
@@ -9,23 +17,12 @@ from OpenGL.GL.exceptional import *
 
 from OpenGL.GL.glget import *
 
-from OpenGL.GL.VERSION.GL_1_2 import *
-from OpenGL.GL.VERSION.GL_1_3 import *
-from OpenGL.GL.VERSION.GL_1_4 import *
-from OpenGL.GL.VERSION.GL_1_5 import *
-from OpenGL.GL.VERSION.GL_2_0 import *
-from OpenGL.GL.VERSION.GL_2_1 import *
-from OpenGL.GL.VERSION.GL_3_0 import *
-from OpenGL.GL.VERSION.GL_3_1 import *
-from OpenGL.GL.VERSION.GL_3_2 import *
-from OpenGL.GL.VERSION.GL_3_3 import *
-from OpenGL.GL.VERSION.GL_4_0 import *
-from OpenGL.GL.VERSION.GL_4_1 import *
-from OpenGL.GL.VERSION.GL_4_2 import *
-from OpenGL.GL.VERSION.GL_4_3 import *
-from OpenGL.GL.VERSION.GL_4_4 import *
-from OpenGL.GL.VERSION.GL_4_5 import *
-from OpenGL.GL.VERSION.GL_4_6 import *
+# GL_1_2 through GL_4_6 are loaded on demand by __getattr__, after changing
+# the imports here re-run python -m OpenGL.GL._buildsymbols
+from OpenGL.GL._symbols import MODULES as _MODULES, SYMBOLS as _SYMBOLS, OVERRIDDEN as _OVERRIDDEN
+for _name in _OVERRIDDEN:
+    del globals()[_name]
+del _name
 
 from OpenGL.error import *
 GLerror = GLError
@@ -47,3 +44,29 @@ glGetPolygonStippleub = glGetPolygonStipple
 
 from OpenGL.GL import vboimplementation as _core_implementation
 from OpenGL.GL.ARB import vboimplementation as _arb_implementation
+
+import importlib as _importlib
+
+def __getattr__( name ):
+    """Import the core version module defining name on first use"""
+    if name == '__all__':
+        return __dir__()
+    moduleName = _SYMBOLS.get( name )
+    if moduleName is None:
+        raise AttributeError( """module %r has no attribute %r"""%( __name__, name ))
+    module = _importlib.import_module( moduleName )
+    namespace = globals()
+    for symbol in _MODULES[ moduleName ]:
+        namespace[ symbol ] = getattr( module, symbol )
+    return namespace[ name ]
+
+def __dir__( ):
+    """Public names, including those not loaded yet"""
+    names = set( _SYMBOLS )
+    names.update([name for name in globals() if not name.startswith( '_' )])
+    return sorted( names )
+
+from OpenGL import _configflags
+if _configflags.STATE_CACHE:
+    from OpenGL.GL import statecache as _statecache
+    _statecache.install()
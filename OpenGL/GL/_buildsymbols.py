@@ -0,0 +1,117 @@
+"""Regenerate OpenGL/GL/_symbols.py, the index of lazily loaded OpenGL.GL names
+
+Usage:
+
+    python -m OpenGL.GL._buildsymbols
+
+Simulates the star-imports OpenGL.GL historically performed (in order) and
+records, for each name whose final binding comes from one of the lazily
+loaded core version modules, which module that is.  Re-run this whenever a
+VERSION module changes or the imports in OpenGL/GL/__init__.py are changed.
+"""
+import importlib, os
+from OpenGL.constant import Constant
+
+# modules imported when OpenGL.GL is imported, before the lazy ones
+EAGER = [
+    'OpenGL.GL.VERSION.GL_1_1',
+    'OpenGL.GL.pointers',
+    'OpenGL.GL.images',
+    'OpenGL.GL.exceptional',
+    'OpenGL.GL.glget',
+]
+LAZY = [
+    'OpenGL.GL.VERSION.GL_%s'%(version,)
+    for version in (
+        '1_2','1_3','1_4','1_5',
+        '2_0','2_1',
+        '3_0','3_1','3_2','3_3',
+        '4_0','4_1','4_2','4_3','4_4','4_5','4_6',
+    )
+]
+# star-imported after the lazy modules, so they win over them
+TRAILING = [
+    'OpenGL.error',
+]
+
+def exportedNames( module ):
+    """Names "from module import *" would bind"""
+    names = getattr( module, '__all__', None )
+    if names is None:
+        names = [name for name in vars( module ) if not name.startswith( '_' )]
+    return names
+
+def buildIndex( ):
+    """Return ({lazy module: [names]}, [overridden eager names])"""
+    final = {}
+    eager = {}
+    for moduleName in EAGER + LAZY + TRAILING:
+        module = importlib.import_module( moduleName )
+        for name in exportedNames( module ):
+            value = getattr( module, name )
+            final[name] = (moduleName, value)
+            if moduleName in EAGER:
+                eager[name] = value
+    modules = dict([(moduleName,[]) for moduleName in LAZY])
+    overridden = []
+    for name,(moduleName,value) in sorted( final.items()):
+        if moduleName not in modules:
+            continue
+        if name in eager:
+            current = eager[name]
+            if current is value:
+                continue
+            if (
+                isinstance( value, Constant ) and type( current ) is type( value )
+                and current == value and current.name == value.name
+            ):
+                # the same constant declared again, the eager one will do
+                continue
+            overridden.append( name )
+        modules[moduleName].append( name )
+    return modules, overridden
+
+def formatIndex( modules, overridden ):
+    lines = [
+        '"""Names of OpenGL.GL loaded on first use, and the modules defining them',
+        '',
+        'Autogenerated by python -m OpenGL.GL._buildsymbols, do not edit!',
+        '"""',
+        'MODULES = {',
+    ]
+    for moduleName,names in modules.items():
+        if not names:
+            continue
+        lines.append( '    %r: """'%(moduleName,) )
+        line = '       '
+        for name in names:
+            if len( line ) + len( name ) + 1 > 79:
+                lines.append( line )
+                line = '       '
+            line += ' ' + name
+        lines.append( line )
+        lines.append( '    """.split(),' )
+    lines.append( '}' )
+    lines.append( '# names GL 1.1 defines but a later version module replaces' )
+    lines.append( 'OVERRIDDEN = %r'%( tuple( overridden ), ) )
+    lines.append( 'SYMBOLS = dict([' )
+    lines.append( '    (name,moduleName)' )
+    lines.append( '    for moduleName,names in MODULES.items()' )
+    lines.append( '    for name in names' )
+    lines.append( '])' )
+    return '\n'.join( lines ) + '\n'
+
+def main( ):
+    modules, overridden = buildIndex()
+    filename = os.path.join( os.path.dirname( __file__ ), '_symbols.py' )
+    with open( filename, 'w' ) as output:
+        output.write( formatIndex( modules, overridden ))
+    print( '%s: %s names from %s modules, %s overridden'%(
+        filename,
+        sum([len(names) for names in modules.values()]),
+        len([names for names in modules.values() if names]),
+        len( overridden ),
+    ))
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ __all__ = [
     'glColor',
     'glDeleteTextures',
     'glEnd',
+    'glFinish',
     'glMap1d',
     'glMap1f',
     'glMap2d',
@@ -47,6 +48,16 @@ else:
     glBegin = full.glBegin
     glEnd = full.glEnd
 
+if _configflags.ERROR_CHECKING == 'deferred':
+    @_lazy( full.glFinish )
+    def glFinish( baseFunction ):
+        """Block until all GL commands are complete, then check for deferred errors"""
+        result = baseFunction( )
+        _errors._error_checker.checkpoint( baseFunction )
+        return result
+else:
+    glFinish = full.glFinish
+
 @_lazy( full.glDeleteTextures )
 def glDeleteTextures( baseFunction, size, array=_NULL ):
     """Delete specified set of textures
@@ -70,6 +81,8 @@ def glMap2( baseFunction, arrayType ):
         This is a completely non-standard signature which doesn't allow for most
         of the funky uses with strides and the like, but it has been like this for
         a very long time...
+
+        OpenGL.GLU.bezierSurfaceMesh evaluates the same points into arrays.
         """
         ptr = arrayType.asArray( points )
         uorder,vorder,vstride = arrayType.dimensions( ptr )
@@ -99,6 +112,8 @@ def glMap1( baseFunction, arrayType ):
         This is a completely non-standard signature which doesn't allow for most
         of the funky uses with strides and the like, but it has been like this for
         a very long time...
+
+        OpenGL.GLU.bezierCurvePoints evaluates the same points into an array.
         """
         ptr = arrayType.asArray( points )
         dims = arrayType.dimensions( ptr )
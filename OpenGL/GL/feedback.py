@@ -1,8 +1,32 @@
-"""Utility module to parse a Feedback buffer"""
+"""Utility module to parse a Feedback buffer
+
+With numpy available the whole buffer is decoded at once into a
+FeedbackRecords sequence: a structured array of the records' tokens and
+the spans of their vertices in one array of vertex data, with the
+(token, Vertex, ...) tuples only created for the records looked at.
+"""
 from OpenGL import contextdata
 from OpenGL.GL.VERSION import GL_1_1 as _simple
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 def parseFeedback( buffer, entryCount ):
+    """Parse the feedback buffer into a sequence of records
+
+    Returns a FeedbackRecords (decoded with numpy) when numpy is
+    available, otherwise a list of records from parseFeedbackObjects
+    """
+    if numpy is None:
+        return parseFeedbackObjects( buffer, entryCount )
+    return FeedbackRecords.fromBuffer( buffer, entryCount )
+
+def parseFeedbackObjects( buffer, entryCount ):
     """Parse the feedback buffer into Python object records"""
     bufferIndex = 0
     result = []
@@ -56,10 +80,24 @@ class Vertex( object ):
         self.vertex = vertex 
         self.color = color 
         self.texture = texture 
+def feedbackColorSize( ):
+    """Number of color values per vertex, 1 in color-index mode, else 4"""
+    indexMode = _simple.glGetBooleanv( _simple.GL_INDEX_MODE )
+    return [ 4,1 ][ int(indexMode) ]
+def vertexLayout( mode, colorSize ):
+    """(coordinates, color values, texture values) per vertex for mode"""
+    if mode == _simple.GL_2D:
+        return (2,0,0)
+    elif mode == _simple.GL_3D:
+        return (3,0,0)
+    elif mode == _simple.GL_3D_COLOR:
+        return (3,colorSize,0)
+    elif mode == _simple.GL_3D_COLOR_TEXTURE:
+        return (3,colorSize,4)
+    return (4,colorSize,4)
 def createGetVertex( ):
     mode = contextdata.getValue( "GL_FEEDBACK_BUFFER_TYPE" )
-    indexMode = _simple.glGetBooleanv( _simple.GL_INDEX_MODE )
-    colorSize = [ 4,1 ][ int(indexMode) ]
+    colorSize = feedbackColorSize()
     if mode in (_simple.GL_2D,_simple.GL_3D):
         if mode == _simple.GL_2D:
             size = 2
@@ -84,3 +122,209 @@ def createGetVertex( ):
             textureEnd = colorEnd + 4
             return (buffer[bufferIndex:end],buffer[end:colorEnd],buffer[colorEnd:textureEnd]),textureEnd
     return getVertex
+
+if numpy is not None:
+    RECORD_DTYPE = numpy.dtype([
+        ('token', numpy.int32),
+        ('start', numpy.intp),
+        ('count', numpy.intp),
+        ('value', numpy.float64),
+    ])
+    # vertices following each token, polygons give their own count
+    TOKEN_VERTICES = dict(
+        [ (int(token),1) for token in SINGLE_VERTEX_TOKENS ] +
+        [ (int(token),2) for token in DOUBLE_VERTEX_TOKENS ]
+    )
+    TOKENS = dict(
+        [ (int(token),token) for token in SINGLE_VERTEX_TOKENS ] +
+        [ (int(token),token) for token in DOUBLE_VERTEX_TOKENS ] +
+        [
+            (int(_simple.GL_PASS_THROUGH_TOKEN),_simple.GL_PASS_THROUGH_TOKEN),
+            (int(_simple.GL_POLYGON_TOKEN),_simple.GL_POLYGON_TOKEN),
+        ]
+    )
+
+def recordOffsets( data, entryCount, vertexSize ):
+    """(offsets, tokens, vertex counts) of the records in data[:entryCount]
+
+    offsets are those of each record's first value after the token (the
+    vertex count for polygons), vertex counts are 0 for pass-through
+    records.  When every record is the same kind and size (all points,
+    all lines or all triangles) that is checked with one comparison over
+    the would-be record starts, otherwise the tokens are followed through
+    a list of the values.
+    """
+    if entryCount <= 0:
+        empty = numpy.zeros( 0, dtype=numpy.intp )
+        return empty, empty, empty
+    first = int(data[0])
+    vertices = TOKEN_VERTICES.get( first )
+    if vertices is not None:
+        stride = 1 + vertices*vertexSize
+    elif first == _simple.GL_POLYGON_TOKEN and entryCount > 1:
+        vertices = int(data[1])
+        stride = 2 + vertices*vertexSize
+    else:
+        stride = 0
+    if stride and not entryCount % stride:
+        starts = numpy.arange( 0, entryCount, stride, dtype=numpy.intp )
+        tokens = data[starts].astype( numpy.intp )
+        if first == _simple.GL_POLYGON_TOKEN:
+            same = (tokens == first).all() and (data[starts+1] == vertices).all()
+        else:
+            same = (tokens == first).all() or all([
+                (TOKEN_VERTICES.get( token ) == vertices)
+                for token in numpy.unique( tokens ).tolist()
+            ])
+        if same:
+            counts = numpy.empty( len(starts), dtype=numpy.intp )
+            counts.fill( vertices )
+            return starts + 1, tokens, counts
+    values = data[:entryCount].tolist()
+    offsets, tokens, counts = [], [], []
+    index = 0
+    while index < entryCount:
+        token = int(values[index])
+        index += 1
+        vertices = TOKEN_VERTICES.get( token )
+        if vertices is None:
+            if token == _simple.GL_PASS_THROUGH_TOKEN:
+                offsets.append( index )
+                tokens.append( token )
+                counts.append( 0 )
+                index += 1
+                continue
+            elif token != _simple.GL_POLYGON_TOKEN:
+                raise ValueError(
+                    """Unrecognised token %r in feedback stream"""%(token,)
+                )
+            vertices = int(values[index])
+            offsets.append( index )
+            index += 1
+        else:
+            offsets.append( index )
+        tokens.append( token )
+        counts.append( vertices )
+        index += vertices*vertexSize
+    return (
+        numpy.array( offsets, dtype=numpy.intp ),
+        numpy.array( tokens, dtype=numpy.intp ),
+        numpy.array( counts, dtype=numpy.intp ),
+    )
+
+class FeedbackRecords( Sequence ):
+    """Feedback-buffer records decoded into numpy arrays
+
+    records -- structured array with a row per record of
+        token -- the record's GL_*_TOKEN
+        start, count -- the record's vertices are vertices[start:start+count]
+        value -- the GL_PASS_THROUGH_TOKEN value (NaN for other records)
+    vertices -- (vertices, values per vertex) float array of all of the
+        records' vertex data, see the vertex, color and texture views of
+        its columns (color and texture are None when the buffer type has
+        none)
+
+    As a sequence this behaves like the list parseFeedbackObjects returns,
+    creating each record's tuple the first time it is looked up (or all of
+    them when iterating), with the Vertex values as lists of floats.
+    """
+    def __init__( self, records, vertices, layout ):
+        self.records = records
+        self.vertices = vertices
+        self.layout = layout
+        self._tuples = [None] * len(records)
+        coordinates, colorSize, textureSize = layout
+        self.vertex = vertices[:,:coordinates]
+        self.color = self.texture = None
+        if colorSize:
+            self.color = vertices[:,coordinates:coordinates+colorSize]
+        if textureSize:
+            self.texture = vertices[:,coordinates+colorSize:]
+    @classmethod
+    def fromBuffer( cls, buffer, entryCount, mode=None, colorSize=None ):
+        """Decode the first entryCount values of the feedback buffer
+
+        mode and colorSize default to the feedback buffer type and color
+        mode of the current context
+        """
+        if mode is None:
+            mode = contextdata.getValue( "GL_FEEDBACK_BUFFER_TYPE" )
+        if colorSize is None:
+            colorSize = feedbackColorSize()
+        layout = vertexLayout( mode, colorSize )
+        vertexSize = sum( layout )
+        data = numpy.asarray( buffer ).reshape( -1 )
+        offsets, tokens, counts = recordOffsets( data, entryCount, vertexSize )
+        records = numpy.empty( len(offsets), dtype=RECORD_DTYPE )
+        records['token'] = tokens
+        records['count'] = counts
+        starts = numpy.zeros( len(offsets), dtype=numpy.intp )
+        numpy.cumsum( counts[:-1], out=starts[1:] )
+        records['start'] = starts
+        records['value'] = numpy.nan
+        passThrough = tokens == _simple.GL_PASS_THROUGH_TOKEN
+        records['value'][passThrough] = data[offsets[passThrough]]
+        # polygon vertices start after the polygon's vertex count
+        offsets = offsets + (tokens == _simple.GL_POLYGON_TOKEN)
+        index = numpy.arange( counts.sum(), dtype=numpy.intp ) - numpy.repeat( starts, counts )
+        index *= vertexSize
+        index += numpy.repeat( offsets, counts )
+        index = index[:,None] + numpy.arange( vertexSize, dtype=numpy.intp )
+        return cls( records, data[index], layout )
+    token = property( lambda self: self.records['token'] )
+    def vertices_of( self, index ):
+        """The (count, values per vertex) vertex data of record index"""
+        record = self.records[index]
+        return self.vertices[record['start']:record['start']+record['count']]
+    def recordTuples( self ):
+        """Create the (token, Vertex, ...) tuples of all of the records"""
+        tokens = [ TOKENS[ token ] for token in self.token.tolist() ]
+        values = self.records['value'].tolist()
+        # (vertex, color, texture) lists of each vertex
+        columns = [
+            column.tolist() for column in (self.vertex, self.color, self.texture)
+            if column is not None
+        ]
+        vertices = [ Vertex( *vertex ) for vertex in zip( *columns ) ]
+        result = []
+        for token, start, count, value in zip(
+            tokens, self.records['start'].tolist(), self.records['count'].tolist(), values,
+        ):
+            if token == _simple.GL_PASS_THROUGH_TOKEN:
+                result.append( (token, value) )
+            else:
+                result.append( (token,) + tuple( vertices[start:start+count] ) )
+        return result
+    def recordTuple( self, index ):
+        """Create the (token, Vertex, ...) tuple for record index"""
+        record = self.records[index]
+        token = TOKENS[ int(record['token']) ]
+        if token == _simple.GL_PASS_THROUGH_TOKEN:
+            return (token, float(record['value']))
+        start = int(record['start'])
+        stop = start + int(record['count'])
+        columns = [
+            column[start:stop].tolist() for column in (self.vertex, self.color, self.texture)
+            if column is not None
+        ]
+        return (token,) + tuple([ Vertex( *vertex ) for vertex in zip( *columns ) ])
+    def __len__( self ):
+        return len(self.records)
+    def __getitem__( self, index ):
+        if isinstance( index, slice ):
+            return [ self[i] for i in range( *index.indices( len(self) ) ) ]
+        result = self._tuples[index]
+        if result is None:
+            result = self._tuples[index] = self.recordTuple( index )
+        return result
+    def __iter__( self ):
+        """Iterate over the record tuples, creating any missing all at once"""
+        if None in self._tuples:
+            created = self.recordTuples()
+            self._tuples = [
+                old if old is not None else new
+                for old, new in zip( self._tuples, created )
+            ]
+        return iter( self._tuples )
+    def __repr__( self ):
+        return '<%s of %d records>'%( self.__class__.__name__, len(self) )
@@ -144,6 +144,10 @@ __all__ = (
 
     'glGetTexImage',
 
+    'glPixelStorei',
+    'glPixelStoref',
+    'glPopClientAttrib',
+
     'glDrawPixels',
     'glDrawPixelsb',
     'glDrawPixelsf',
@@ -377,6 +381,21 @@ def glReadPixels( x,y,width,height,format,type, array=None, outputType=bytes ):
     else:
         return array
 
+def glPixelStorei( pname, param ):
+    """Set a pixel-store parameter, forgetting PyOpenGL's cached value"""
+    images.forgetPixelStore( pname )
+    return GL_1_1.glPixelStorei( pname, param )
+
+def glPixelStoref( pname, param ):
+    """Set a pixel-store parameter, forgetting PyOpenGL's cached value"""
+    images.forgetPixelStore( pname )
+    return GL_1_1.glPixelStoref( pname, param )
+
+def glPopClientAttrib( ):
+    """Restore client attributes, forgetting PyOpenGL's cached pixel-store values"""
+    images.forgetPixelStore()
+    return GL_1_1.glPopClientAttrib()
+
 def glGetTexImage( target, level,format,type, array=None, outputType=bytes ):
     """Get a texture-level as an image
 
@@ -0,0 +1,216 @@
+"""Batched recorder for legacy immediate-mode (glBegin/glEnd) geometry
+
+Every glVertex* call in real immediate mode is a separate trip through the
+wrapper, context-check, logging and ctypes errcheck machinery, so code which
+rasterises shapes point-by-point (e.g. midpoint line/circle algorithms) makes
+tens of thousands of Python->C crossings per frame.
+
+This module is opt-in.  Importing its names *after* OpenGL.GL shadows the
+immediate-mode entry points with recording versions:
+
+    from OpenGL.GL import *
+    from OpenGL.GL.immediate import *
+
+    glColor3f( 1, 0, 0 )
+    glBegin( GL_POINTS )
+    for x in range( 800 ):
+        glVertex2f( x, 10 )  # appended to a Python list, no GL call
+    glEnd()                  # one glVertexPointer/glDrawArrays call
+
+glBegin starts accumulating vertices (and any glColor* issued between
+glBegin/glEnd), glEnd copies them into a reusable NumPy buffer and issues a
+single array draw.  glColor* calls made outside of glBegin/glEnd are passed
+straight through to the GL (and tracked), so the GL current colour stays
+correct for other code.
+
+Limitations:
+
+    * only vertex position and colour are recorded; glNormal, glTexCoord and
+      friends called inside glBegin/glEnd apply to the whole primitive
+    * glEnd unbinds GL_ARRAY_BUFFER while it draws (glPopClientAttrib puts
+      the caller's binding back), so the vertex data always comes from the
+      recorder's client-side arrays
+    * colour changes made through the raw GL (not via this module) are not
+      seen by the recorder when it needs to fill in per-vertex colours
+
+With OpenGL.GL.statecache installed glColor* outside glBegin/glEnd goes
+through it, so repeating the current colour costs no GL call.
+"""
+try:
+    import numpy
+except ImportError as err:
+    raise ImportError( """No numpy module present: %s"""%(err))
+from OpenGL.GL.VERSION import GL_1_1 as full
+from OpenGL.GL.VERSION import GL_1_5 as _GL_1_5
+from OpenGL.GL import pointers as _pointers
+from OpenGL.GL import statecache as _statecache
+
+__all__ = (
+    'ImmediateRecorder',
+    'RECORDER',
+    'glBegin',
+    'glEnd',
+    'glVertex',
+    'glVertex2d','glVertex2f','glVertex2i','glVertex2s',
+    'glVertex3d','glVertex3f','glVertex3i','glVertex3s',
+    'glVertex2dv','glVertex2fv','glVertex3dv','glVertex3fv',
+    'glColor',
+    'glColor3d','glColor3f','glColor3ub',
+    'glColor4d','glColor4f','glColor4ub',
+    'glColor3fv','glColor4fv',
+)
+
+class ImmediateRecorder( object ):
+    """Records glBegin/glEnd geometry and flushes it as one array draw
+
+    The vertex and colour buffers are allocated once and grown geometrically,
+    so steady-state drawing performs no per-frame buffer allocation beyond
+    the Python list which collects coordinates between glBegin and glEnd.
+    """
+    def __init__( self, capacity=4096 ):
+        self.capacity = 0
+        self.vertexBuffer = None
+        self.colourBuffer = None
+        self.reserve( capacity )
+        self.mode = None
+        self.currentColour = (1.0,1.0,1.0,1.0)
+        self.vertices = []
+        # (vertex-index, rgba) records for colours set inside glBegin/glEnd
+        self.colourRuns = []
+        self.vertexCount = 0
+        self.drawCount = 0
+    def reserve( self, count ):
+        """Ensure the GL-facing buffers can hold count vertices"""
+        if count <= self.capacity:
+            return
+        capacity = max( self.capacity, 1 )
+        while capacity < count:
+            capacity *= 2
+        self.vertexBuffer = numpy.zeros( (capacity,3), dtype=numpy.float32 )
+        self.colourBuffer = numpy.zeros( (capacity,4), dtype=numpy.float32 )
+        self.capacity = capacity
+    @property
+    def recording( self ):
+        """Whether we are currently between glBegin and glEnd"""
+        return self.mode is not None
+
+    def begin( self, mode ):
+        """Start recording a primitive of the given mode"""
+        if self.mode is not None:
+            # nested glBegin, let the GL report GL_INVALID_OPERATION
+            return full.glBegin( mode )
+        self.mode = mode
+        del self.vertices[:]
+        del self.colourRuns[:]
+    def end( self ):
+        """Finish the current primitive and draw it with glDrawArrays"""
+        if self.mode is None:
+            # unmatched glEnd, let the GL report GL_INVALID_OPERATION
+            return full.glEnd()
+        mode, self.mode = self.mode, None
+        count = len(self.vertices)//3
+        if not count:
+            return
+        self.reserve( count )
+        vertices = self.vertexBuffer[:count]
+        vertices.reshape(-1)[:] = self.vertices
+        full.glPushClientAttrib( full.GL_CLIENT_VERTEX_ARRAY_BIT )
+        try:
+            # a bound GL_ARRAY_BUFFER would turn our pointers into offsets
+            # into it, the binding is client vertex array state so the pop
+            # restores it
+            _GL_1_5.glBindBuffer( _GL_1_5.GL_ARRAY_BUFFER, 0 )
+            full.glEnableClientState( full.GL_VERTEX_ARRAY )
+            _pointers.glVertexPointerf( vertices )
+            if self.colourRuns:
+                full.glEnableClientState( full.GL_COLOR_ARRAY )
+                _pointers.glColorPointerf( self.fillColours( count ) )
+            full.glDrawArrays( mode, 0, count )
+        finally:
+            full.glPopClientAttrib()
+        if self.colourRuns:
+            # current colour is undefined after drawing with GL_COLOR_ARRAY,
+            # immediate mode would leave the last-set colour current
+            full.glColor4f( *self.currentColour )
+            if _statecache.STATE is not None:
+                _statecache.STATE.colour = tuple( self.currentColour )
+        self.vertexCount += count
+        self.drawCount += 1
+    def fillColours( self, count ):
+        """Expand the recorded colour runs into a per-vertex colour array"""
+        runs = self.colourRuns
+        if runs[0][0] != 0:
+            runs.insert( 0, (0,self.startColour) )
+        starts = numpy.array( [start for start,_ in runs], dtype=numpy.intp )
+        lengths = numpy.diff( numpy.append( starts, count ) )
+        colours = numpy.array( [colour for _,colour in runs], dtype=numpy.float32 )
+        target = self.colourBuffer[:count]
+        target[:] = numpy.repeat( colours, lengths, axis=0 )
+        return target
+
+    def vertex2( self, x, y ):
+        if self.mode is None:
+            return full.glVertex2d( x, y )
+        self.vertices.extend( (x,y,0.0) )
+    def vertex3( self, x, y, z ):
+        if self.mode is None:
+            return full.glVertex3d( x, y, z )
+        self.vertices.extend( (x,y,z) )
+    def vertex2v( self, v ):
+        return self.vertex2( v[0], v[1] )
+    def vertex3v( self, v ):
+        return self.vertex3( v[0], v[1], v[2] )
+    def vertex( self, *args ):
+        """Choose 2 or 3-component vertex based on number of args"""
+        if len(args) == 1:
+            args = args[0]
+        if len(args) == 2:
+            return self.vertex2( *args )
+        return self.vertex3( *args )
+    def extend( self, points ):
+        """Record an (N,2) or (N,3) array of vertices in one operation"""
+        points = numpy.asarray( points, dtype=numpy.float32 )
+        if self.mode is None:
+            raise RuntimeError( """extend() called outside of glBegin/glEnd""" )
+        if points.ndim != 2 or points.shape[1] not in (2,3):
+            raise ValueError( """Expected an (N,2) or (N,3) array, got shape %s"""%(points.shape,))
+        if points.shape[1] == 2:
+            full3 = numpy.zeros( (len(points),3), dtype=numpy.float32 )
+            full3[:,:2] = points
+            points = full3
+        self.vertices.extend( points.reshape(-1).tolist() )
+
+    def colour4( self, r, g, b, a=1.0 ):
+        if self.mode is None:
+            self.currentColour = (r,g,b,a)
+            if _statecache.STATE is not None:
+                # skipped when it is the colour already current
+                return _statecache.STATE.colour4f( r, g, b, a )
+            return full.glColor4f( r, g, b, a )
+        if not self.colourRuns:
+            self.startColour = self.currentColour
+        self.currentColour = (r,g,b,a)
+        self.colourRuns.append( (len(self.vertices)//3, self.currentColour) )
+    def colour4ub( self, r, g, b, a=255 ):
+        return self.colour4( r/255., g/255., b/255., a/255. )
+    def colourv( self, v ):
+        return self.colour4( *v )
+    def colour( self, *args ):
+        """Choose 3 or 4-component colour based on number of args"""
+        if len(args) == 1:
+            args = args[0]
+        return self.colour4( *args )
+
+RECORDER = ImmediateRecorder()
+
+glBegin = RECORDER.begin
+glEnd = RECORDER.end
+glVertex = RECORDER.vertex
+glVertex2d = glVertex2f = glVertex2i = glVertex2s = RECORDER.vertex2
+glVertex3d = glVertex3f = glVertex3i = glVertex3s = RECORDER.vertex3
+glVertex2dv = glVertex2fv = RECORDER.vertex2v
+glVertex3dv = glVertex3fv = RECORDER.vertex3v
+glColor = RECORDER.colour
+glColor3d = glColor3f = glColor4d = glColor4f = RECORDER.colour4
+glColor3ub = glColor4ub = RECORDER.colour4ub
+glColor3fv = glColor4fv = RECORDER.colourv
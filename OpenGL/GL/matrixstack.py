@@ -0,0 +1,406 @@
+"""NumPy mirror of the modelview and projection matrix stacks
+
+gluProject and gluUnProject read GL_MODELVIEW_MATRIX, GL_PROJECTION_MATRIX
+and GL_VIEWPORT from the GL on every call they aren't given them, and each
+of those glGet calls waits for the pipeline.  A MatrixStacks follows the
+calls which change them instead:
+
+    glMatrixMode, glLoadIdentity, glLoadMatrix*, glMultMatrix*,
+    gl(Load|Mult)TransposeMatrix*, glTranslate*, glRotate*, glScale*,
+    glOrtho, glFrustum, glPushMatrix/glPopMatrix, glViewport,
+    gluOrtho2D, gluPerspective and gluLookAt
+
+applying the same arithmetic to (4,4) float64 arrays, so OpenGL.GLU's
+gluProject/gluUnProject (and the batched gluProjectMany/gluUnProjectMany)
+take the matrices from the mirror without a GL round trip.
+
+It is opt-in: install() replaces those entry points in the OpenGL.GL and
+OpenGL.GLU namespaces, so it has to happen before the code using them
+imports their names:
+
+    from OpenGL.GL import matrixstack
+    matrixstack.install()
+    from OpenGL.GL import *
+    from OpenGL.GLU import *
+
+Matrices are kept in the GL's column-major layout, as glGetDoublev
+returns them: a point p (as a row) maps to dot( p, matrix ).  Anything
+not known -- state from before install(), matrices changed by code the
+mirror doesn't see (follow that with invalidate()), a glPopMatrix past
+what was pushed since install() -- is None and read from the GL the next
+time it is needed.  Only GL_MODELVIEW and GL_PROJECTION are mirrored,
+operations in other matrix modes are passed through.
+
+Matrix operations compiled into display lists are recorded and applied
+when the list is called; calling a list compiled before install() (or
+with glCallLists) forgets everything.  The mirror assumes the GL accepted
+each call, with error checking off a stack overflow goes unnoticed.
+"""
+import math
+import numpy
+from OpenGL.GL.VERSION import GL_1_1 as full
+
+__all__ = (
+    'MatrixStacks',
+    'STACKS',
+    'install',
+    'uninstall',
+    'invalidate',
+    'identity',
+    'translation',
+    'rotation',
+    'scaling',
+    'ortho',
+    'frustum',
+    'perspective',
+    'lookAt',
+)
+
+# the MatrixStacks in the OpenGL.GL namespace, None until install()
+STACKS = None
+
+# matrix mode: the glGet of its current matrix
+MATRIX_QUERIES = {
+    int(full.GL_MODELVIEW): full.GL_MODELVIEW_MATRIX,
+    int(full.GL_PROJECTION): full.GL_PROJECTION_MATRIX,
+}
+# GL nests display lists at most this deep
+MAX_LIST_NESTING = 64
+
+def identity( ):
+    return numpy.identity( 4, dtype='d' )
+def asMatrix( matrix ):
+    """matrix (16 values in GL order) as a new (4,4) float64 array"""
+    return numpy.array( matrix, dtype='d' ).reshape( (4,4) )
+def translation( x, y, z ):
+    """glTranslate's matrix"""
+    matrix = identity()
+    matrix[3,:3] = x, y, z
+    return matrix
+def scaling( x, y, z ):
+    """glScale's matrix"""
+    return numpy.diag( (x, y, z, 1.0) ).astype( 'd' )
+def rotation( angle, x, y, z ):
+    """glRotate's matrix, angle degrees about (x,y,z)"""
+    length = math.sqrt( x*x + y*y + z*z )
+    if not length:
+        return identity()
+    x, y, z = x/length, y/length, z/length
+    c, s = math.cos( math.radians( angle ) ), math.sin( math.radians( angle ) )
+    t = 1.0 - c
+    # transposed, in the GL's column-major order
+    return numpy.array( [
+        [x*x*t + c, y*x*t + z*s, x*z*t - y*s, 0.0],
+        [x*y*t - z*s, y*y*t + c, y*z*t + x*s, 0.0],
+        [x*z*t + y*s, y*z*t - x*s, z*z*t + c, 0.0],
+        [0.0, 0.0, 0.0, 1.0],
+    ], dtype='d' )
+def ortho( left, right, bottom, top, near, far ):
+    """glOrtho's matrix"""
+    matrix = identity()
+    matrix[0,0] = 2.0 / (right - left)
+    matrix[1,1] = 2.0 / (top - bottom)
+    matrix[2,2] = -2.0 / (far - near)
+    matrix[3,:3] = (
+        -(right + left) / float(right - left),
+        -(top + bottom) / float(top - bottom),
+        -(far + near) / float(far - near),
+    )
+    return matrix
+def frustum( left, right, bottom, top, near, far ):
+    """glFrustum's matrix"""
+    matrix = numpy.zeros( (4,4), dtype='d' )
+    matrix[0,0] = 2.0 * near / (right - left)
+    matrix[1,1] = 2.0 * near / (top - bottom)
+    matrix[2,0] = (right + left) / float(right - left)
+    matrix[2,1] = (top + bottom) / float(top - bottom)
+    matrix[2,2] = -(far + near) / float(far - near)
+    matrix[2,3] = -1.0
+    matrix[3,2] = -2.0 * far * near / (far - near)
+    return matrix
+def perspective( fovy, aspect, near, far ):
+    """gluPerspective's matrix, None where GLU does nothing"""
+    radians = math.radians( fovy / 2.0 )
+    sine = math.sin( radians )
+    if far == near or sine == 0 or aspect == 0:
+        return None
+    cotangent = math.cos( radians ) / sine
+    matrix = numpy.zeros( (4,4), dtype='d' )
+    matrix[0,0] = cotangent / aspect
+    matrix[1,1] = cotangent
+    matrix[2,2] = -(far + near) / float(far - near)
+    matrix[2,3] = -1.0
+    matrix[3,2] = -2.0 * near * far / (far - near)
+    return matrix
+def _normalised( vector ):
+    """vector / its length, unchanged when of length 0 (as GLU does)"""
+    length = numpy.sqrt( numpy.dot( vector, vector ) )
+    if not length:
+        return vector
+    return vector / length
+def lookAt( eyeX, eyeY, eyeZ, centerX, centerY, centerZ, upX, upY, upZ ):
+    """gluLookAt's matrix"""
+    eye = numpy.array( (eyeX, eyeY, eyeZ), dtype='d' )
+    forward = _normalised( numpy.array( (centerX, centerY, centerZ), dtype='d' ) - eye )
+    side = _normalised( numpy.cross( forward, (upX, upY, upZ) ) )
+    up = numpy.cross( side, forward )
+    matrix = identity()
+    matrix[:3,0] = side
+    matrix[:3,1] = up
+    matrix[:3,2] = -forward
+    return numpy.dot( translation( -eyeX, -eyeY, -eyeZ ), matrix )
+
+class MatrixStacks( object ):
+    """Mirror of the GL_MODELVIEW and GL_PROJECTION stacks and the viewport
+
+    stacks maps each mirrored matrix mode to its stack, current matrix
+    last; None (for a matrix, the mode or the viewport) means unknown.
+    The GL function each wrapper calls is kept in originals.
+    """
+    def __init__( self ):
+        self.originals = {}
+        self.mode = None
+        self.stacks = dict([ (mode, [None]) for mode in MATRIX_QUERIES ])
+        self.viewport = None
+        self.attribStack = []
+        # list id: recorded [(operation, args)], see perform()
+        self.lists = {}
+        self.recording = None
+        self.nesting = 0
+
+    def currentMode( self ):
+        """The matrix mode, asked of the GL when not known"""
+        if self.mode is None:
+            from OpenGL.GL import glGetIntegerv
+            self.mode = int( glGetIntegerv( full.GL_MATRIX_MODE ) )
+        return self.mode
+    def matrix( self, mode=None ):
+        """Current (4,4) matrix of mode (default the current mode)
+
+        Read from the GL when not known.  Raises ValueError for modes
+        which are not mirrored.  The array is shared with the mirror,
+        copy it before changing it.
+        """
+        if mode is None:
+            mode = self.currentMode()
+        try:
+            stack = self.stacks[int(mode)]
+        except KeyError:
+            raise ValueError( """Matrix mode %r is not mirrored"""%( mode, ))
+        if stack[-1] is None:
+            from OpenGL.GL import glGetDoublev
+            stack[-1] = asMatrix( glGetDoublev( MATRIX_QUERIES[int(mode)] ) )
+        return stack[-1]
+    def getViewport( self ):
+        """The viewport as an int32 array (x, y, width, height)"""
+        if self.viewport is None:
+            from OpenGL.GL import glGetIntegerv
+            self.viewport = numpy.array(
+                glGetIntegerv( full.GL_VIEWPORT ), dtype='i'
+            ).reshape( (4,) )
+        return self.viewport
+    def invalidate( self ):
+        """Forget everything, it is read from the GL when next needed"""
+        self.mode = None
+        self.viewport = None
+        for stack in self.stacks.values():
+            stack[:] = [None] * len(stack)
+        del self.attribStack[:]
+
+    def perform( self, operation, *args ):
+        """Apply operation( *args ) to the mirror, or record it in the list being compiled"""
+        if self.recording is not None:
+            self.recording[2].append( (operation, args) )
+            if self.recording[1] == full.GL_COMPILE:
+                return
+        operation( *args )
+
+    def currentStack( self ):
+        return self.stacks.get( self.currentMode() )
+    def setMode( self, mode ):
+        self.mode = int(mode)
+    def load( self, matrix ):
+        stack = self.currentStack()
+        if stack is not None:
+            stack[-1] = matrix
+    def multiply( self, matrix ):
+        stack = self.currentStack()
+        if stack is not None and stack[-1] is not None:
+            stack[-1] = numpy.dot( matrix, stack[-1] )
+    def translate( self, x, y, z ):
+        stack = self.currentStack()
+        if stack is not None and stack[-1] is not None:
+            current = stack[-1].copy()
+            current[3] = numpy.dot( (x, y, z, 1.0), current )
+            stack[-1] = current
+    def push( self ):
+        stack = self.currentStack()
+        if stack is not None:
+            # operations replace the current matrix, never change it in place
+            stack.append( stack[-1] )
+    def pop( self ):
+        stack = self.currentStack()
+        if stack is not None:
+            stack.pop()
+            if not stack:
+                # pushed before we were watching
+                stack.append( None )
+    def setViewport( self, x, y, width, height ):
+        self.viewport = numpy.array( (x, y, width, height), dtype='i' )
+    def pushAttrib( self, mask ):
+        self.attribStack.append( (int(mask), self.mode, self.viewport) )
+    def popAttrib( self ):
+        if not self.attribStack:
+            self.mode = self.viewport = None
+            return
+        mask, mode, viewport = self.attribStack.pop()
+        if mask & full.GL_TRANSFORM_BIT:
+            self.mode = mode
+        if mask & full.GL_VIEWPORT_BIT:
+            self.viewport = viewport
+    def callList( self, list ):
+        operations = self.lists.get( int(list) )
+        if operations is None or self.nesting >= MAX_LIST_NESTING:
+            self.invalidate()
+            return
+        self.nesting += 1
+        try:
+            for operation, args in operations:
+                operation( *args )
+        finally:
+            self.nesting -= 1
+
+    def wrappers( self, namespace, operations ):
+        """Build {name: replacement} for operations' names found in namespace
+
+        operations maps names to (operation, convert), the wrapper calls
+        the original and then performs operation( *convert( *args ) ) (or
+        operation( *args ) when convert is None).
+        """
+        result = {}
+        for name, (operation, convert) in operations.items():
+            original = getattr( namespace, name, None )
+            if original is None:
+                continue
+            self.originals[(namespace.__name__, name)] = original
+            result[name] = self.wrapper( name, original, operation, convert )
+        return result
+    def wrapper( self, name, original, operation, convert ):
+        perform = self.perform
+        if convert is None:
+            def wrapped( *args ):
+                result = original( *args )
+                perform( operation, *args )
+                return result
+        else:
+            def wrapped( *args ):
+                result = original( *args )
+                perform( operation, *convert( *args ) )
+                return result
+        wrapped.__name__ = name
+        wrapped.__doc__ = getattr( original, '__doc__', None )
+        return wrapped
+    def glOperations( self ):
+        """The OpenGL.GL names mirrored, see wrappers()"""
+        one = lambda matrix: (asMatrix( matrix ),)
+        transposed = lambda matrix: (asMatrix( matrix ).T.copy(),)
+        operations = {
+            'glMatrixMode': (self.setMode, None),
+            'glLoadIdentity': (self.load, lambda: (identity(),)),
+            'glPushMatrix': (self.push, None),
+            'glPopMatrix': (self.pop, None),
+            'glTranslatef': (self.translate, None),
+            'glTranslated': (self.translate, None),
+            'glRotatef': (self.multiply, lambda *args: (rotation( *args ),)),
+            'glRotated': (self.multiply, lambda *args: (rotation( *args ),)),
+            'glScalef': (self.multiply, lambda *args: (scaling( *args ),)),
+            'glScaled': (self.multiply, lambda *args: (scaling( *args ),)),
+            'glOrtho': (self.multiply, lambda *args: (ortho( *args ),)),
+            'glFrustum': (self.multiply, lambda *args: (frustum( *args ),)),
+            'glViewport': (self.setViewport, None),
+            'glPushAttrib': (self.pushAttrib, None),
+            'glPopAttrib': (self.popAttrib, None),
+            'glCallList': (self.callList, None),
+            'glCallLists': (self.invalidate, lambda *args: ()),
+        }
+        for suffix in 'fd':
+            operations['glLoadMatrix'+suffix] = (self.load, one)
+            operations['glMultMatrix'+suffix] = (self.multiply, one)
+            operations['glLoadTransposeMatrix'+suffix] = (self.load, transposed)
+            operations['glMultTransposeMatrix'+suffix] = (self.multiply, transposed)
+        return operations
+    def gluOperations( self ):
+        """The OpenGL.GLU names mirrored, see wrappers()"""
+        return {
+            'gluOrtho2D': (self.multiply, lambda left, right, bottom, top: (
+                ortho( left, right, bottom, top, -1.0, 1.0 ),
+            )),
+            'gluPerspective': (self.multiplyPerspective, None),
+            'gluLookAt': (self.multiply, lambda *args: (lookAt( *args ),)),
+        }
+    def multiplyPerspective( self, fovy, aspect, near, far ):
+        matrix = perspective( fovy, aspect, near, far )
+        if matrix is not None:
+            self.multiply( matrix )
+
+    def glNewList( self, list, mode ):
+        result = self._glNewList( list, mode )
+        self.recording = (int(list), mode, [])
+        return result
+    def glEndList( self ):
+        result = self._glEndList()
+        if self.recording is not None:
+            list, mode, operations = self.recording
+            self.lists[list] = operations
+            self.recording = None
+        return result
+    def glDeleteLists( self, list, range ):
+        result = self._glDeleteLists( list, range )
+        first, last = int(list), int(list) + int(range)
+        for id in [ id for id in self.lists if first <= id < last ]:
+            del self.lists[id]
+        return result
+
+def install( stacks=None ):
+    """Replace the mirrored functions in OpenGL.GL and OpenGL.GLU with stacks' (default a new MatrixStacks)
+
+    Returns the installed MatrixStacks, installing twice returns the first.
+    """
+    global STACKS
+    if STACKS is not None:
+        return STACKS
+    from OpenGL import GL, GLU
+    if stacks is None:
+        stacks = MatrixStacks()
+    replacements = [
+        (GL, stacks.wrappers( GL, stacks.glOperations() )),
+        (GLU, stacks.wrappers( GLU, stacks.gluOperations() )),
+    ]
+    lists = {}
+    for name in ('glNewList','glEndList','glDeleteLists'):
+        original = getattr( GL, name )
+        stacks.originals[(GL.__name__, name)] = original
+        setattr( stacks, '_'+name, original )
+        lists[name] = getattr( stacks, name )
+    replacements.append( (GL, lists) )
+    for namespace, functions in replacements:
+        for name, function in functions.items():
+            setattr( namespace, name, function )
+    STACKS = stacks
+    return stacks
+
+def uninstall( ):
+    """Put the original functions back into OpenGL.GL and OpenGL.GLU"""
+    global STACKS
+    if STACKS is None:
+        return None
+    import sys
+    for (module, name), function in STACKS.originals.items():
+        setattr( sys.modules[module], name, function )
+    stacks, STACKS = STACKS, None
+    return stacks
+
+def invalidate( ):
+    """Forget the installed MatrixStacks' state, it is read from the GL when next needed"""
+    if STACKS is not None:
+        STACKS.invalidate()
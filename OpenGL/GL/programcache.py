@@ -0,0 +1,205 @@
+"""On-disk cache of linked shader program binaries
+
+Compiling and linking GLSL is repeated on every launch, and with dozens of
+programs that adds up to a noticeable part of startup (on software GL as
+much as on hardware drivers).  A ProgramCache keeps the binaries
+glGetProgramBinary returns for linked programs in files named by a hash of
+the shader types and sources, the program flags and the GL_RENDERER and
+GL_VERSION strings, so compileProgram can hand a binary straight to
+glProgramBinary on later runs.  Binaries are not portable, a different
+driver (or version of it) makes for different keys, and a binary the GL
+refuses anyway is dropped and the program built from source again.
+
+The cache is opt-in, either per call:
+
+    cache = programcache.ProgramCache()
+    program = shaders.compileProgram(
+        (vertexSource, GL_VERTEX_SHADER),
+        (fragmentSource, GL_FRAGMENT_SHADER),
+        cache=cache,
+    )
+
+or for every compileProgram call by setting OpenGL.SHADER_CACHE (or the
+PYOPENGL_SHADER_CACHE environment variable) to a directory, or to True for
+the default directory (see defaultDirectory).  Passing (source, type)
+pairs rather than compiled shaders lets a cached program skip compiling
+the shaders as well as linking them.
+
+Files are written to a temporary name and renamed into place, so readers
+never see partial files, and the least recently used are deleted once the
+files take more than max_bytes.
+"""
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+from OpenGL.raw.GL.VERSION import GL_1_1
+from OpenGL._bytes import as_8_bit
+log = logging.getLogger( __name__ )
+
+__all__ = (
+    'ProgramCache',
+    'defaultDirectory',
+    'defaultCache',
+)
+
+# bump when the key or file layout changes, older files are then ignored
+CACHE_VERSION = 1
+
+def defaultDirectory( ):
+    """$XDG_CACHE_HOME (or %LOCALAPPDATA%, or ~/.cache)/pyopengl/programs"""
+    base = os.environ.get( 'XDG_CACHE_HOME' ) or os.environ.get( 'LOCALAPPDATA' )
+    if not base:
+        base = os.path.join( os.path.expanduser( '~' ), '.cache' )
+    return os.path.join( base, 'pyopengl', 'programs' )
+
+_defaultCache = [None, None]
+def defaultCache( ):
+    """The ProgramCache OpenGL.SHADER_CACHE asks for, or None"""
+    import OpenGL
+    setting = getattr( OpenGL, 'SHADER_CACHE', False )
+    if isinstance( setting, ProgramCache ):
+        return setting
+    if isinstance( setting, str ) and setting.lower() in ('','0','false'):
+        setting = False
+    if not setting:
+        return None
+    if not isinstance( setting, str ) or setting.lower() in ('1','true'):
+        setting = defaultDirectory()
+    if _defaultCache[0] != setting:
+        _defaultCache[:] = [setting, ProgramCache( setting )]
+    return _defaultCache[1]
+
+class ProgramCache( object ):
+    """Program binaries stored in (a versioned subdirectory of) directory
+
+    directory -- where to keep the files, default defaultDirectory()
+    max_bytes -- once the files take more than this the least recently
+        used ones are deleted
+    """
+    MAGIC = b'PYOGLPRG'
+    HEADER = struct.Struct( '<8sII' )
+    SUFFIX = '.bin'
+    def __init__( self, directory=None, max_bytes=32*1024*1024 ):
+        if directory is None:
+            directory = defaultDirectory()
+        self.directory = os.path.join( directory, 'v%d'%(CACHE_VERSION,) )
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+    def key( self, sources, flags=() ):
+        """Hex key for (shaderType, source) pairs and program flags
+
+        Includes the current context's GL_RENDERER and GL_VERSION, so
+        needs a current context.
+        """
+        digest = hashlib.sha256()
+        def add( value ):
+            value = as_8_bit( value )
+            digest.update( struct.pack( '<I', len(value) ) )
+            digest.update( value )
+        add( GL_1_1.glGetString( GL_1_1.GL_RENDERER ) or b'' )
+        add( GL_1_1.glGetString( GL_1_1.GL_VERSION ) or b'' )
+        for flag in sorted( flags ):
+            add( flag )
+        for shaderType, source in sources:
+            add( str( int( shaderType ) ) )
+            add( source )
+        return digest.hexdigest()
+    def path( self, key ):
+        return os.path.join( self.directory, key + self.SUFFIX )
+    def load( self, key ):
+        """Get (format, binary) stored for key, or None
+
+        Marks the file as used for eviction.  Unreadable files are deleted
+        and treated as missing.
+        """
+        path = self.path( key )
+        try:
+            with open( path, 'rb' ) as f:
+                data = f.read()
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+        if len(data) >= self.HEADER.size:
+            magic, format, length = self.HEADER.unpack_from( data )
+            binary = data[self.HEADER.size:]
+            if magic == self.MAGIC and length == len(binary):
+                try:
+                    os.utime( path, None )
+                except OSError:
+                    pass
+                self.hits += 1
+                return format, binary
+        log.info( 'Dropping damaged program binary %s', path )
+        self.discard( key )
+        self.misses += 1
+        return None
+    def store( self, key, format, binary ):
+        """Atomically write binary of format for key, then evict as needed
+
+        Failing to write is logged, the cache being an optimisation only.
+        """
+        binary = bytes( binary )
+        try:
+            if not os.path.isdir( self.directory ):
+                os.makedirs( self.directory )
+            handle, temporary = tempfile.mkstemp(
+                prefix='.tmp-', suffix=self.SUFFIX, dir=self.directory,
+            )
+            try:
+                with os.fdopen( handle, 'wb' ) as f:
+                    f.write( self.HEADER.pack( self.MAGIC, format, len(binary) ) )
+                    f.write( binary )
+                os.replace( temporary, self.path( key ) )
+            except BaseException:
+                os.remove( temporary )
+                raise
+        except (IOError, OSError) as err:
+            log.warning( 'Unable to store program binary in %s: %s', self.directory, err )
+            return False
+        self.evict()
+        return True
+    def discard( self, key ):
+        """Delete the binary stored for key, if any"""
+        try:
+            os.remove( self.path( key ) )
+        except OSError:
+            pass
+    def entries( self ):
+        """[(last used, size, path)] of the stored binaries"""
+        result = []
+        try:
+            names = os.listdir( self.directory )
+        except OSError:
+            return result
+        for name in names:
+            if name.endswith( self.SUFFIX ) and not name.startswith( '.' ):
+                path = os.path.join( self.directory, name )
+                try:
+                    stat = os.stat( path )
+                except OSError:
+                    continue
+                result.append( (stat.st_mtime, stat.st_size, path) )
+        return result
+    def size( self ):
+        """Bytes taken by the stored binaries"""
+        return sum( [ entry[1] for entry in self.entries() ] )
+    def evict( self, max_bytes=None ):
+        """Delete least recently used binaries until at most max_bytes remain"""
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        entries = sorted( self.entries() )
+        total = sum( [ entry[1] for entry in entries ] )
+        for used, size, path in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove( path )
+            except OSError:
+                continue
+            total -= size
+        return total
+    def clear( self ):
+        """Delete all of the stored binaries"""
+        self.evict( 0 )
@@ -0,0 +1,190 @@
+"""Pixel readback without per-frame allocation or pipeline stalls
+
+glReadPixels creates a new array for every call and returns only once the
+GL has finished drawing the frame and copied it out.  Capturing every
+frame (replays, screenshots) wants neither, so this module provides:
+
+    ReadbackPool -- reads pixels into a fixed set of arrays which are
+        handed out again in turn instead of allocating new ones
+    PixelPackRing -- reads pixels into a ring of pixel buffer objects and
+        returns the frame read `depth` reads earlier, which the GL has had
+        that long to finish, so the read returns without waiting for the
+        GL and the GL never waits for the reader
+
+Images come back as (height, width, components) arrays (of the default
+output array type, normally numpy) in the GL's bottom-to-top row order.
+The arrays belong to the pool: one is overwritten when the pool hands it
+out again, `count` reads of the same size later, so copy anything which
+has to live longer.  Before every read the pack alignment, row length
+and skips are set for a tightly packed image, whatever set them before
+(see OpenGL.images.PACK_LAYOUT_STORES).
+
+    ring = readback.PixelPackRing( depth=3 )
+    for frame in frames:
+        draw( frame )
+        image = ring.read( 0, 0, 800, 600 )
+        if image is not None:
+            save( image )
+    for image in ring.flush():
+        save( image )
+"""
+import ctypes
+from OpenGL import images, arrays, extensions
+from OpenGL.arrays.arraydatatype import ArrayDatatype
+from OpenGL.raw.GL.VERSION import GL_1_1, GL_1_5, GL_2_1
+from OpenGL.GL import statecache
+
+__all__ = (
+    'ReadbackPool',
+    'PixelPackRing',
+)
+
+def imageByteCount( format, dims, type ):
+    """Bytes a tightly packed (pack alignment 1) image of dims takes"""
+    arrayType = arrays.GL_CONSTANT_TO_ARRAY_TYPE[ images.TYPE_TO_ARRAYTYPE.get(type,type) ]
+    components = 1
+    if type not in images.TIGHT_PACK_FORMATS:
+        components = images.formatToComponentCount( format )
+    count = components
+    for dim in dims:
+        count *= dim
+    return count * ctypes.sizeof( arrayType.baseType )
+
+def setupPacking( ):
+    """Set the pixel-store state for a tightly packed 2D read
+
+    Besides what glReadPixels sets, resets the row length and skips, so
+    every read writes exactly imageByteCount bytes.
+    """
+    images.setupDefaultTransferMode()
+    images.rankPacking( 3 )
+    for pname in (
+        GL_1_1.GL_PACK_ROW_LENGTH, GL_1_1.GL_PACK_SKIP_ROWS, GL_1_1.GL_PACK_SKIP_PIXELS,
+    ):
+        GL_1_1.glPixelStorei( pname, 0 )
+
+class ReadbackPool( object ):
+    """Destination arrays for pixel reads, reused round-robin
+
+    count -- number of arrays kept for each image format, type and size,
+        an array is handed out again count reads after it was returned
+    """
+    def __init__( self, count=2 ):
+        self.count = count
+        self.slots = {}
+    def acquire( self, format, dims, type ):
+        """Get the next (array, data pointer) for an image of (height, width) dims"""
+        key = (format, dims, type)
+        slot = self.slots.get( key )
+        if slot is None:
+            slot = self.slots[ key ] = [ [], 0 ]
+        entries, index = slot
+        if len(entries) < self.count:
+            array = images.createTargetArray( format, dims, type )
+            entries.append( (array, ArrayDatatype.voidDataPointer( array )) )
+            index = len(entries) - 1
+        slot[1] = (index + 1) % self.count
+        return entries[ index ]
+    def read( self, x, y, width, height, format=GL_1_1.GL_RGBA, type=GL_1_1.GL_UNSIGNED_BYTE ):
+        """Read pixels synchronously into the next of our arrays and return it"""
+        array, pointer = self.acquire( format, (height, width), type )
+        setupPacking()
+        GL_1_1.glReadPixels( x, y, width, height, format, type, pointer )
+        return array
+    def clear( self ):
+        """Release all of the arrays"""
+        self.slots.clear()
+
+class PixelPackRing( object ):
+    """Asynchronous pixel reads through a ring of pixel buffer objects
+
+    read() has the GL copy the pixels into the next buffer of the ring,
+    which returns right away, and returns the image the previous read
+    into that buffer (`depth` reads earlier) put there, copied into an
+    array from pool, or None while the ring is still filling.  flush()
+    returns the images still in the ring, oldest first.  The default pool
+    keeps depth arrays per size, enough for all of those to be kept.
+
+    Without pixel buffer objects (GL 2.1 or ARB_pixel_buffer_object) reads
+    are done synchronously through the pool, every read returning its own
+    image.
+    """
+    def __init__( self, depth=3, pool=None ):
+        self.depth = depth
+        self.pool = pool if pool is not None else ReadbackPool( depth )
+        self.available = None
+        self.buffers = []
+        self.capacities = [0] * depth
+        # (format, dims, type) read into each buffer and not yet returned
+        self.pending = [None] * depth
+        self.index = 0
+    def create_buffers( self ):
+        """Check for pixel buffer objects, creating the buffers if available"""
+        self.available = bool(
+            extensions.hasGLExtension( 'GL_VERSION_GL_2_1' )
+            or extensions.hasGLExtension( 'GL_ARB_pixel_buffer_object' )
+        )
+        if self.available:
+            from OpenGL.GL.VERSION.GL_1_5 import glGenBuffers
+            self.buffers = [ int(glGenBuffers( 1 )) for i in range( self.depth ) ]
+    def read( self, x, y, width, height, format=GL_1_1.GL_RGBA, type=GL_1_1.GL_UNSIGNED_BYTE ):
+        """Start reading pixels, return the image read depth reads ago (or None)"""
+        if self.available is None:
+            self.create_buffers()
+        if not self.available:
+            return self.pool.read( x, y, width, height, format, type )
+        index = self.index
+        self.index = (index + 1) % self.depth
+        target = GL_2_1.GL_PIXEL_PACK_BUFFER
+        GL_1_5.glBindBuffer( target, self.buffers[ index ] )
+        try:
+            result = self.collect( index )
+            dims = (height, width)
+            size = imageByteCount( format, dims, type )
+            if size > self.capacities[ index ]:
+                GL_1_5.glBufferData( target, size, None, GL_1_5.GL_STREAM_READ )
+                self.capacities[ index ] = size
+            setupPacking()
+            # with a pack buffer bound the pointer is an offset into it
+            GL_1_1.glReadPixels( x, y, width, height, format, type, None )
+            self.pending[ index ] = (format, dims, type)
+        finally:
+            GL_1_5.glBindBuffer( target, 0 )
+            statecache.noteBuffer( target, 0 )
+        return result
+    def collect( self, index ):
+        """Copy the image pending in (bound) buffer index into a pool array"""
+        pending = self.pending[ index ]
+        if pending is None:
+            return None
+        self.pending[ index ] = None
+        format, dims, type = pending
+        array, pointer = self.pool.acquire( format, dims, type )
+        GL_1_5.glGetBufferSubData(
+            GL_2_1.GL_PIXEL_PACK_BUFFER, 0, imageByteCount( format, dims, type ), pointer
+        )
+        return array
+    def flush( self ):
+        """Return the images still in the ring, oldest first"""
+        result = []
+        target = GL_2_1.GL_PIXEL_PACK_BUFFER
+        for offset in range( self.depth ):
+            index = (self.index + offset) % self.depth
+            if self.pending[ index ] is not None:
+                GL_1_5.glBindBuffer( target, self.buffers[ index ] )
+                try:
+                    result.append( self.collect( index ) )
+                finally:
+                    GL_1_5.glBindBuffer( target, 0 )
+                    statecache.noteBuffer( target, 0 )
+        return result
+    def delete( self ):
+        """Delete the buffers (and drop any pending images)"""
+        if self.buffers:
+            from OpenGL.GL.VERSION.GL_1_5 import glDeleteBuffers
+            glDeleteBuffers( len(self.buffers), self.buffers )
+            statecache.invalidate( 'buffers' )
+        self.buffers = []
+        self.capacities = [0] * self.depth
+        self.pending = [None] * self.depth
+        self.available = None
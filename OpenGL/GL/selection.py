@@ -3,8 +3,21 @@
 This code is resonsible for turning gluint *
 arrays into structured representations for use
 by Python-level code.
+
+With numpy available the whole buffer is decoded at once into a
+SelectionHits sequence: structured arrays of each hit's near/far depth
+and the span of its names in a flat names array, with GLSelectRecord
+objects only created for the hits that are looked at.
 """
 from OpenGL._bytes import integer_types
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 def uintToLong( value ):
     if value < 0:
@@ -27,7 +40,17 @@ class GLSelectRecord( object ):
     DISTANCE_DIVISOR = float((2**32)-1)
     __slots__ = ('near','far','names')
     def fromArray( cls, array, total ):
-        """Produce list with all records from the array"""
+        """Produce a sequence with all records from the array
+
+        Returns a SelectionHits (decoded with numpy) when numpy is
+        available, otherwise a list of records from fromArrayObjects
+        """
+        if numpy is None:
+            return cls.fromArrayObjects( array, total )
+        return SelectionHits.fromArray( array, total )
+    fromArray = classmethod( fromArray )
+    def fromArrayObjects( cls, array, total ):
+        """Produce list with all records from the array, one record at a time"""
         result = []
         index = 0
         arrayLength = len(array)
@@ -41,7 +64,7 @@ class GLSelectRecord( object ):
             result.append(  cls( near, far, names ) )
             index += 3+count
         return result
-    fromArray = classmethod( fromArray )
+    fromArrayObjects = classmethod( fromArrayObjects )
     
     def __init__( self, near, far, names ):
         """Initialise/store the values"""
@@ -62,3 +85,129 @@ class GLSelectRecord( object ):
                 raise KeyError( """Don't have an index/key %r for %s instant"""%(
                     key, self.__class__,
                 ))
+
+if numpy is not None:
+    HIT_DTYPE = numpy.dtype([
+        ('near', numpy.float64),
+        ('far', numpy.float64),
+        ('start', numpy.intp),
+        ('count', numpy.intp),
+    ])
+
+def hitOffsets( data, total ):
+    """Offsets of the (up to) total hit records in the uint32 array data
+
+    Each record is count, near, far and count names, so a record's offset
+    depends on every earlier count.  When all of the records have the same
+    count (one name per object being the usual case) that is checked with
+    one comparison over the would-be record starts, otherwise the counts
+    are followed through a list of the values.
+    """
+    arrayLength = len(data)
+    if total <= 0 or arrayLength < 3:
+        return numpy.zeros( 0, dtype=numpy.intp )
+    stride = 3 + int(data[0])
+    if stride * total <= arrayLength:
+        offsets = numpy.arange( 0, stride*total, stride, dtype=numpy.intp )
+        if (data[offsets] == stride - 3).all():
+            return offsets
+    offsets = []
+    values = data.tolist()
+    index = 0
+    for item in range( total ):
+        if index + 2 >= arrayLength:
+            break
+        offsets.append( index )
+        index += 3 + values[index]
+    return numpy.array( offsets, dtype=numpy.intp )
+
+class SelectionHits( Sequence ):
+    """Selection-buffer hit records decoded into numpy arrays
+
+    hits -- structured array with a row per hit of
+        near, far -- depths as floats in the range 0.0-1.0
+        start, count -- the hit's names are names[start:start+count]
+    names -- uint32 array of all of the hits' names, one after the other
+
+    near and far are also available as attributes, so the closest hit is
+    hits.names_of( hits.near.argmin() ).  As a sequence
+    this behaves like the list of GLSelectRecords fromArrayObjects
+    returns, creating each record the first time it is looked up (or all
+    of them when iterating).
+    """
+    def __init__( self, hits, names ):
+        self.hits = hits
+        self.names = names
+        self._records = [None] * len(hits)
+    @classmethod
+    def fromArray( cls, array, total ):
+        """Decode the first total hits of the selection buffer array"""
+        data = numpy.asarray( array )
+        if data.dtype.itemsize != 4 or data.dtype.kind not in 'iu':
+            data = data.astype( numpy.uint32 )
+        data = data.reshape( -1 ).view( numpy.uint32 )
+        offsets = hitOffsets( data, total )
+        # a truncated last hit keeps the names the array has room for
+        counts = numpy.minimum( data[offsets], len(data) - 3 - offsets )
+        hits = numpy.empty( len(offsets), dtype=HIT_DTYPE )
+        hits['near'] = data[offsets+1]
+        hits['near'] /= GLSelectRecord.DISTANCE_DIVISOR
+        hits['far'] = data[offsets+2]
+        hits['far'] /= GLSelectRecord.DISTANCE_DIVISOR
+        hits['count'] = counts
+        # pack the names together, dropping the count/near/far between them
+        starts = numpy.zeros( len(offsets), dtype=numpy.intp )
+        numpy.cumsum( counts[:-1], out=starts[1:] )
+        hits['start'] = starts
+        nameIndex = numpy.arange( counts.sum(), dtype=numpy.intp )
+        nameIndex += numpy.repeat( offsets + 3 - starts, counts )
+        return cls( hits, data[nameIndex] )
+    near = property( lambda self: self.hits['near'] )
+    far = property( lambda self: self.hits['far'] )
+    def names_of( self, index ):
+        """The uint32 array of names of hit index"""
+        hit = self.hits[index]
+        return self.names[hit['start']:hit['start']+hit['count']]
+    def createRecord( self, near, far, names ):
+        record = GLSelectRecord.__new__( GLSelectRecord )
+        record.near = near
+        record.far = far
+        record.names = names
+        return record
+    def createRecords( self ):
+        """Create the GLSelectRecords of all of the hits"""
+        names = self.names.tolist()
+        create = self.createRecord
+        return [
+            create( near, far, names[start:start+count] )
+            for near, far, start, count in zip(
+                self.near.tolist(), self.far.tolist(),
+                self.hits['start'].tolist(), self.hits['count'].tolist(),
+            )
+        ]
+    def record( self, index ):
+        """Create the GLSelectRecord for hit index"""
+        hit = self.hits[index]
+        return self.createRecord(
+            float(hit['near']), float(hit['far']), self.names_of( index ).tolist(),
+        )
+    def __len__( self ):
+        return len(self.hits)
+    def __getitem__( self, index ):
+        if isinstance( index, slice ):
+            return [ self[i] for i in range( *index.indices( len(self) ) ) ]
+        record = self._records[index]
+        if record is None:
+            record = self._records[index] = self.record( index )
+        return record
+    def __iter__( self ):
+        """Iterate over the records, creating any missing all at once"""
+        if None in self._records:
+            created = self.createRecords()
+            self._records = [
+                record if record is not None else new
+                for record, new in zip( self._records, created )
+            ]
+        return iter( self._records )
+    def __repr__( self ):
+        return '<%s of %d hits>'%( self.__class__.__name__, len(self) )
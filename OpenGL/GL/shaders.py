@@ -6,7 +6,8 @@ even if the local hardware only supports ARB extension-based
 shader rendering.
 
 There are also two utility methods compileProgram and compileShader
-which make it easy to create demos which are shader-using.
+which make it easy to create demos which are shader-using.  Linked
+programs can be kept on disk between runs, see OpenGL.GL.programcache.
 """
 import logging
 log = logging.getLogger( __name__ )
@@ -16,6 +17,8 @@ from OpenGL.GL.ARB import (
     geometry_shader4, separate_shader_objects, get_program_binary,
 )
 from OpenGL.extensions import alternate
+from OpenGL.error import GLError
+from OpenGL.GL.programcache import ProgramCache, defaultCache
 from OpenGL._bytes import bytes,unicode,as_8_bit
 
 __all__ = [
@@ -32,6 +35,7 @@ __all__ = [
     'ShaderCompilationError', 
     'ShaderValidationError', 
     'ShaderLinkError',
+    'ProgramCache',
     # automatically added stuff here...
 ]
 
@@ -135,17 +139,23 @@ class ShaderProgram( int ):
         they should be used solely for caching compiled programs for 
         local use; i.e. to reduce compilation overhead.
         
-        returns (format,binaryData) for the shader program
+        returns (format,binaryData) for the shader program, with 
+        binaryData as bytes
         """
-        from OpenGL.raw.GL._types import GLint,GLenum 
-        from OpenGL.arrays import GLbyteArray
+        import ctypes
+        from OpenGL.raw.GL._types import GLint,GLenum,GLsizei
+        from OpenGL.raw.GL.ARB.get_program_binary import glGetProgramBinary
         size = GLint()
         glGetProgramiv( self, get_program_binary.GL_PROGRAM_BINARY_LENGTH, size )
-        result = GLbyteArray.zeros( (size.value,))
-        size2 = GLint()
+        # the wrapped glGetProgramBinary leaves a passed-in array 
+        # untouched, so read into a buffer with the raw function
+        result = ctypes.create_string_buffer( size.value )
+        length = GLsizei()
         format = GLenum()
-        get_program_binary.glGetProgramBinary( self, size.value, size2, format, result )
-        return format.value, result 
+        glGetProgramBinary( 
+            self, size.value, ctypes.byref(length), ctypes.byref(format), result,
+        )
+        return format.value, result.raw[:length.value]
     def load( self, format, binary, validate=True ):
         """Attempt to load binary-format for a pre-compiled shader
         
@@ -161,7 +171,8 @@ def compileProgram(*shaders, **named):
     """Create a new program, attach shaders and validate
 
     shaders -- arbitrary number of shaders to attach to the
-        generated program.
+        generated program, either compiled shaders or 
+        (source, shaderType) pairs to pass to compileShader
     separable (keyword only) -- set the separable flag to allow 
         for partial installation of shader into the pipeline (see 
         glUseProgramStages)
@@ -174,6 +185,13 @@ def compileProgram(*shaders, **named):
         function is *not* really intended for advanced usage,
         if you're finding yourself specifying this flag you 
         likely should be using your own shader management code.
+    cache (keyword only) -- programcache.ProgramCache to load 
+        the linked program from (and store it in), default the 
+        cache OpenGL.SHADER_CACHE configures, False for none.
+        When the program is found (source) pairs are not compiled 
+        at all, otherwise the program is built as usual and its 
+        binary stored.  Needs glProgramBinary (GL 4.1 or 
+        ARB_get_program_binary), without it the cache is ignored.
 
     This convenience function is *not* standard OpenGL,
     but it does wind up being fairly useful for demos
@@ -198,10 +216,29 @@ def compileProgram(*shaders, **named):
         ShaderCompilationError, ShaderValidationError, ShaderLinkError,
     } when a link/validation failure occurs
     """
+    cache = named.get('cache')
+    if cache is None:
+        cache = defaultCache()
+    key = None
+    if cache and programBinarySupported():
+        key = cache.key(
+            [ shaderSource( shader ) for shader in shaders ],
+            [ flag for flag in ('separable',) if named.get(flag) ],
+        )
+        program = loadCachedProgram( cache, key, named )
+        if program is not None:
+            for shader in shaders:
+                if not isinstance( shader, tuple ):
+                    glDeleteShader(shader)
+            return program
+    shaders = [
+        compileShader( *shader ) if isinstance( shader, tuple ) else shader
+        for shader in shaders
+    ]
     program = glCreateProgram()
     if named.get('separable'):
         glProgramParameteri( program, separate_shader_objects.GL_PROGRAM_SEPARABLE, GL_TRUE )
-    if named.get('retrievable'):
+    if named.get('retrievable') or key is not None:
         glProgramParameteri( program, get_program_binary.GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE )
     for shader in shaders:
         glAttachShader(program, shader)
@@ -212,7 +249,47 @@ def compileProgram(*shaders, **named):
     program.check_linked()
     for shader in shaders:
         glDeleteShader(shader)
+    if key is not None:
+        try:
+            format, binary = program.retrieve()
+        except GLError as err:
+            log.info( 'Unable to retrieve program binary: %s', err )
+        else:
+            cache.store( key, format, binary )
     return program
+def programBinarySupported( ):
+    """Whether the current context can save and load program binaries"""
+    if not get_program_binary.glProgramBinary:
+        return False
+    return GL.glGetIntegerv( get_program_binary.GL_NUM_PROGRAM_BINARY_FORMATS ) > 0
+def shaderSource( shader ):
+    """(shaderType, source) of a compiled shader or (source, shaderType) pair"""
+    if isinstance( shader, tuple ):
+        source, shaderType = shader
+        if isinstance( source, (bytes,unicode)):
+            source = [ source ]
+        return shaderType, bytes().join([ as_8_bit(s) for s in source ])
+    return glGetShaderiv( shader, GL.GL_SHADER_TYPE ), as_8_bit( glGetShaderSource( shader ) )
+def loadCachedProgram( cache, key, named ):
+    """Create a ShaderProgram from the binary cache holds for key, or None
+
+    A binary the GL refuses is dropped from the cache.
+    """
+    stored = cache.load( key )
+    if stored is None:
+        return None
+    format, binary = stored
+    program = glCreateProgram()
+    if named.get('separable'):
+        glProgramParameteri( program, separate_shader_objects.GL_PROGRAM_SEPARABLE, GL_TRUE )
+    program = ShaderProgram( program )
+    try:
+        return program.load( format, binary, validate=named.get('validate', True) )
+    except (GLError, ShaderLinkError, ShaderValidationError) as err:
+        log.info( 'Cached program binary refused, building from source: %s', err )
+        GL.glDeleteProgram( program )
+        cache.discard( key )
+        return None
 def compileShader( source, shaderType ):
     """Compile shader source of given type
 
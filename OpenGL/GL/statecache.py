@@ -0,0 +1,669 @@
+"""Client-side shadow of GL state which drops redundant state calls
+
+Frame loops re-issue the same state every frame: the same glColor for
+every line of a car, glEnable for a cap which is already enabled, binding
+the texture, buffer or program which is already bound.  Each of those
+still pays for the wrapper, the ctypes call and (by default) glGetError.
+A StateCache mirrors
+
+    the current colour (glColor*)
+    enabled caps (glEnable/glDisable, texture caps per texture unit)
+    the buffer bound to each target, the texture bound to each target of
+    each unit, the active texture unit and the program in use
+    the blend function and the matrix mode
+
+and returns straight away from calls which would set what is already set.
+
+It is opt-in: install() (or PYOPENGL_STATE_CACHE=1, which installs it as
+OpenGL.GL is imported) replaces those entry points in the OpenGL.GL
+namespace, so it has to happen before the code using them imports their
+names from OpenGL.GL:
+
+    from OpenGL.GL import statecache
+    statecache.install()
+    from OpenGL.GL import *
+
+The mirror follows glPushAttrib/glPopAttrib (forgetting what it can't
+restore), glPushClientAttrib/glPopClientAttrib, display lists (nothing is
+dropped while compiling, calling a list forgets what the list changes),
+deleting buffers and textures and drawing with a colour array.  The
+PyOpenGL helpers binding buffers through the version modules (vbo.VBO,
+vbo.StreamingVBO, readback.PixelPackRing) report their binds with
+noteBuffer() and their deletes with invalidate().  State changed by
+anything else -- code holding the functions from before install(),
+another context being made current, C extensions -- has to be followed
+by invalidate(), which forgets everything (or the named groups) so the
+next call of each kind goes to the GL again.  One context is assumed.
+
+issued and elided count the calls per function for the current frame,
+endFrame() (once a frame, e.g. after glutSwapBuffers) adds them to the
+totals and keeps (issued, elided) per frame in frames.
+"""
+import collections
+from OpenGL.GL.VERSION import GL_1_1 as full
+from OpenGL.raw.GL.VERSION import GL_1_2, GL_1_3, GL_1_5, GL_3_1
+
+__all__ = (
+    'StateCache',
+    'STATE',
+    'install',
+    'uninstall',
+    'invalidate',
+    'noteBuffer',
+)
+
+# the StateCache in the OpenGL.GL namespace, None until install()
+STATE = None
+
+# mirror attributes, in the server (compiled into display lists) and
+# client (executed immediately) groups
+SERVER_GROUPS = (
+    'colour','enabled','textures','activeTexture','program',
+    'blendFunc','matrixMode',
+)
+CLIENT_GROUPS = ('buffers','colourArray')
+GROUPS = SERVER_GROUPS + CLIENT_GROUPS
+
+# caps enabled separately for each texture unit
+UNIT_CAPS = frozenset([
+    full.GL_TEXTURE_1D, full.GL_TEXTURE_2D, GL_1_2.GL_TEXTURE_3D,
+    GL_1_3.GL_TEXTURE_CUBE_MAP, GL_3_1.GL_TEXTURE_RECTANGLE,
+    full.GL_TEXTURE_GEN_S, full.GL_TEXTURE_GEN_T,
+    full.GL_TEXTURE_GEN_R, full.GL_TEXTURE_GEN_Q,
+])
+
+# glPushAttrib groups other than GL_ENABLE_BIT which save a cap's enable
+CAP_ATTRIB_BITS = {}
+for _bit, _caps in (
+    (full.GL_COLOR_BUFFER_BIT, (
+        full.GL_ALPHA_TEST, full.GL_BLEND, full.GL_DITHER,
+        full.GL_COLOR_LOGIC_OP, full.GL_INDEX_LOGIC_OP,
+    )),
+    (full.GL_DEPTH_BUFFER_BIT, (full.GL_DEPTH_TEST,)),
+    (full.GL_LIGHTING_BIT, (
+        full.GL_LIGHTING, full.GL_COLOR_MATERIAL,
+        full.GL_LIGHT0, full.GL_LIGHT1, full.GL_LIGHT2, full.GL_LIGHT3,
+        full.GL_LIGHT4, full.GL_LIGHT5, full.GL_LIGHT6, full.GL_LIGHT7,
+    )),
+    (full.GL_POLYGON_BIT, (
+        full.GL_CULL_FACE, full.GL_POLYGON_SMOOTH, full.GL_POLYGON_STIPPLE,
+        full.GL_POLYGON_OFFSET_FILL, full.GL_POLYGON_OFFSET_LINE,
+        full.GL_POLYGON_OFFSET_POINT,
+    )),
+    (full.GL_FOG_BIT, (full.GL_FOG,)),
+    (full.GL_SCISSOR_BIT, (full.GL_SCISSOR_TEST,)),
+    (full.GL_STENCIL_BUFFER_BIT, (full.GL_STENCIL_TEST,)),
+    (full.GL_TRANSFORM_BIT, (
+        full.GL_NORMALIZE, GL_1_2.GL_RESCALE_NORMAL,
+        full.GL_CLIP_PLANE0, full.GL_CLIP_PLANE1, full.GL_CLIP_PLANE2,
+        full.GL_CLIP_PLANE3, full.GL_CLIP_PLANE4, full.GL_CLIP_PLANE5,
+    )),
+    (full.GL_POINT_BIT, (full.GL_POINT_SMOOTH,)),
+    (full.GL_LINE_BIT, (full.GL_LINE_SMOOTH, full.GL_LINE_STIPPLE)),
+    (GL_1_3.GL_MULTISAMPLE_BIT, (
+        GL_1_3.GL_MULTISAMPLE, GL_1_3.GL_SAMPLE_ALPHA_TO_COVERAGE,
+        GL_1_3.GL_SAMPLE_ALPHA_TO_ONE, GL_1_3.GL_SAMPLE_COVERAGE,
+    )),
+    (full.GL_TEXTURE_BIT, tuple( UNIT_CAPS )),
+):
+    for _cap in _caps:
+        CAP_ATTRIB_BITS[int(_cap)] = int(_bit)
+# any of which might save a cap missing from the table
+ENABLE_ATTRIB_BITS = int(full.GL_ENABLE_BIT)
+for _bit in CAP_ATTRIB_BITS.values():
+    ENABLE_ATTRIB_BITS |= _bit
+ENABLE_ATTRIB_BITS |= int(full.GL_EVAL_BIT) | int(full.GL_POINT_BIT)
+del _bit, _caps, _cap
+
+# passed through, forgetting what they change
+FORGETTING = {
+    'glBlendFuncSeparate': ('blendFunc',),
+    'glBlendFunci': ('blendFunc',),
+    'glBlendFuncSeparatei': ('blendFunc',),
+    'glEnablei': ('enabled',),
+    'glDisablei': ('enabled',),
+    'glBindBufferBase': ('buffers',),
+    'glBindBufferRange': ('buffers',),
+    'glBindBuffersBase': ('buffers',),
+    'glBindBuffersRange': ('buffers',),
+    'glDeleteBuffers': ('buffers',),
+    'glBindTextures': ('textures',),
+    'glBindTextureUnit': ('textures',),
+    'glDeleteTextures': ('textures',),
+    'glDeleteProgram': ('program',),
+}
+for _size in '34':
+    for _type in ('b','d','f','i','s','ub','ui','us'):
+        for _suffix in ('','v'):
+            FORGETTING['glColor%s%s%s'%(_size,_type,_suffix)] = ('colour',)
+del _size, _type, _suffix
+# not compiled into display lists, they change the state at once
+EXECUTED = frozenset(['glDeleteTextures','glDeleteProgram'])
+# glColor* tracked (size, vector, ub), the rest of FORGETTING's glColor* forget
+COLOURS = {
+    'glColor3f': (3,False,False), 'glColor3d': (3,False,False),
+    'glColor4f': (4,False,False), 'glColor4d': (4,False,False),
+    'glColor3fv': (3,True,False), 'glColor3dv': (3,True,False),
+    'glColor4fv': (4,True,False), 'glColor4dv': (4,True,False),
+    'glColor3ub': (3,False,True), 'glColor4ub': (4,False,True),
+    'glColor3ubv': (3,True,True), 'glColor4ubv': (4,True,True),
+}
+# draw with the enabled arrays, a colour array leaves the colour undefined
+DRAWS = (
+    'glDrawArrays','glDrawElements','glDrawRangeElements',
+    'glMultiDrawArrays','glMultiDrawElements','glArrayElement',
+    'glDrawArraysInstanced','glDrawElementsInstanced',
+)
+# replaced by the StateCache method of the same name
+METHODS = (
+    'glColor',
+    'glEnable','glDisable',
+    'glEnableClientState','glDisableClientState',
+    'glActiveTexture','glBindTexture','glBindBuffer','glBindVertexArray',
+    'glUseProgram','glBlendFunc','glMatrixMode',
+    'glPushAttrib','glPopAttrib','glPushClientAttrib','glPopClientAttrib',
+    'glNewList','glEndList','glCallList','glCallLists','glDeleteLists',
+)
+
+class StateCache( object ):
+    """Mirror of the GL state set through the OpenGL.GL namespace
+
+    None (or a missing dict entry) means unknown, the next call setting
+    that state always goes to the GL.  The GL function each wrapper calls
+    is kept in originals.
+    """
+    def __init__( self ):
+        self.originals = {}
+        # defaultdict counts faster than Counter
+        self.issued = collections.defaultdict( int )
+        self.elided = collections.defaultdict( int )
+        self.totalIssued = collections.Counter()
+        self.totalElided = collections.Counter()
+        self.frames = collections.deque( maxlen=1000 )
+        self.colour = None
+        self.enabled = {}
+        self.textures = {}
+        self.activeTexture = None
+        self.program = None
+        self.blendFunc = None
+        self.matrixMode = None
+        self.attribStack = []
+        self.buffers = {}
+        # disabled unless enabled by someone we didn't see
+        self.colourArray = False
+        self.clientAttribStack = []
+        # list id: groups calling it changes, None for everything
+        self.lists = {}
+        self.compiling = None
+        self.touched = set()
+        self.unbalanced = False
+
+    def wrappers( self, namespace ):
+        """Build {name: replacement} for the functions found in namespace"""
+        result = {}
+        def original( name ):
+            function = getattr( namespace, name, None )
+            if function is not None:
+                self.originals[name] = function
+            return function
+        for name in METHODS:
+            function = original( name )
+            if function is not None:
+                setattr( self, '_'+name, function )
+                result[name] = getattr( self, name )
+        for name, groups in FORGETTING.items():
+            function = original( name )
+            if function is not None:
+                if name in COLOURS:
+                    result[name] = self.colourFunction( name, function, *COLOURS[name] )
+                else:
+                    result[name] = self.forgetting( name, function, groups )
+        for name in DRAWS:
+            function = original( name )
+            if function is not None:
+                result[name] = self.drawing( function )
+        self.colour4f = result.get( 'glColor4f' )
+        return result
+
+    def colourFunction( self, name, original, size, vector, ub ):
+        """glColor* wrapper eliding the colour already current"""
+        state = self
+        issued, elided = self.issued, self.elided
+        if vector:
+            tag = ('ub',) if ub else ()
+            opaque = (255,) if ub else (1.0,)
+            def colourv( v ):
+                key = tag + tuple( v )
+                if size == 3:
+                    key += opaque
+                if key == state.colour:
+                    elided[name] += 1
+                    return None
+                result = original( v )
+                state.colour = key
+                issued[name] += 1
+                return result
+            colourv.__name__ = name
+            return colourv
+        if size == 3 and ub:
+            def colour3ub( r, g, b ):
+                key = ('ub',r,g,b,255)
+                if key == state.colour:
+                    elided[name] += 1
+                    return None
+                result = original( r, g, b )
+                state.colour = key
+                issued[name] += 1
+                return result
+            colour3ub.__name__ = name
+            return colour3ub
+        if size == 3:
+            def colour3( r, g, b ):
+                key = (r,g,b,1.0)
+                if key == state.colour:
+                    elided[name] += 1
+                    return None
+                result = original( r, g, b )
+                state.colour = key
+                issued[name] += 1
+                return result
+            colour3.__name__ = name
+            return colour3
+        tag = ('ub',) if ub else ()
+        def colour4( r, g, b, a ):
+            key = tag + (r,g,b,a)
+            if key == state.colour:
+                elided[name] += 1
+                return None
+            result = original( r, g, b, a )
+            state.colour = key
+            issued[name] += 1
+            return result
+        colour4.__name__ = name
+        return colour4
+
+    def forgetting( self, name, original, groups ):
+        """Wrapper passing through and then forgetting groups"""
+        state = self
+        issued = self.issued
+        executed = name in EXECUTED
+        def forget( *args, **named ):
+            result = original( *args, **named )
+            if executed:
+                state.forgetExecuted( *groups )
+            else:
+                state.invalidate( *groups )
+            issued[name] += 1
+            return result
+        forget.__name__ = name
+        return forget
+
+    def drawing( self, original ):
+        """Draw wrapper, forgets the colour when a colour array may be on"""
+        state = self
+        def draw( *args, **named ):
+            result = original( *args, **named )
+            if state.colourArray is not False:
+                state.invalidate( 'colour' )
+            return result
+        draw.__name__ = original.__name__
+        return draw
+
+    def glColor( self, *args ):
+        if len(args) == 1:
+            key = tuple( args[0] )
+        else:
+            key = args
+        if len(key) == 3:
+            key += (1.0,)
+        elif len(key) != 4:
+            result = self._glColor( *args )
+            self.invalidate( 'colour' )
+            return result
+        if key == self.colour:
+            self.elided['glColor'] += 1
+            return None
+        result = self._glColor( *args )
+        self.colour = key
+        self.issued['glColor'] += 1
+        return result
+
+    def textureUnit( self ):
+        """The active texture unit, asked of the GL when not known
+
+        None while compiling a display list, the unit is the one active
+        when the list is called.
+        """
+        if self.activeTexture is None and self.compiling is None:
+            from OpenGL.GL import glGetIntegerv
+            self.activeTexture = int( glGetIntegerv( GL_1_3.GL_ACTIVE_TEXTURE ) )
+        return self.activeTexture
+    def unitCapKey( self, cap ):
+        """Key of a texture unit cap in enabled, None while the unit is unknown"""
+        unit = self.textureUnit()
+        if unit is None:
+            self.touched.add( 'enabled' )
+            return None
+        return (unit, cap)
+    def glEnable( self, cap ):
+        key = cap if cap not in UNIT_CAPS else self.unitCapKey( cap )
+        if self.enabled.get( key ) is True:
+            self.elided['glEnable'] += 1
+            return None
+        result = self._glEnable( cap )
+        if key is not None:
+            self.enabled[key] = True
+        self.issued['glEnable'] += 1
+        return result
+    def glDisable( self, cap ):
+        key = cap if cap not in UNIT_CAPS else self.unitCapKey( cap )
+        if self.enabled.get( key ) is False:
+            self.elided['glDisable'] += 1
+            return None
+        result = self._glDisable( cap )
+        if key is not None:
+            self.enabled[key] = False
+        self.issued['glDisable'] += 1
+        return result
+
+    def glEnableClientState( self, array ):
+        result = self._glEnableClientState( array )
+        if array == full.GL_COLOR_ARRAY:
+            self.colourArray = True
+        return result
+    def glDisableClientState( self, array ):
+        result = self._glDisableClientState( array )
+        if array == full.GL_COLOR_ARRAY:
+            self.colourArray = False
+        return result
+
+    def glActiveTexture( self, texture ):
+        if texture == self.activeTexture:
+            self.elided['glActiveTexture'] += 1
+            return None
+        result = self._glActiveTexture( texture )
+        self.activeTexture = texture
+        self.issued['glActiveTexture'] += 1
+        return result
+    def glBindTexture( self, target, texture ):
+        unit = self.activeTexture
+        if unit is None:
+            unit = self.textureUnit()
+        if unit is None:
+            result = self._glBindTexture( target, texture )
+            self.touched.add( 'textures' )
+        else:
+            key = (unit, target)
+            if self.textures.get( key ) == texture is not None:
+                self.elided['glBindTexture'] += 1
+                return None
+            result = self._glBindTexture( target, texture )
+            self.textures[key] = texture
+        self.issued['glBindTexture'] += 1
+        return result
+    def glBindBuffer( self, target, buffer ):
+        if self.buffers.get( target ) == buffer is not None:
+            self.elided['glBindBuffer'] += 1
+            return None
+        result = self._glBindBuffer( target, buffer )
+        self.buffers[target] = buffer
+        self.issued['glBindBuffer'] += 1
+        return result
+    def glBindVertexArray( self, array ):
+        result = self._glBindVertexArray( array )
+        # the element array binding belongs to the vertex array object
+        self.buffers.pop( GL_1_5.GL_ELEMENT_ARRAY_BUFFER, None )
+        self.issued['glBindVertexArray'] += 1
+        return result
+    def glUseProgram( self, program ):
+        if self.program is not None and program == self.program:
+            self.elided['glUseProgram'] += 1
+            return None
+        result = self._glUseProgram( program )
+        self.program = program
+        self.issued['glUseProgram'] += 1
+        return result
+    def glBlendFunc( self, sfactor, dfactor ):
+        key = (sfactor, dfactor)
+        if key == self.blendFunc:
+            self.elided['glBlendFunc'] += 1
+            return None
+        result = self._glBlendFunc( sfactor, dfactor )
+        self.blendFunc = key
+        self.issued['glBlendFunc'] += 1
+        return result
+    def glMatrixMode( self, mode ):
+        if mode == self.matrixMode:
+            self.elided['glMatrixMode'] += 1
+            return None
+        result = self._glMatrixMode( mode )
+        self.matrixMode = mode
+        self.issued['glMatrixMode'] += 1
+        return result
+
+    def glPushAttrib( self, mask ):
+        result = self._glPushAttrib( mask )
+        self.attribStack.append( (
+            int(mask), self.colour, dict(self.enabled), self.blendFunc,
+            self.matrixMode, dict(self.textures), self.activeTexture,
+        ) )
+        self.issued['glPushAttrib'] += 1
+        return result
+    def glPopAttrib( self ):
+        result = self._glPopAttrib()
+        self.issued['glPopAttrib'] += 1
+        if not self.attribStack:
+            # pushed by someone we didn't see
+            if self.compiling is not None:
+                self.unbalanced = True
+            else:
+                self.invalidate()
+            return result
+        mask, colour, enabled, blendFunc, matrixMode, textures, activeTexture = self.attribStack.pop()
+        if mask & full.GL_CURRENT_BIT:
+            self.colour = colour
+        if mask & full.GL_COLOR_BUFFER_BIT:
+            self.blendFunc = blendFunc
+        if mask & full.GL_TRANSFORM_BIT:
+            self.matrixMode = matrixMode
+        if mask & full.GL_TEXTURE_BIT:
+            self.textures = textures
+            self.activeTexture = activeTexture
+        if mask & full.GL_ENABLE_BIT:
+            self.enabled = enabled
+        elif mask & ENABLE_ATTRIB_BITS:
+            self.restoreEnables( mask, enabled )
+        return result
+    def restoreEnables( self, mask, saved ):
+        """Restore the enables of saved which glPopAttrib(mask) restores"""
+        current = self.enabled
+        for key in set( current ) | set( saved ):
+            before = saved.get( key )
+            if before == current.get( key ):
+                continue
+            cap = key[1] if isinstance( key, tuple ) else key
+            bit = CAP_ATTRIB_BITS.get( int(cap) )
+            if bit is not None and not mask & bit:
+                continue
+            if bit is not None and before is not None:
+                current[key] = before
+            else:
+                # restored to a value we never knew, or maybe restored
+                current.pop( key, None )
+
+    def glPushClientAttrib( self, mask ):
+        result = self._glPushClientAttrib( mask )
+        self.clientAttribStack.append( (
+            int(mask),
+            self.buffers.get( GL_1_5.GL_ARRAY_BUFFER ),
+            self.buffers.get( GL_1_5.GL_ELEMENT_ARRAY_BUFFER ),
+            self.colourArray,
+        ) )
+        self.issued['glPushClientAttrib'] += 1
+        return result
+    def glPopClientAttrib( self ):
+        result = self._glPopClientAttrib()
+        self.issued['glPopClientAttrib'] += 1
+        if not self.clientAttribStack:
+            self.invalidate( *CLIENT_GROUPS )
+            return result
+        mask, array, elements, colourArray = self.clientAttribStack.pop()
+        if mask & full.GL_CLIENT_VERTEX_ARRAY_BIT:
+            for target, buffer in (
+                (GL_1_5.GL_ARRAY_BUFFER, array),
+                (GL_1_5.GL_ELEMENT_ARRAY_BUFFER, elements),
+            ):
+                if buffer is None:
+                    self.buffers.pop( target, None )
+                else:
+                    self.buffers[target] = buffer
+            self.colourArray = colourArray
+        return result
+
+    def glNewList( self, list, mode ):
+        result = self._glNewList( list, mode )
+        # compiled calls change nothing now, and when the list runs they
+        # apply to whatever state is current then, so compile against a
+        # mirror which knows nothing (client state is not compiled)
+        saved = dict([ (group, getattr( self, group )) for group in SERVER_GROUPS ])
+        self.compiling = (int(list), mode, saved, self.attribStack)
+        self.colour = self.activeTexture = self.program = None
+        self.blendFunc = self.matrixMode = None
+        self.enabled = {}
+        self.textures = {}
+        self.attribStack = []
+        self.touched = set()
+        self.unbalanced = False
+        return result
+    def glEndList( self ):
+        result = self._glEndList()
+        if self.compiling is None:
+            return result
+        list, mode, saved, attribStack = self.compiling
+        groups = set( self.touched )
+        for group in SERVER_GROUPS:
+            if getattr( self, group ) not in (None, {}):
+                groups.add( group )
+        groups = None if (self.unbalanced or self.attribStack) else tuple( groups )
+        self.lists[list] = groups
+        for group, value in saved.items():
+            setattr( self, group, value )
+        self.attribStack = attribStack
+        self.compiling = None
+        if mode == full.GL_COMPILE_AND_EXECUTE:
+            self.forgetList( groups )
+        return result
+    def forgetList( self, groups ):
+        if groups is None:
+            self.invalidate()
+        elif groups:
+            self.invalidate( *groups )
+    def glCallList( self, list ):
+        result = self._glCallList( list )
+        self.forgetList( self.lists.get( int(list) ) )
+        return result
+    def glCallLists( self, *args, **named ):
+        result = self._glCallLists( *args, **named )
+        self.invalidate()
+        return result
+    def glDeleteLists( self, list, range ):
+        result = self._glDeleteLists( list, range )
+        first, last = int(list), int(list) + int(range)
+        for id in [ id for id in self.lists if first <= id < last ]:
+            del self.lists[id]
+        return result
+
+    def invalidate( self, *groups ):
+        """Forget the named groups (default all), their next calls go to the GL"""
+        if not groups:
+            groups = GROUPS
+            del self.attribStack[:]
+            del self.clientAttribStack[:]
+        for group in groups:
+            value = getattr( self, group )
+            if isinstance( value, dict ):
+                value.clear()
+            else:
+                setattr( self, group, None )
+            self.touched.add( group )
+
+    def forgetExecuted( self, *groups ):
+        """Forget groups changed by a call which is executed while compiling too"""
+        self.invalidate( *groups )
+        if self.compiling is not None:
+            saved = self.compiling[2]
+            for group in groups:
+                saved[group] = {} if isinstance( saved[group], dict ) else None
+
+    def endFrame( self ):
+        """Finish the frame's counts, returns its (issued, elided) Counters"""
+        issued = collections.Counter( self.issued )
+        elided = collections.Counter( self.elided )
+        self.totalIssued.update( issued )
+        self.totalElided.update( elided )
+        self.frames.append( (sum( issued.values() ), sum( elided.values() )) )
+        self.issued.clear()
+        self.elided.clear()
+        return issued, elided
+    def totals( self ):
+        """(issued, elided) Counters since install, the current frame included"""
+        return (
+            self.totalIssued + collections.Counter( self.issued ),
+            self.totalElided + collections.Counter( self.elided ),
+        )
+    def report( self ):
+        """Table of issued and elided calls per function"""
+        issued, elided = self.totals()
+        names = sorted( set( issued ) | set( elided ), key=lambda name: -elided[name] )
+        lines = ['%-22s %9s %9s %7s'%('function','issued','elided','elided')]
+        for name in names:
+            total = issued[name] + elided[name]
+            lines.append( '%-22s %9d %9d %6.1f%%'%(
+                name, issued[name], elided[name], 100.0 * elided[name] / total,
+            ))
+        if self.frames:
+            lines.append( '%d frames, %.1f calls issued and %.1f elided per frame'%(
+                len(self.frames),
+                sum([ frame[0] for frame in self.frames ]) / float(len(self.frames)),
+                sum([ frame[1] for frame in self.frames ]) / float(len(self.frames)),
+            ))
+        return '\n'.join( lines )
+
+def install( state=None ):
+    """Replace the tracked functions in OpenGL.GL with state's (default a new StateCache)
+
+    Returns the installed StateCache, installing twice returns the first.
+    """
+    global STATE
+    if STATE is not None:
+        return STATE
+    from OpenGL import GL
+    if state is None:
+        state = StateCache()
+    # loads the lazily imported version modules, so they can't later
+    # overwrite the wrappers
+    for name, function in state.wrappers( GL ).items():
+        setattr( GL, name, function )
+    STATE = state
+    return state
+
+def uninstall( ):
+    """Put the original functions back into OpenGL.GL"""
+    global STATE
+    if STATE is None:
+        return None
+    from OpenGL import GL
+    for name, function in STATE.originals.items():
+        setattr( GL, name, function )
+    state, STATE = STATE, None
+    return state
+
+def invalidate( *groups ):
+    """Forget the named groups (default all) of the installed StateCache"""
+    if STATE is not None:
+        STATE.invalidate( *groups )
+
+def noteBuffer( target, buffer ):
+    """Record a glBindBuffer made without the installed StateCache"""
+    if STATE is not None:
+        STATE.buffers[target] = buffer
@@ -8,6 +8,7 @@ from OpenGL.GLU.quadrics import *
 from OpenGL.GLU.projection import *
 from OpenGL.GLU.tess import *
 from OpenGL.GLU.glunurbs import *
+from OpenGL.GLU.evaluator import *
 import ctypes
 
 gluErrorString.restype = ctypes.c_char_p
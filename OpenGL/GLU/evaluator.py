@@ -0,0 +1,386 @@
+"""NumPy evaluation of NURBS and Bezier curves and surfaces into arrays
+
+gluNurbsSurface and the glMap/glEvalMesh evaluators tessellate in the
+library and hand the result to immediate mode, or to one Python callback
+per vertex in GLU_NURBS_TESSELLATOR mode, so the geometry can neither be
+kept nor drawn again without evaluating it again.  The functions here
+evaluate the Cox-de Boor basis functions (and their derivatives) for a
+whole grid of parameters at once, so evaluating a surface comes down to
+a few matrix products, and return NumPy arrays:
+
+    nurbsCurvePoints/bezierCurvePoints -- (samples, dimension) points
+    nurbsSurfaceMesh/bezierSurfaceMesh -- a NurbsMesh, interleaved
+        texture coordinate, normal and position rows (the
+        GL_T2F_N3F_V3F layout) plus triangle indices, see NurbsMesh.vbos
+
+Control points use the layouts gluNurbsCurve/gluNurbsSurface and
+glMap1/glMap2 take, (n, dimension) and (n, m, dimension), with
+4-dimensional points being homogeneous (x*w, y*w, z*w, w) as for the
+GL_MAP*_VERTEX_4 types.  Any leading dimensions evaluate a batch of
+curves or surfaces sharing their knots in one call.
+
+Basis matrices are kept per knot vector, order and sample count, and a
+NurbsCache keeps whole results keyed by a hash of the control net, knots
+and sample count, for geometry that is evaluated again and again.
+"""
+import hashlib, operator
+from OpenGL import _configflags, error
+from OpenGL.GLU.glunurbs import checkOrder, checkKnots
+from OpenGL.raw.GL.VERSION import GL_1_1
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = (
+    'NurbsCache',
+    'NurbsMesh',
+    'basisFunctions',
+    'bezierCurvePoints',
+    'bezierKnots',
+    'bezierSurfaceMesh',
+    'nurbsCurvePoints',
+    'nurbsSurfaceMesh',
+)
+
+def basisFunctions( knots, order, parameters ):
+    """B-spline basis functions and their derivatives at each parameter
+
+    knots -- non-decreasing knot vector
+    order -- the order (degree+1) of the spline
+    parameters -- values to evaluate at, clamped to the spline's domain
+        knots[order-1] .. knots[len(knots)-order]
+
+    Returns (basis, derivatives), (len(parameters), len(knots)-order)
+    arrays, so a curve's points are numpy.dot( basis, control ).  Uses
+    the Cox-de Boor recursion on every parameter together, and puts the
+    end of the domain in the last non-empty knot span.
+    """
+    knots = numpy.asarray( knots, dtype='d' )
+    count = len(knots) - order
+    low, high = knots[order-1], knots[count]
+    u = numpy.clip( numpy.asarray( parameters, dtype='d' ), low, high )[:,None]
+    spans = numpy.searchsorted( knots, u[:,0], side='right' ) - 1
+    last = numpy.searchsorted( knots, high, side='left' ) - 1
+    spans = numpy.where( u[:,0] >= high, last, numpy.clip( spans, order-1, last ) )
+    basis = numpy.zeros( (len(u), len(knots)-1), dtype='d' )
+    basis[numpy.arange(len(u)),spans] = 1.0
+    derivatives = numpy.zeros( (len(u), count), dtype='d' )
+    with numpy.errstate( divide='ignore' ):
+        for degree in range( 1, order ):
+            left = knots[degree:-1] - knots[:-degree-1]
+            right = knots[degree+1:] - knots[1:-degree]
+            left = numpy.where( left > 0, 1.0/left, 0.0 )
+            right = numpy.where( right > 0, 1.0/right, 0.0 )
+            lower = basis
+            basis = (
+                (u - knots[:-degree-1]) * left * lower[:,:-1] +
+                (knots[degree+1:] - u) * right * lower[:,1:]
+            )
+    if order > 1:
+        degree = order - 1
+        derivatives = degree * ( left * lower[:,:-1] - right * lower[:,1:] )
+    return basis, derivatives
+
+_BASES = {}
+MAX_BASES = 64
+def _basis( knots, order, samples ):
+    """Cached (parameters, basis, derivatives) for samples over the domain"""
+    key = (knots.tobytes(), order, samples)
+    result = _BASES.get( key )
+    if result is None:
+        parameters = numpy.linspace( knots[order-1], knots[len(knots)-order], samples )
+        result = (parameters,) + basisFunctions( knots, order, parameters )
+        for value in result:
+            value.flags.writeable = False
+        if len(_BASES) >= MAX_BASES:
+            del _BASES[next(iter(_BASES))]
+        _BASES[key] = result
+    return result
+
+def _knots( knots, count, orderName, knotsName ):
+    """knots as float64 array and the order they give count control points"""
+    knots = numpy.ascontiguousarray( knots, dtype='d' ).ravel()
+    order = len(knots) - count
+    if _configflags.ERROR_CHECKING:
+        checkOrder( order, len(knots), orderName )
+        checkKnots( knots, knotsName )
+    return knots, order
+
+def _control( control, dimensions, name ):
+    control = numpy.asarray( control, dtype='d' )
+    if control.ndim < dimensions or control.shape[-1] not in (1,2,3,4):
+        raise error.GLUError(
+            """Need a %s-dimensional array of 1 to 4 element points for %s, got shape %s"""%(
+                dimensions, name, control.shape,
+            )
+        )
+    return control
+
+def _samples( samples ):
+    """(U, V) sample counts from one count (any integer type) or a pair"""
+    try:
+        samples = operator.index( samples )
+    except TypeError:
+        return tuple( [int(s) for s in samples] )
+    return samples, samples
+
+def bezierKnots( order, u1=0.0, u2=1.0 ):
+    """Knot vector making a B-spline of order the Bezier curve over u1..u2"""
+    return numpy.array( [u1]*order + [u2]*order, dtype='d' )
+
+def nurbsCurvePoints( knots, control, samples=64, rational=None ):
+    """Evaluate a NURBS curve at samples evenly spaced parameters
+
+    knots -- knot vector, len(knots) - len(control) is the order
+    control -- (..., n, dimension) control points
+    samples -- number of points, the first and last at the ends of the
+        domain
+    rational -- whether the points are homogeneous, default for
+        4-dimensional ones
+
+    Returns float32 (..., samples, dimension) points, the homogeneous
+    coordinate divided out for rational curves, ready for a GL_LINE_STRIP.
+    """
+    control = _control( control, 2, 'NURBS curve' )
+    knots, order = _knots(
+        knots, control.shape[-2], 'order of NURBS curve', 'knots of NURBS curve',
+    )
+    parameters, basis, derivatives = _basis( knots, order, operator.index( samples ) )
+    points = numpy.matmul( basis, control )
+    if rational or (rational is None and control.shape[-1] == 4):
+        points = points[...,:-1] / points[...,-1:]
+    return points.astype( numpy.float32 )
+
+def bezierCurvePoints( points, u1=0.0, u2=1.0, samples=64, rational=None ):
+    """Evaluate the Bezier curve glMap1(target, u1, u2, points) defines
+
+    The same points glMapGrid1(samples-1, u1, u2) and glEvalMesh1 give,
+    see nurbsCurvePoints.
+    """
+    points = _control( points, 2, 'Bezier curve' )
+    return nurbsCurvePoints(
+        bezierKnots( points.shape[-2], u1, u2 ), points, samples, rational,
+    )
+
+_GRIDS = {}
+def _gridIndices( uSamples, vSamples ):
+    """uint32 (K,3) counter-clockwise triangles over a uSamples x vSamples grid"""
+    key = (uSamples, vSamples)
+    result = _GRIDS.get( key )
+    if result is None:
+        corners = (
+            numpy.arange( uSamples-1, dtype=numpy.uint32 )[:,None] * vSamples +
+            numpy.arange( vSamples-1, dtype=numpy.uint32 )[None,:]
+        ).ravel()
+        result = numpy.empty( (len(corners), 2, 3), dtype=numpy.uint32 )
+        result[:,0] = numpy.stack( (corners, corners+vSamples, corners+1), axis=-1 )
+        result[:,1] = numpy.stack( (corners+1, corners+vSamples, corners+vSamples+1), axis=-1 )
+        result = result.reshape( (-1, 3) )
+        result.flags.writeable = False
+        _GRIDS[key] = result
+    return result
+
+class NurbsMesh( object ):
+    """Evaluated surface (or batch of surfaces) as vertex and index arrays
+
+    vertices -- float32 (..., U*V, 8) rows of s, t, normal, position, the
+        GL_T2F_N3F_V3F layout glInterleavedArrays takes (FORMAT); s and t
+        run from 0 to 1 over the surface's domain
+    indices -- uint32 (K, 3) counter-clockwise triangles into one
+        surface's U*V vertices (shared by every surface of a batch)
+    shape -- (U, V), the samples along the surface's u and v
+    """
+    FORMAT = GL_1_1.GL_T2F_N3F_V3F
+    def __init__( self, vertices, indices, shape ):
+        self.vertices = vertices
+        self.indices = indices
+        self.shape = shape
+    @property
+    def texCoords( self ):
+        return self.vertices[...,0:2]
+    @property
+    def normals( self ):
+        return self.vertices[...,2:5]
+    @property
+    def positions( self ):
+        return self.vertices[...,5:8]
+    def mergedIndices( self ):
+        """uint32 (K*surfaces, 3) triangles for all vertices drawn as one array"""
+        surfaces = self.vertices.reshape( (-1,) + self.vertices.shape[-2:] ).shape[0]
+        if surfaces == 1:
+            return self.indices
+        offsets = numpy.arange( surfaces, dtype=numpy.uint32 ) * self.vertices.shape[-2]
+        return ( self.indices[None] + offsets[:,None,None] ).reshape( (-1, 3) )
+    def vbos( self, usage='GL_STATIC_DRAW' ):
+        """(vertex VBO, index VBO) holding all of the mesh's surfaces
+
+        To draw, with both bound:
+            glInterleavedArrays( mesh.FORMAT, 0, None )
+            glDrawElements( GL_TRIANGLES, indexCount, GL_UNSIGNED_INT, None )
+        where indexCount is mesh.mergedIndices().size
+        """
+        from OpenGL.arrays import vbo
+        return (
+            vbo.VBO( self.vertices.reshape( (-1, 8) ), usage=usage ),
+            vbo.VBO( self.mergedIndices(), usage=usage, target='GL_ELEMENT_ARRAY_BUFFER' ),
+        )
+
+def nurbsSurfaceMesh( sKnots, tKnots, control, samples=64, rational=None, cache=None ):
+    """Evaluate a NURBS surface on a grid of samples into a NurbsMesh
+
+    sKnots, tKnots -- knot vectors for the control net's first and second
+        axes, the orders follow from the knot and control point counts
+    control -- (..., n, m, 3 or 4) control points, as for gluNurbsSurface
+    samples -- samples along both axes, or a (U, V) pair
+    rational -- whether the points are homogeneous, default for
+        4-dimensional ones
+    cache -- a NurbsCache to look the mesh up in and store it to
+
+    Normals are the normalised cross product of the derivatives along s
+    and t (zero where those are parallel, as at poles).
+    """
+    if cache is not None:
+        return cache.surface( sKnots, tKnots, control, samples, rational )
+    control = _control( control, 3, 'NURBS surface' )
+    if control.shape[-1] < 3:
+        raise error.GLUError(
+            """Need 3 or 4 element control points for a NURBS surface, got %s"""%(
+                control.shape[-1],
+            )
+        )
+    n, m, dimension = control.shape[-3:]
+    sKnots, sOrder = _knots( sKnots, n, 'sOrder of NURBS surface', 'sKnots of NURBS surface' )
+    tKnots, tOrder = _knots( tKnots, m, 'tOrder of NURBS surface', 'tKnots of NURBS surface' )
+    uSamples, vSamples = _samples( samples )
+    sParameters, sBasis, sDerivatives = _basis( sKnots, sOrder, uSamples )
+    tParameters, tBasis, tDerivatives = _basis( tKnots, tOrder, vSamples )
+
+    rational = rational or (rational is None and dimension == 4)
+    bases = (sBasis, sDerivatives, tBasis, tDerivatives)
+
+    vertices = numpy.empty( control.shape[:-3] + (uSamples, vSamples, 8), dtype=numpy.float32 )
+    vertices[...,0] = numpy.linspace( 0.0, 1.0, uSamples )[:,None]
+    vertices[...,1] = numpy.linspace( 0.0, 1.0, vSamples )
+    # a few surfaces at a time, so the float64 temporaries stay cache-sized
+    controls = control.reshape( (-1, n, m, dimension) )
+    outputs = vertices.reshape( (-1, uSamples, vSamples, 8) )
+    step = max( 1, CHUNK_VERTICES // (uSamples*vSamples) )
+    for start in range( 0, len(controls), step ):
+        _surfaceVertices( controls[start:start+step], bases, rational, outputs[start:start+step] )
+    return NurbsMesh(
+        vertices.reshape( vertices.shape[:-3] + (uSamples*vSamples, 8) ),
+        _gridIndices( uSamples, vSamples ),
+        (uSamples, vSamples),
+    )
+
+CHUNK_VERTICES = 16384
+def _surfaceVertices( control, bases, rational, vertices ):
+    """Write normals and positions for (k, n, m, d) control into (k, U, V, 8) vertices"""
+    sBasis, sDerivatives, tBasis, tDerivatives = bases
+    k, n, m, dimension = control.shape
+    # along s: (k, U, m, dimension), then along t: (k, U, V, dimension)
+    flat = control.reshape( (k, n, m*dimension) )
+    along = numpy.matmul( sBasis, flat ).reshape( (k, len(sBasis), m, dimension) )
+    alongDs = numpy.matmul( sDerivatives, flat ).reshape( along.shape )
+    points = numpy.matmul( tBasis, along )
+    ds = numpy.matmul( tBasis, alongDs )
+    dt = numpy.matmul( tDerivatives, along )
+    if rational:
+        weights = points[...,3:]
+        points = points[...,:3] / weights
+        ds = ( ds[...,:3] - ds[...,3:] * points ) / weights
+        dt = ( dt[...,:3] - dt[...,3:] * points ) / weights
+    vertices[...,5:8] = points[...,:3]
+    normals = vertices[...,2:5]
+    normals[...,0] = ds[...,1] * dt[...,2] - ds[...,2] * dt[...,1]
+    normals[...,1] = ds[...,2] * dt[...,0] - ds[...,0] * dt[...,2]
+    normals[...,2] = ds[...,0] * dt[...,1] - ds[...,1] * dt[...,0]
+    lengths = numpy.sqrt( numpy.einsum( '...i,...i->...', normals, normals ) )[...,None]
+    numpy.divide( normals, lengths, out=normals, where=lengths > 0 )
+
+def bezierSurfaceMesh(
+    points, u1=0.0, u2=1.0, v1=0.0, v2=1.0, samples=64, rational=None, cache=None,
+):
+    """Evaluate the Bezier surface glMap2(target, u1, u2, v1, v2, points) defines
+
+    The points glMapGrid2(U-1, u1, u2, V-1, v1, v2) and glEvalMesh2 give,
+    with the normals GL_AUTO_NORMAL does, see nurbsSurfaceMesh.
+    """
+    points = _control( points, 3, 'Bezier surface' )
+    return nurbsSurfaceMesh(
+        bezierKnots( points.shape[-3], u1, u2 ),
+        bezierKnots( points.shape[-2], v1, v2 ),
+        points, samples, rational, cache,
+    )
+
+class NurbsCache( object ):
+    """Evaluated curves and surfaces keyed by control net, knots and samples
+
+    Keeps the least recently used results up to max_bytes of arrays.
+    Results are shared between lookups and so are read-only.
+    """
+    def __init__( self, max_bytes=64*1024*1024 ):
+        self.max_bytes = max_bytes
+        self.entries = {}
+        self.bytes = 0
+        self.hits = self.misses = 0
+    def key( self, *values ):
+        """Hash of arrays (by dtype, shape and contents) and other values"""
+        digest = hashlib.sha1()
+        for value in values:
+            if isinstance( value, numpy.ndarray ):
+                value = numpy.ascontiguousarray( value )
+                digest.update( repr( (value.dtype.str, value.shape) ).encode( 'ascii' ) )
+                digest.update( value.data )
+            else:
+                digest.update( repr( value ).encode( 'ascii' ) )
+        return digest.digest()
+    def lookup( self, key, evaluate ):
+        """Cached result for key, else evaluate() stored for next time"""
+        result = self.entries.pop( key, None )
+        if result is not None:
+            self.hits += 1
+            self.entries[key] = result
+            return result
+        self.misses += 1
+        result = evaluate()
+        arrays = [result] if isinstance( result, numpy.ndarray ) else [result.vertices]
+        for array in arrays:
+            array.flags.writeable = False
+        self.entries[key] = result
+        self.bytes += sum( [array.nbytes for array in arrays] )
+        self.evict()
+        return result
+    def evict( self, max_bytes=None ):
+        """Drop least recently used results until at most max_bytes remain"""
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        while self.entries and self.bytes > max_bytes:
+            result = self.entries.pop( next(iter(self.entries)) )
+            if isinstance( result, numpy.ndarray ):
+                self.bytes -= result.nbytes
+            else:
+                self.bytes -= result.vertices.nbytes
+        return self.bytes
+    def clear( self ):
+        """Drop all of the stored results"""
+        self.evict( 0 )
+    def curve( self, knots, control, samples=64, rational=None ):
+        """Cached nurbsCurvePoints"""
+        knots = numpy.asarray( knots, dtype='d' )
+        control = numpy.asarray( control, dtype='d' )
+        return self.lookup(
+            self.key( 'curve', knots, control, operator.index( samples ), rational ),
+            lambda: nurbsCurvePoints( knots, control, samples, rational ),
+        )
+    def surface( self, sKnots, tKnots, control, samples=64, rational=None ):
+        """Cached nurbsSurfaceMesh"""
+        sKnots = numpy.asarray( sKnots, dtype='d' )
+        tKnots = numpy.asarray( tKnots, dtype='d' )
+        control = numpy.asarray( control, dtype='d' )
+        return self.lookup(
+            self.key( 'surface', sKnots, tKnots, control, _samples( samples ), rational ),
+            lambda: nurbsSurfaceMesh( sKnots, tKnots, control, samples, rational ),
+        )
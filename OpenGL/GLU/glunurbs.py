@@ -198,6 +198,7 @@ def checkKnots( knots, name ):
                 raise error.GLUError(
                     """%s has decreasing knot %s after %s"""%( name, next, knot )
                 )
+            knot = next
 
 @_lazy( _simple.gluNurbsCallbackDataEXT )
 def gluNurbsCallbackDataEXT( baseFunction,nurb, userData ):
@@ -82,6 +82,5 @@ class GLUStruct( object ):
     def ptrAsArray( self, ptr, length, type ):
         """Copy length values from ptr into new array of given type"""
         result = type.zeros( (length,) )
-        for i in range(length):
-            result[i] = ptr[i]
+        ctypes.memmove( type.dataPointer( result ), ptr, type.arrayByteCount( result ) )
         return result
@@ -1,9 +1,39 @@
-"""glu[Un]Project[4] convenience wrappers"""
+"""glu[Un]Project[4] convenience wrappers
+
+Matrices and viewport not passed in come from OpenGL.GL.matrixstack when
+it is installed, otherwise they are read from the GL with glGet*.
+gluProjectMany/gluUnProjectMany transform whole arrays of points at once.
+"""
 from OpenGL.raw import GLU as _simple
 from OpenGL import GL
 from OpenGL.lazywrapper import lazy as _lazy
 import ctypes 
 POINTER = ctypes.POINTER
+try:
+    import numpy
+    from OpenGL.GL import matrixstack as _matrixstack
+except ImportError:
+    numpy = _matrixstack = None
+
+def _matrices( model=None, proj=None, view=None ):
+    """Fill in the model, projection and viewing matrices not provided"""
+    stacks = _matrixstack.STACKS if _matrixstack is not None else None
+    if model is None:
+        if stacks is not None:
+            model = stacks.matrix( GL.GL_MODELVIEW )
+        else:
+            model = GL.glGetDoublev( GL.GL_MODELVIEW_MATRIX )
+    if proj is None:
+        if stacks is not None:
+            proj = stacks.matrix( GL.GL_PROJECTION )
+        else:
+            proj = GL.glGetDoublev( GL.GL_PROJECTION_MATRIX )
+    if view is None:
+        if stacks is not None:
+            view = stacks.getViewport()
+        else:
+            view = GL.glGetIntegerv( GL.GL_VIEWPORT )
+    return model, proj, view
 
 @_lazy( _simple.gluProject )
 def gluProject( baseFunction, objX, objY, objZ, model=None, proj=None, view=None ):
@@ -14,12 +44,7 @@ def gluProject( baseFunction, objX, objY, objZ, model=None, proj=None, view=None
     
     returns (winX,winY,winZ) doubles
     """
-    if model is None:
-        model = GL.glGetDoublev( GL.GL_MODELVIEW_MATRIX )
-    if proj is None:
-        proj = GL.glGetDoublev( GL.GL_PROJECTION_MATRIX )
-    if view is None:
-        view = GL.glGetIntegerv( GL.GL_VIEWPORT )
+    model, proj, view = _matrices( model, proj, view )
     winX = _simple.GLdouble( 0.0 )
     winY = _simple.GLdouble( 0.0 )
     winZ = _simple.GLdouble( 0.0 )
@@ -43,12 +68,7 @@ def gluUnProject( baseFunction, winX, winY, winZ, model=None, proj=None, view=No
     
     returns (objX,objY,objZ) doubles
     """
-    if model is None:
-        model = GL.glGetDoublev( GL.GL_MODELVIEW_MATRIX )
-    if proj is None:
-        proj = GL.glGetDoublev( GL.GL_PROJECTION_MATRIX )
-    if view is None:
-        view = GL.glGetIntegerv( GL.GL_VIEWPORT )
+    model, proj, view = _matrices( model, proj, view )
     objX = _simple.GLdouble( 0.0 )
     objY = _simple.GLdouble( 0.0 )
     objZ = _simple.GLdouble( 0.0 )
@@ -74,12 +94,7 @@ def gluUnProject4(
     
     returns (objX,objY,objZ) doubles
     """
-    if model is None:
-        model = GL.glGetDoublev( GL.GL_MODELVIEW_MATRIX )
-    if proj is None:
-        proj = GL.glGetDoublev( GL.GL_PROJECTION_MATRIX )
-    if view is None:
-        view = GL.glGetIntegerv( GL.GL_VIEWPORT )
+    model, proj, view = _matrices( model, proj, view )
     objX = _simple.GLdouble( 0.0 )
     objY = _simple.GLdouble( 0.0 )
     objZ = _simple.GLdouble( 0.0 )
@@ -93,8 +108,79 @@ def gluUnProject4(
         raise ValueError( """Projection failed!""" )
     return objX.value, objY.value, objZ.value, objW.value
 
+def _transform( model, proj ):
+    """model * proj as one (4,4) array, points (as rows) map by dot( p, transform )"""
+    return numpy.dot(
+        numpy.asarray( model, dtype='d' ).reshape( (4,4) ),
+        numpy.asarray( proj, dtype='d' ).reshape( (4,4) ),
+    )
+
+def _points( points, name ):
+    if numpy is None:
+        raise ImportError( """gluProjectMany and gluUnProjectMany need numpy""" )
+    points = numpy.asarray( points, dtype='d' )
+    if points.shape[-1:] != (3,):
+        raise ValueError( """Need an (N,3) array of %s, got shape %s"""%( name, points.shape ))
+    return points.reshape( (-1,3) ), points.shape
+
+def _homogeneous( points, transform ):
+    """(N,3) points transformed and divided by w, nan where w is 0"""
+    result = numpy.dot( points, transform[:3] )
+    result += transform[3]
+    w = result[:,3:]
+    with numpy.errstate( divide='ignore', invalid='ignore' ):
+        result = result[:,:3] / w
+    result[ w[:,0] == 0 ] = numpy.nan
+    return result
+
+def gluProjectMany( points, model=None, proj=None, view=None ):
+    """Project object coordinates to window coordinates, many at a time
+
+    points -- (N,3) (or (...,3)) array of object coordinates
+    model, proj, view -- as for gluProject, filled in the same way
+
+    Returns a float64 array of window coordinates the shape of points,
+    the same values gluProject gives for each point, other than rows of
+    nan for points gluProject fails on (clip w of 0).
+    """
+    points, shape = _points( points, 'object coordinates' )
+    model, proj, view = _matrices( model, proj, view )
+    view = numpy.asarray( view, dtype='d' ).reshape( (4,) )
+    result = _homogeneous( points, _transform( model, proj ) )
+    result += 1.0
+    result *= 0.5
+    result[:,:2] *= view[2:]
+    result[:,:2] += view[:2]
+    return result.reshape( shape )
+
+def gluUnProjectMany( points, model=None, proj=None, view=None ):
+    """Map window coordinates back to object coordinates, many at a time
+
+    points -- (N,3) (or (...,3)) array of window coordinates (x, y and
+        depth 0..1)
+    model, proj, view -- as for gluUnProject, filled in the same way
+
+    Returns a float64 array of object coordinates the shape of points,
+    rows of nan where gluUnProject fails for the point.  Raises
+    ValueError (as gluUnProject does) if model * proj can't be inverted.
+    """
+    points, shape = _points( points, 'window coordinates' )
+    model, proj, view = _matrices( model, proj, view )
+    view = numpy.asarray( view, dtype='d' ).reshape( (4,) )
+    try:
+        inverse = numpy.linalg.inv( _transform( model, proj ) )
+    except numpy.linalg.LinAlgError:
+        raise ValueError( """Projection failed!""" )
+    normalised = points - (view[0], view[1], 0.0)
+    normalised /= (view[2], view[3], 1.0)
+    normalised *= 2.0
+    normalised -= 1.0
+    return _homogeneous( normalised, inverse ).reshape( shape )
+
 __all__ = (
     'gluProject',
     'gluUnProject',
     'gluUnProject4',
+    'gluProjectMany',
+    'gluUnProjectMany',
 )
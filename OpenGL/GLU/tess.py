@@ -1,14 +1,26 @@
-"""Wrapper/Implementation of the GLU tessellator objects for PyOpenGL"""
+"""Wrapper/Implementation of the GLU tessellator objects for PyOpenGL
+
+Besides the callback-based GLU API, tessellate() triangulates whole
+polygons given as arrays of contours and returns NumPy vertex and
+triangle index arrays (see Tessellator).
+"""
 from OpenGL.raw import GLU as _simple
 from OpenGL.raw.GL.VERSION import GL_1_1
 from OpenGL.platform import createBaseFunction
 from OpenGL.GLU import glustruct
-from OpenGL import arrays, wrapper
+from OpenGL import arrays, error, wrapper
 from OpenGL.platform import PLATFORM
 
 GLU = PLATFORM.GLU
 from OpenGL.lazywrapper import lazy as _lazy
+import array
 import ctypes
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class GLUtesselator(glustruct.GLUStruct, _simple.GLUtesselator):
@@ -83,6 +95,29 @@ class GLUtesselator(glustruct.GLUStruct, _simple.GLUtesselator):
         """Note the object pointer to return it as a Python object"""
         return _simple.gluTessBeginPolygon(self, ctypes.c_void_p(self.noteObject(data)))
 
+    def gluTessEndPolygon(self):
+        """Tessellate the polygon, then forget the objects noted for it
+
+        The callbacks run during this call, afterwards GLU holds no
+        references to the polygon's data, vertices or combined vertices.
+        """
+        try:
+            return _simple.gluTessEndPolygon(self)
+        finally:
+            self.clearPolygon()
+
+    def gluEndPolygon(self):
+        """GLU 1.1 gluEndPolygon, forgetting the polygon's objects afterwards"""
+        try:
+            return _simple.gluEndPolygon(self)
+        finally:
+            self.clearPolygon()
+
+    def clearPolygon(self):
+        """Drop the per-polygon data pointers and vertex arrays"""
+        self.dataPointers = {}
+        self.vertexCache = []
+
     def combineWrapper(self, function):
         """Wrap a Python function with ctypes-compatible wrapper for combine callback
 
@@ -228,6 +263,16 @@ def gluTessVertex(tess, location, data=None):
     return tess.gluTessVertex(location, data)
 
 
+def gluTessEndPolygon(tess):
+    """Finish (and tessellate) the tessellator's current polygon"""
+    return tess.gluTessEndPolygon()
+
+
+def gluEndPolygon(tess):
+    """Finish (and tessellate) the tessellator's current polygon"""
+    return tess.gluEndPolygon()
+
+
 # /usr/include/GL/glu.h 293
 @_lazy(
     createBaseFunction(
@@ -258,10 +303,251 @@ gluTessVertexBase = wrapper.wrapper(_simple.gluTessVertex).setInputArraySize(
     3,
 )
 
+def _prototype(name, resultType, *argTypes):
+    """ctypes prototype for GLU function name taking plain addresses"""
+    return GLUtesselator.FUNCTION_TYPE(resultType, *argTypes)((name, GLU))
+
+
+_newTess = _prototype('gluNewTess', ctypes.c_void_p)
+_deleteTess = _prototype('gluDeleteTess', None, ctypes.c_void_p)
+_tessProperty = _prototype(
+    'gluTessProperty', None, ctypes.c_void_p, _simple.GLenum, _simple.GLdouble
+)
+_tessNormal = _prototype(
+    'gluTessNormal',
+    None,
+    ctypes.c_void_p,
+    _simple.GLdouble,
+    _simple.GLdouble,
+    _simple.GLdouble,
+)
+_tessCallback = _prototype(
+    'gluTessCallback', None, ctypes.c_void_p, _simple.GLenum, ctypes.c_void_p
+)
+_tessBeginPolygon = _prototype(
+    'gluTessBeginPolygon', None, ctypes.c_void_p, ctypes.c_void_p
+)
+_tessBeginContour = _prototype('gluTessBeginContour', None, ctypes.c_void_p)
+# the vertex data is the vertex's index
+_tessVertex = _prototype(
+    'gluTessVertex', None, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t
+)
+_tessEndContour = _prototype('gluTessEndContour', None, ctypes.c_void_p)
+_tessEndPolygon = _prototype('gluTessEndPolygon', None, ctypes.c_void_p)
+
+TESS_ERRORS = dict(
+    [
+        (int(getattr(_simple, name)), name)
+        for name in (
+            'GLU_TESS_MISSING_BEGIN_POLYGON',
+            'GLU_TESS_MISSING_BEGIN_CONTOUR',
+            'GLU_TESS_MISSING_END_POLYGON',
+            'GLU_TESS_MISSING_END_CONTOUR',
+            'GLU_TESS_COORD_TOO_LARGE',
+            'GLU_TESS_NEED_COMBINE_CALLBACK',
+            'GLU_OUT_OF_MEMORY',
+        )
+    ]
+)
+
+
+class Tessellator(object):
+    """A GLU tessellator turning polygon contours into triangle arrays
+
+    Vertices go to GLU by address with their index as the vertex data,
+    so no Python objects are registered per vertex.  The vertex callback
+    is the append of an array.array of indices (called straight from C,
+    no Python function per vertex), with an edge flag callback set GLU
+    only produces independent triangles, and vertices GLU creates where
+    edges cross are numbered after the input ones.  The buffers are
+    reused and reset for every polygon.
+
+    A Tessellator needs no GL context but must only be used by one thread
+    at a time, tessellate() keeps one per thread.
+    """
+
+    def __init__(self):
+        self.indices = array.array('Q')
+        self.errors = []
+        self.combined = []
+        self.inputCount = [0]
+        self.tess = None
+        indices, errors, combined, inputCount = (
+            self.indices,
+            self.errors,
+            self.combined,
+            self.inputCount,
+        )
+
+        def combine(coords, vertexData, weight, outData):
+            combined.append((coords[0], coords[1], coords[2]))
+            outData[0] = inputCount[0] + len(combined) - 1
+
+        FUNCTION_TYPE = GLUtesselator.FUNCTION_TYPE
+        # kept referenced for as long as GLU may call them
+        self.callbacks = [
+            (
+                _simple.GLU_TESS_VERTEX,
+                FUNCTION_TYPE(None, ctypes.c_size_t)(indices.append),
+            ),
+            (_simple.GLU_TESS_EDGE_FLAG, FUNCTION_TYPE(None, _simple.GLboolean)(id)),
+            (_simple.GLU_TESS_ERROR, FUNCTION_TYPE(None, _simple.GLenum)(errors.append)),
+            (
+                _simple.GLU_TESS_COMBINE,
+                FUNCTION_TYPE(
+                    None,
+                    ctypes.POINTER(_simple.GLdouble),
+                    ctypes.POINTER(ctypes.c_size_t),
+                    ctypes.POINTER(_simple.GLfloat),
+                    ctypes.POINTER(ctypes.c_size_t),
+                )(combine),
+            ),
+        ]
+        self.tess = _newTess()
+        if not self.tess:
+            raise error.GLUError("""gluNewTess failed""")
+        for which, callback in self.callbacks:
+            _tessCallback(self.tess, which, ctypes.cast(callback, ctypes.c_void_p))
+
+    def close(self):
+        """Delete the GLU tessellator"""
+        if self.tess:
+            _deleteTess(self.tess)
+            self.tess = None
+
+    def __del__(self):
+        self.close()
+
+    @staticmethod
+    def contourArrays(contours):
+        """contours as a list of (N,2) or (N,3) float64 arrays"""
+        try:
+            single = numpy.asarray(contours, dtype='d')
+        except ValueError:
+            # contours of different lengths
+            single = None
+        if single is not None and single.ndim == 2:
+            result = [single]
+        elif single is not None and single.ndim == 3:
+            result = list(single)
+        elif single is not None and single.size:
+            raise ValueError(
+                """Need contours of (N,2) or (N,3) points, got shape %s"""
+                % (single.shape,)
+            )
+        else:
+            result = [numpy.asarray(contour, dtype='d') for contour in contours]
+        for contour in result:
+            if contour.ndim != 2 or contour.shape[1] not in (2, 3):
+                raise ValueError(
+                    """Need contours of (N,2) or (N,3) points, got shape %s"""
+                    % (contour.shape,)
+                )
+        return result
+
+    def tessellate(
+        self, contours, winding=_simple.GLU_TESS_WINDING_ODD, normal=None, tolerance=None
+    ):
+        """Triangulate the polygon made of contours, see tessellate()"""
+        if numpy is None:
+            raise ImportError("""tessellate needs numpy""")
+        if not self.tess:
+            raise error.GLUError("""Tessellator has been closed""")
+        contours = self.contourArrays(contours)
+        count = sum([len(contour) for contour in contours])
+        vertices = numpy.zeros((count, 3), dtype='d')
+        spans = []
+        start = 0
+        for contour in contours:
+            stop = start + len(contour)
+            vertices[start:stop, : contour.shape[1]] = contour
+            spans.append((start, stop))
+            start = stop
+        if normal is None:
+            if all([contour.shape[1] == 2 for contour in contours]):
+                normal = (0.0, 0.0, 1.0)
+            else:
+                normal = (0.0, 0.0, 0.0)
+
+        tess = self.tess
+        del self.indices[:]
+        del self.combined[:]
+        self.inputCount[0] = len(vertices)
+        _tessProperty(tess, _simple.GLU_TESS_WINDING_RULE, winding)
+        _tessProperty(
+            tess, _simple.GLU_TESS_TOLERANCE, 0.0 if tolerance is None else tolerance
+        )
+        _tessNormal(tess, *normal)
+        base, stride = vertices.ctypes.data, vertices.strides[0]
+        vertex, beginContour, endContour = _tessVertex, _tessBeginContour, _tessEndContour
+        _tessBeginPolygon(tess, None)
+        # a polygon abandoned part-way is reported as this begin closes it
+        del self.errors[:]
+        for start, stop in spans:
+            beginContour(tess)
+            for index in range(start, stop):
+                vertex(tess, base + index * stride, index)
+            endContour(tess)
+        _tessEndPolygon(tess)
+
+        if self.errors:
+            code = self.errors[0]
+            raise error.GLUError(
+                """Tessellation failed: %s (%d)"""
+                % (TESS_ERRORS.get(code, 'error'), code)
+            )
+        if self.combined:
+            combined = numpy.array(self.combined, dtype='d')
+            vertices = numpy.concatenate((vertices, combined))
+        if self.indices:
+            triangles = numpy.frombuffer(self.indices, dtype=numpy.uint64)
+            triangles = triangles.astype(numpy.uint32)
+        else:
+            triangles = numpy.zeros((0,), dtype=numpy.uint32)
+        return vertices, triangles.reshape((-1, 3))
+
+
+_local = threading.local()
+
+
+def tessellate(
+    contours, winding=_simple.GLU_TESS_WINDING_ODD, normal=None, tolerance=None
+):
+    """Triangulate a polygon given as arrays of contours
+
+    contours -- a sequence of (N,2) or (N,3) point arrays (one contour
+        as an array by itself also works), outer boundaries and holes
+        alike, which regions are inside is decided by winding
+    winding -- GLU_TESS_WINDING_ODD (default), _NONZERO, _POSITIVE,
+        _NEGATIVE or _ABS_GEQ_TWO
+    normal -- the polygon's normal, default (0,0,1) for 2D contours and
+        computed by GLU for 3D ones
+    tolerance -- GLU_TESS_TOLERANCE for merging close vertices
+
+    Returns (vertices, triangles): an (M,3) float64 array holding the
+    contours' points in order followed by any points created where edges
+    cross, and a (K,3) uint32 array of indices into vertices, one row per
+    triangle (ready for glDrawElements with GL_UNSIGNED_INT).  Raises
+    GLUError if GLU reports a tessellation error.
+
+    Each thread uses its own Tessellator, so this can be called from a
+    thread pool, and being a plain function it can be passed to process
+    pools as well.
+    """
+    tessellator = getattr(_local, 'tessellator', None)
+    if tessellator is None:
+        tessellator = _local.tessellator = Tessellator()
+    return tessellator.tessellate(contours, winding, normal, tolerance)
+
+
 __all__ = (
     'gluNewTess',
     'gluGetTessProperty',
     'gluTessBeginPolygon',
     'gluTessCallback',
     'gluTessVertex',
+    'gluTessEndPolygon',
+    'gluEndPolygon',
+    'tessellate',
+    'Tessellator',
 )
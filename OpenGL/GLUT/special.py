@@ -22,7 +22,7 @@ platform module *not* in the module here!
 """
 from OpenGL.platform import CurrentContextIsValid, GLUT_GUARD_CALLBACKS, PLATFORM
 GLUT = PLATFORM.GLUT
-from OpenGL import contextdata, error, platform, logs
+from OpenGL import contextdata, error, platform, logs, _configflags
 from OpenGL.raw import GLUT as _simple
 from OpenGL._bytes import bytes, unicode,as_8_bit
 import ctypes, os, sys, traceback
@@ -138,6 +138,13 @@ class GLUTCallback( object ):
             finalFunction = safeCall
         else:
             finalFunction = function
+        if PLATFORM.contextTracker and hasattr( finalFunction,'__call__' ):
+            trackedFunction = finalFunction
+            def trackedCall( *args, **named ):
+                """GLUT makes the event's window current before calling back"""
+                PLATFORM.contextTracker.invalidate()
+                return trackedFunction( *args, **named )
+            finalFunction = trackedCall
         if hasattr( finalFunction,'__call__' ):
             cCallback = self.callbackType( finalFunction )
         else:
@@ -338,6 +345,13 @@ def glutInit( *args ):
     ]
 glutInit.wrappedOperation = _simple.glutInit
 
+if _configflags.ERROR_CHECKING == 'deferred':
+    def glutSwapBuffers( ):
+        """Swap the current window's buffers, then check for deferred GL errors"""
+        _simple.glutSwapBuffers()
+        error.checkpoint()
+    glutSwapBuffers.wrappedOperation = _simple.glutSwapBuffers
+
 def glutDestroyWindow( window ):
     """Want to destroy the window, we need to do some cleanup..."""
     context = 0
@@ -33,8 +33,28 @@ import occurs the flags should no longer be changed.
         i.e. where you are explicitly checking for errors
         everywhere they can occur in your code.
 
+        If set to 'deferred' (PYOPENGL_ERROR_CHECKING=deferred) GL
+        calls are not followed by a glGetError each, instead errors are
+        checked at sync points: after glFinish and glutSwapBuffers, on
+        OpenGL.error.checkpoint() and every ERROR_CHECKING_INTERVAL
+        calls.  The last ERROR_CHECKING_HISTORY calls are recorded and
+        reported as GLError.recentCalls, as the failing call is no
+        longer known exactly.
+
         Default: True
 
+    ERROR_CHECKING_INTERVAL -- with deferred error checking, the
+        number of GL calls after which errors are checked even without
+        a sync point (PYOPENGL_ERROR_CHECKING_INTERVAL)
+
+        Default: 1000
+
+    ERROR_CHECKING_HISTORY -- with deferred error checking, how many
+        of the most recent GL calls are kept for error reports
+        (PYOPENGL_ERROR_CHECKING_HISTORY)
+
+        Default: 32
+
     ERROR_LOGGING -- If True, then wrap array-handler
         functions with  error-logging operations so that all exceptions
         will be reported to log objects in OpenGL.logs, note that
@@ -76,6 +96,14 @@ import occurs the flags should no longer be changed.
         has been initialized (something later Linux GLs are
         very picky about).
 
+        If set to 'tracked' the current context is instead cached
+        per-thread and only re-queried after functions which may
+        change it (make-current, context destruction and GLUT
+        window switches, see BasePlatform.CONTEXT_CHANGING_FUNCTIONS),
+        which makes the check cheap.  Code making a context current
+        outside of PyOpenGL (e.g. a GUI toolkit) must then call
+        OpenGL.platform.contextChanged() afterwards.
+
         Default: False
 
     STORE_POINTERS -- if set to True, PyOpenGL array operations
@@ -128,6 +156,17 @@ import occurs the flags should no longer be changed.
 
         Default: False
 
+    PROFILING -- If True, record per-entry-point call counts and
+        the time spent in each stage of the wrapper pipeline
+        (Python/C argument conversion, the ctypes call, error
+        checking and return-value handling).  Results are
+        available from the OpenGL.profiling module as a sorted
+        table or as collapsed stacks for flame-graph tools.
+        Like FULL_LOGGING this slows every call, and it disables
+        the OpenGL_accelerate wrappers while active.
+
+        Default: False
+
     ALLOW_NUMPY_SCALARS -- if True, we will wrap
         all GLint/GLfloat calls conversions with wrappers
         that allow for passing numpy scalar values.
@@ -164,6 +203,23 @@ import occurs the flags should no longer be changed.
         operations.
 
         Default: True
+
+    SHADER_CACHE -- if set to a directory (or True for the default
+        directory, see OpenGL.GL.programcache) OpenGL.GL.shaders'
+        compileProgram stores linked program binaries there and loads
+        them on later runs instead of compiling and linking again
+        (PYOPENGL_SHADER_CACHE).  Read at each compileProgram call.
+
+        Default: False
+
+    STATE_CACHE -- if True, OpenGL.GL.statecache is installed when
+        OpenGL.GL is imported, replacing glColor*, glEnable/glDisable,
+        glBind*, glUseProgram, glBlendFunc, glMatrixMode and friends
+        with versions which skip calls that would not change the GL
+        state (PYOPENGL_STATE_CACHE).  State changed behind its back
+        must be reported with OpenGL.GL.statecache.invalidate().
+
+        Default: False
     
     MODULE_ANNOTATIONS -- if True, attempt to annotate alternates() and 
         constants to track in which module they are defined (only useful 
@@ -182,18 +238,28 @@ from OpenGL.version import __version__
 import os
 
 
-def environ_key(name, default):
+def environ_key(name, default, options=()):
+    """Boolean flag from PYOPENGL_<name>, or one of options given by name"""
     composed = "PYOPENGL_%s" % name.upper()
     if composed in os.environ:
         value = os.environ[composed]
         if value.lower() in ("1", "true"):
             return True
+        elif value.lower() in options:
+            return value.lower()
         else:
             return False
     return os.environ.get(composed, default)
 
 
-ERROR_CHECKING = environ_key("ERROR_CHECKING", True)
+def environ_int(name, default):
+    """Integer setting from PYOPENGL_<name>"""
+    return int(os.environ.get("PYOPENGL_%s" % name.upper(), default))
+
+
+ERROR_CHECKING = environ_key("ERROR_CHECKING", True, options=("deferred",))
+ERROR_CHECKING_INTERVAL = environ_int("ERROR_CHECKING_INTERVAL", 1000)
+ERROR_CHECKING_HISTORY = environ_int("ERROR_CHECKING_HISTORY", 32)
 ERROR_LOGGING = environ_key("ERROR_LOGGING", False)
 ERROR_ON_COPY = environ_key("ERROR_ON_COPY", False)
 ARRAY_SIZE_CHECKING = environ_key("ARRAY_SIZE_CHECKING", True)
@@ -202,9 +268,12 @@ WARN_ON_FORMAT_UNAVAILABLE = False
 FORWARD_COMPATIBLE_ONLY = False
 SIZE_1_ARRAY_UNPACK = True
 USE_ACCELERATE = environ_key("USE_ACCELERATE", True)
-CONTEXT_CHECKING = environ_key("CONTEXT_CHECKING", False)
+CONTEXT_CHECKING = environ_key("CONTEXT_CHECKING", False, options=("tracked",))
+SHADER_CACHE = os.environ.get("PYOPENGL_SHADER_CACHE", False)
+STATE_CACHE = environ_key("STATE_CACHE", False)
 
 FULL_LOGGING = environ_key("FULL_LOGGING", False)
+PROFILING = environ_key("PROFILING", False)
 ALLOW_NUMPY_SCALARS = environ_key("ALLOW_NUMPY_SCALARS", False)
 UNSIGNED_BYTE_IMAGES_AS_STRING = environ_key("UNSIGNED_BYTE_IMAGES_AS_STRING", True)
 MODULE_ANNOTATIONS = False
@@ -373,3 +442,9 @@ FormatHandler(
     ["OpenGL.arrays.vbo.VBOOffset", "OpenGL_accelerate.vbo.VBOOffset"],
     isOutput=False,
 )
+FormatHandler(
+    "streamingvbo",
+    "OpenGL.arrays.vbo.StreamingVBOHandler",
+    ["OpenGL.arrays.vbo.StreamingVBO"],
+    isOutput=False,
+)
@@ -1,6 +1,8 @@
 """Holds the import-time constants for various configuration flags"""
 from OpenGL import (
     ERROR_CHECKING,
+    ERROR_CHECKING_INTERVAL,
+    ERROR_CHECKING_HISTORY,
     ERROR_LOGGING,
     ERROR_ON_COPY,
     ARRAY_SIZE_CHECKING,
@@ -10,8 +12,10 @@ from OpenGL import (
     SIZE_1_ARRAY_UNPACK,
     USE_ACCELERATE,
     CONTEXT_CHECKING,
+    STATE_CACHE,
 
     FULL_LOGGING,
+    PROFILING,
     ALLOW_NUMPY_SCALARS,
     UNSIGNED_BYTE_IMAGES_AS_STRING,
     MODULE_ANNOTATIONS,
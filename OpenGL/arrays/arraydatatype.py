@@ -32,6 +32,7 @@ if ADT is None:
             self.output_handler = None
             self.preferredOutput = None
             self.all_output_handlers = []
+            self.cacheEntries = []
 
         def __call__(self, value):
             """Lookup of handler for given value"""
@@ -55,13 +56,53 @@ if ADT is None:
                             if hasattr(handler, "registerEquivalent"):
                                 handler.registerEquivalent(typ, base)
                             return handler
-                print(self.keys())
                 raise TypeError(
-                    """No array-type handler for type %s.%s (value: %s) registered"""
-                    % (typ.__module__, typ.__name__, repr(value)[:50])
+                    """No array-type handler for type %s.%s (value: %s) registered, handled types: %s"""
+                    % (
+                        typ.__module__,
+                        typ.__name__,
+                        repr(value)[:50],
+                        ", ".join(self.handledTypeNames()),
+                    )
                 )
             return handler
 
+        def handledTypeNames(self):
+            """Sorted names of the types a handler is registered or plugged-in for"""
+            names = set(
+                "%s.%s" % (key.__module__, key.__name__)
+                for key in self.keys()
+                if isinstance(key, type)
+            )
+            for plugin in plugins.FormatHandler.all():
+                names.update(plugin.check or ())
+            return sorted(names)
+
+        def cache(self):
+            """Create a monomorphic inline cache for a single call-site
+
+            Returns a function looking up the handler for a value like the
+            registry itself, but remembering the last type seen and its
+            handler, so a call-site which keeps being passed the same type
+            of array (the usual case) skips the registry.  The type and
+            handler are stored as one tuple so concurrent callers never
+            see a type paired with another type's handler; registering a
+            handler empties every cache.
+            """
+            registry = self
+            entry = [(None, None)]
+            self.cacheEntries.append(entry)
+
+            def lookup(value):
+                typ, handler = entry[0]
+                if value.__class__ is typ:
+                    return handler
+                handler = registry(value)
+                entry[0] = (value.__class__, handler)
+                return handler
+
+            return lookup
+
         def handler_by_plugin_name(self, name):
             plugin = plugins.FormatHandler.by_name(name)
             if plugin:
@@ -96,6 +137,8 @@ if ADT is None:
                 types = [types]
             for type in types:
                 self[type] = handler
+            for entry in self.cacheEntries:
+                entry[0] = (None, None)
             if handler.isOutput:
                 self.all_output_handlers.append(handler)
 
@@ -329,6 +372,11 @@ if ADT is None:
         baseType = _types.GLfixed
         typeConstant = _types.GL_FIXED
 
+    # each array type resolves handlers through its own inline cache
+    for _arrayType in [ArrayDatatype] + ArrayDatatype.__subclasses__():
+        _arrayType.getHandler = staticmethod(GLOBAL_REGISTRY.cache())
+    del _arrayType
+
 else:
     # Cython-coded array handler
     _log.debug("Using accelerated ArrayDatatype")
@@ -355,6 +403,20 @@ else:
 EGLAttribArray = GLintArray
 
 
+def handlerCache():
+    """Handler lookup function with an inline cache for one call-site
+
+    Falls back to the registry itself for registries without caching
+    support (e.g. the OpenGL_accelerate one, whose lookups are already
+    coded in C).
+    """
+    registry = ArrayDatatype.getRegistry()
+    cache = getattr(registry, "cache", None)
+    if cache is not None:
+        return cache()
+    return registry
+
+
 GL_CONSTANT_TO_ARRAY_TYPE = {
     GL_1_1.GL_HALF_FLOAT: GLfloat16Array,
     GL_1_1.GL_DOUBLE: GLclampdArray,
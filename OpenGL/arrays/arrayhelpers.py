@@ -46,11 +46,12 @@ if AsArrayTypedSizeChecked is None:
         def __init__( self, arrayName='pointer', typeName='type' ):
             self.arrayName = arrayName
             self.typeName = typeName 
+            self.getHandler = arraydatatype.handlerCache()
         def __call__( self, arg, wrappedOperation, args):
             """Get the arg as an array of the appropriate type"""
             type = args[ self.typeIndex ]
             arrayType = arraydatatype.GL_CONSTANT_TO_ARRAY_TYPE[ type ]
-            return arrayType.asArray( arg )
+            return self.getHandler( arg ).asArray( arg, arrayType.typeConstant )
     class AsArrayTyped( converters.PyConverter ):
         """Given arrayName and arrayType, convert arrayName to array of type
         
@@ -65,9 +66,10 @@ if AsArrayTypedSizeChecked is None:
         def __init__( self, arrayName='pointer', arrayType=None ):
             self.arrayName = arrayName
             self.arrayType = arrayType
+            self.getHandler = arraydatatype.handlerCache()
         def __call__( self, arg, wrappedOperation, args):
             """Get the arg as an array of the appropriate type"""
-            return self.arrayType.asArray( arg )
+            return self.getHandler( arg ).asArray( arg, self.arrayType.typeConstant )
     class AsArrayTypedSize( converters.CConverter ):
         """Given arrayName and arrayType, determine size of arrayName
         """
@@ -78,9 +80,11 @@ if AsArrayTypedSizeChecked is None:
         def __init__( self, arrayName='pointer', arrayType=None ):
             self.arrayName = arrayName
             self.arrayType = arrayType
+            self.getHandler = arraydatatype.handlerCache()
         def __call__( self, pyArgs, index, wrappedOperation ):
             """Get the arg as an array of the appropriate type"""
-            return self.arrayType.arraySize( pyArgs[self.arrayIndex ] )
+            array = pyArgs[ self.arrayIndex ]
+            return self.getHandler( array ).arraySize( array, self.arrayType.typeConstant )
 else:
     returnPointer = returnPyArgumentIndex( 0 )
 
@@ -104,12 +108,11 @@ else:
             
             Produces a raw function, not a PyConverter instance
             """
-            asArray = typ.asArray
             dataType = typ.typeConstant
-            arraySize = typ.arraySize
             expectedBytes = ctypes.sizeof( typ.baseType ) * size
+            getHandler = arraydatatype.handlerCache()
             def asArraySize( incoming, function, args ):
-                handler = typ.getHandler( incoming )
+                handler = getHandler( incoming )
                 result = handler.asArray( incoming, dataType )
                 # check that the number of bytes expected is present...
                 byteSize = handler.arrayByteCount( result )
@@ -171,12 +174,13 @@ def setInputArraySizeType( baseOperation, size, type, argName=0 ):
     return wrapper.wrapper( baseOperation ).setInputArraySize( argName, size )
 
 def arraySizeOfFirstType( typ, default ):
-    unitSize = typ.unitSize
+    dataType = typ.typeConstant
+    getHandler = arraydatatype.handlerCache()
     def arraySizeOfFirst( pyArgs, index, baseOperation ):
         """Return the array size of the first argument"""
         array = pyArgs[0]
         if array is None:
             return default
         else:
-            return unitSize( array )
+            return getHandler( array ).unitSize( array, dataType )
     return arraySizeOfFirst
@@ -17,6 +17,7 @@ from OpenGL.arrays import formathandler
 from OpenGL._bytes import bytes,unicode,as_8_bit
 HANDLED_TYPES = (list,tuple)
 import operator
+from itertools import chain
 
 def err_on_copy( func ):
     """Decorator which raises informative error if we try to copy while ERROR_ON_COPY"""
@@ -129,13 +130,67 @@ class ListHandler( formathandler.FormatHandler ):
             length = getattr( base, '_length_', None)
             if length is not None:
                 yield length
+    @classmethod
+    def flatten( cls, value ):
+        """Return (shape, flat items) for a uniformly nested list/tuple value
+        
+        Works a whole nesting level at a time, so the per-item work is
+        done by map/set/chain in C.  Returns None when value is not
+        nested lists/tuples of uniform, non-zero lengths all the way
+        down, leaving those to asArrayRecursive.
+        """
+        shape = [ len(value) ]
+        flat = value
+        while shape[-1]:
+            if not isinstance( flat[0], HANDLED_TYPES ):
+                return shape, flat
+            for itemType in set( map( type, flat ) ):
+                if not issubclass( itemType, HANDLED_TYPES ):
+                    return None
+            lengths = set( map( len, flat ) )
+            if len( lengths ) != 1:
+                return None
+            shape.append( lengths.pop() )
+            flat = list( chain.from_iterable( flat ) )
+        return None
     @err_on_copy
     @classmethod
     def asArray( cls, value, typeCode=None ):
         """Convert given value to a ctypes array value of given typeCode
         
+        Uniformly nested lists/tuples (e.g. a list of (x,y,z) vertices)
+        are flattened level by level and copied into a single ctypes 
+        array with one slice assignment, so the items are converted by
+        ctypes itself.  Anything else (ragged nesting, values ctypes 
+        rejects) goes through asArrayRecursive, which produces the 
+        same results and errors, only far more slowly.
+        """
+        if typeCode is None:
+            raise NotImplementedError( """Haven't implemented type-inference for lists yet""" )
+        if isinstance( value, HANDLED_TYPES ):
+            flattened = cls.flatten( value )
+            if flattened is not None:
+                shape, flat = flattened
+                baseType = GL_TYPE_TO_ARRAY_MAPPING[ typeCode ]
+                arrayType = baseType
+                for dim in shape[::-1]:
+                    arrayType *= dim
+                result = arrayType()
+                try:
+                    ( baseType * len( flat ) ).from_buffer( result )[:] = flat
+                except (TypeError, ValueError):
+                    pass
+                else:
+                    return result
+        return cls.asArrayRecursive( value, typeCode )
+    @err_on_copy
+    @classmethod
+    def asArrayRecursive( cls, value, typeCode=None ):
+        """Convert given value to a ctypes array value of given typeCode
+        
         This does a *lot* of work just to get the data into the correct
-        format.  It's not going to be anywhere near as fast as a numpy
+        format, building and filling a ctypes array for every nested
+        list.  It's not going to be anywhere near as fast as a numpy
         or similar approach!
         """
         if typeCode is None:
@@ -143,7 +198,7 @@ class ListHandler( formathandler.FormatHandler ):
         arrayType = GL_TYPE_TO_ARRAY_MAPPING[ typeCode ]
         if isinstance( value, (list,tuple)):
             subItems = [
-                cls.asArray( item, typeCode )
+                cls.asArrayRecursive( item, typeCode )
                 for item in value
             ]
             if subItems:
@@ -37,8 +37,16 @@ if NumpyHandler is None:
     # in python for every access of the .ctypes attribute... which can take
     # ridiculously large periods when you multiply it by millions of iterations
     if hasattr(testArray,'__array_interface__'):
+        _bufferStart = ctypes.c_char.from_buffer
+        _addressof = ctypes.addressof
         def dataPointer( cls, instance ):
             """Convert given instance to a data-pointer value (integer)"""
+            # Exporting a writable contiguous array's buffer is several times
+            # faster than building its __array_interface__ dictionary
+            try:
+                return _addressof( _bufferStart( instance ) )
+            except (TypeError, ValueError, BufferError):
+                pass
             try:
                 return long(instance.__array_interface__['data'][0])
             except AttributeError:
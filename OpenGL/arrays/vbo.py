@@ -35,12 +35,24 @@ from OpenGL.arrays.formathandler import FormatHandler
 from OpenGL.raw.GL import _types 
 from OpenGL import error
 from OpenGL._bytes import bytes,unicode,as_8_bit
-import ctypes,logging
+import ctypes,logging,operator
 _log = logging.getLogger( 'OpenGL.arrays.vbo' )
 from OpenGL._bytes import long, integer_types
 
-import weakref
-__all__ = ('VBO','VBOHandler','mapVBO')
+import weakref, collections, sys
+__all__ = ('VBO','VBOHandler','StreamingVBO','mapVBO')
+
+def _noteBuffer( target, buffer ):
+    """Tell an installed OpenGL.GL.statecache about a buffer bound here"""
+    # only once imported can it have been installed
+    statecache = sys.modules.get( 'OpenGL.GL.statecache' )
+    if statecache is not None:
+        statecache.noteBuffer( target, buffer )
+def _forgetBuffers( ):
+    """Tell an installed OpenGL.GL.statecache buffers were deleted (and unbound)"""
+    statecache = sys.modules.get( 'OpenGL.GL.statecache' )
+    if statecache is not None:
+        statecache.invalidate( 'buffers' )
 
 class Implementation( object ):
     """Abstraction point for the various implementations that can be used
@@ -82,6 +94,20 @@ class Implementation( object ):
     GL_UNIFORM_BUFFER
     GL_TEXTURE_BUFFER
     GL_TRANSFORM_FEEDBACK_BUFFER'''.split()
+    # Not every implementation has these, StreamingVBO checks for them
+    OPTIONAL_NAMES = '''glMapBufferRange
+    glFlushMappedBufferRange
+    glFenceSync
+    glClientWaitSync
+    glDeleteSync
+    GL_MAP_WRITE_BIT
+    GL_MAP_FLUSH_EXPLICIT_BIT
+    GL_MAP_UNSYNCHRONIZED_BIT
+    GL_SYNC_GPU_COMMANDS_COMPLETE
+    GL_SYNC_FLUSH_COMMANDS_BIT
+    GL_TIMEOUT_EXPIRED'''.split()
+    glMapBufferRange = glFlushMappedBufferRange = None
+    glFenceSync = glClientWaitSync = glDeleteSync = None
     available = False
     def _arbname( self, name ):
         return (
@@ -98,13 +124,33 @@ class Implementation( object ):
     def __nonzero__( self ):
         return self.available
     __bool__ = __nonzero__
+    def load_optional( self, *sources ):
+        """Set each of OPTIONAL_NAMES the first of sources defines"""
+        for name in self.OPTIONAL_NAMES:
+            for source in sources:
+                try:
+                    setattr( self, name, getattr( source, name ))
+                except AttributeError as err:
+                    pass
+                else:
+                    break
+    @property
+    def has_sync( self ):
+        """Whether fences and unsynchronized buffer mapping are available"""
+        return bool(self.glFenceSync) and bool(self.glMapBufferRange)
     def deleter( self, buffers, key):
         """Produce a deleter callback to delete the given buffer"""
         # these values are stored here to avoid them being cleaned up 
         # to non during module deletion and causing errors to be raised
         nfe = error.NullFunctionError
         gluint = _types.GLuint
+        forget = _forgetBuffers
         def doBufferDeletion( *args, **named ):
+            if buffers:
+                try:
+                    forget()
+                except (AttributeError, TypeError) as err:
+                    pass
             while buffers:
                 try:
                     buffer = buffers.pop()
@@ -248,7 +294,7 @@ if VBO is None:
                 stop = max((stop,0))
             self.data[ slice ] = data
             if self.copied and self.buffers:
-                if start-stop == len(self.data):
+                if stop-start == len(self.data):
                     # re-copy the whole data-set
                     self.copied = False
                 elif len(data):
@@ -296,8 +342,8 @@ if VBO is None:
             assert self.buffers, """Should do create_buffers before copy_data"""
             if self.copied:
                 if self._copy_segments:
-                    while self._copy_segments:
-                        start,size,data  = self._copy_segments.pop(0)
+                    segments, self._copy_segments = self._copy_segments, []
+                    for start,size,data in segments:
                         dataptr = ArrayDatatype.voidDataPointer( data )
                         self.implementation.glBufferSubData(self.target, start, size, dataptr)
             else:
@@ -310,9 +356,11 @@ if VBO is None:
                     self.usage,
                 )
                 self.copied = True
+                self._copy_segments = []
         def delete( self ):
             """Delete this buffer explicitly"""
             if self.buffers:
+                _forgetBuffers()
                 while self.buffers:
                     try:
                         self.implementation.glDeleteBuffers(1, self.buffers.pop(0))
@@ -332,10 +380,12 @@ if VBO is None:
             if not self.buffers:
                 buffers = self.create_buffers()
             self.implementation.glBindBuffer( self.target, self.buffers[0])
+            _noteBuffer( self.target, self.buffers[0] )
             self.copy_data()
         def unbind( self ):
             """Unbind the buffer (make normal array operations active)"""
             self.implementation.glBindBuffer( self.target,0 )
+            _noteBuffer( self.target, 0 )
 
         def __add__( self, other ):
             """Add an integer to this VBO (create a VBOOffset)"""
@@ -430,6 +480,306 @@ if VBO is None:
             """Returns a c_void_p( instance.offset )"""
             return ctypes.c_void_p( instance.offset )
 
+def _coalesce( starts, stops, gap=0 ):
+    """Merge [start,stop) ranges which overlap or are at most gap apart
+
+    returns the merged ranges as sorted lists of starts and stops
+    """
+    import numpy
+    starts = numpy.asarray( starts, dtype='int64' )
+    stops = numpy.asarray( stops, dtype='int64' )
+    if len(starts) < 2:
+        return starts.tolist(), stops.tolist()
+    order = numpy.argsort( starts, kind='stable' )
+    starts = starts[order]
+    # furthest stop of any range starting at or before each start
+    stops = numpy.maximum.accumulate( stops[order] )
+    breaks = numpy.flatnonzero( starts[1:] > stops[:-1] + gap ) + 1
+    first = numpy.concatenate( ([0], breaks) )
+    last = numpy.concatenate( (breaks - 1, [len(starts) - 1]) )
+    return starts[first].tolist(), stops[last].tolist()
+
+class StreamingVBO( object ):
+    """VBO for data rewritten piecemeal every frame (particles, bullets...)
+
+    Keeps a numpy copy of the data, written through __setitem__ or the
+    writable views view() hands out.  The rows written are recorded and
+    on bind() only those are sent to the GL, overlapping and adjacent
+    writes (and those at most merge_gap rows apart) merged into as few
+    uploads as possible.
+
+    With fence sync objects and glMapBufferRange (GL 3.2, GLES 3.0 or
+    ARB_sync with ARB_map_buffer_range) the buffer holds `regions` copies
+    of the data used in turn: unbind() fences the draws reading the current
+    region and moves on to the next, which is written through an
+    unsynchronized mapping once its own fence has passed, so uploads never
+    wait for draws still in flight.  Without them, or with regions=1,
+    every bind() after a write re-specifies the whole buffer with
+    glBufferData, orphaning the storage pending draws still read.
+
+    While bound, pass the instance (or instance + byte offset) as the
+    array pointer, it points at the current region:
+
+        particles = vbo.StreamingVBO( numpy.zeros( (1000,3), 'f' ))
+        particles[i] = position
+        particles.view( 10, 20 )[:] += velocities[10:20]
+        with particles:
+            glVertexPointer( 3, GL_FLOAT, 0, particles )
+            glDrawArrays( GL_POINTS, 0, len(particles) )
+    """
+    copied = False
+    _no_cache_ = True # do not cache in context data arrays
+    # copying this many unchanged bytes costs about as much as another upload
+    MERGE_GAP_BYTES = 4096
+    def __init__(
+        self, data, usage='GL_STREAM_DRAW',
+        target='GL_ARRAY_BUFFER', regions=3, merge_gap=None,
+    ):
+        """Initialize the streaming VBO
+
+        data -- array-compatible initial data, copied into a C-contiguous
+            numpy array (self.data) whose rows are the unit of updates
+        usage, target -- as for VBO
+        regions -- number of copies of the data in the ring buffer
+        merge_gap -- rows left unchanged between two writes that are still
+            uploaded to merge them into one upload, by default as many
+            rows as fit in MERGE_GAP_BYTES
+        """
+        import numpy
+        self.data = numpy.array( data, copy=True, order='C', ndmin=1 )
+        self.usage = usage
+        self.target = target
+        self.regions = regions
+        self.size = self.data.nbytes
+        self.row_size = self.data.strides[0]
+        if merge_gap is None:
+            merge_gap = self.MERGE_GAP_BYTES // max( self.row_size, 1 )
+        self.merge_gap = merge_gap
+        self.buffers = []
+        self.ring = False
+        self.region = 0
+        self._starts, self._stops = [], []
+        # (generation, starts, stops) of the writes of the last few binds
+        self._history = collections.deque( maxlen=regions )
+        self._generation = 0
+        self._uploaded = [None] * regions
+        self._fences = [None] * regions
+    implementation = property( get_implementation, )
+    def resolve( self, value ):
+        """Resolve string constant to constant"""
+        if isinstance( value, (bytes,unicode)):
+            return getattr( self.implementation, self.implementation.basename( value ) )
+        return value
+    def __len__( self ):
+        return len( self.data )
+    def touch( self, start=0, stop=None ):
+        """Record rows [start,stop) as changed, e.g. after writing self.data directly"""
+        start, stop, _ = slice( start, stop ).indices( len(self.data) )
+        if stop > start:
+            self._starts.append( start )
+            self._stops.append( stop )
+    def view( self, start=0, stop=None ):
+        """Writable numpy view of rows [start,stop), all sent on the next bind()"""
+        start, stop, _ = slice( start, stop ).indices( len(self.data) )
+        self.touch( start, stop )
+        return self.data[ start:stop ]
+    def __setitem__( self, index, value ):
+        """Set rows (or parts of rows) of the data, sent on the next bind()"""
+        self.data[ index ] = value
+        if index.__class__ is slice and index.step is None:
+            start, stop, _ = index.indices( len(self.data) )
+        else:
+            start, stop = self._rows( index )
+        if stop > start:
+            self._starts.append( start )
+            self._stops.append( stop )
+    def _rows( self, index ):
+        """First row and one past the last row index touches"""
+        if isinstance( index, tuple ):
+            index = index[0] if index else slice( None )
+        length = len(self.data)
+        if isinstance( index, slice ):
+            rows = range( *index.indices( length ))
+        else:
+            try:
+                index = operator.index( index )
+            except TypeError as err:
+                import numpy
+                rows = numpy.arange( length )[ index ].ravel()
+            else:
+                rows = range( length )[ index:index+1 or None ]
+        if not len(rows):
+            return 0, 0
+        return int(min( rows )), int(max( rows )) + 1
+    @property
+    def offset( self ):
+        """Byte offset of the current region within the buffer"""
+        return self.region * self.size
+    def __add__( self, other ):
+        """Offset into the current region (a VBOOffset)"""
+        if hasattr( other, 'offset' ):
+            other = other.offset
+        assert isinstance( other, integer_types ), """Only know how to add integer/long offsets"""
+        return VBOOffset( self, self.offset + other )
+    def create_buffers( self ):
+        """Create the internal buffer, choosing between ring and orphaning"""
+        assert not self.buffers, """Already created the buffer"""
+        implementation = self.implementation
+        self.buffers = [ long(implementation.glGenBuffers(1)) ]
+        self.target = self.resolve( self.target )
+        self.usage = self.resolve( self.usage )
+        self.ring = self.regions > 1 and implementation.has_sync
+        implementation._DELETERS_[ id(self) ] = weakref.ref( self, implementation.deleter( self.buffers, id(self) ))
+        return self.buffers
+    def __int__( self ):
+        """Get our VBO id"""
+        if not self.buffers:
+            self.create_buffers()
+        return self.buffers[0]
+    def copy_data( self ):
+        """Bring the buffer (the current region of it) up to date with self.data"""
+        assert self.buffers, """Should do create_buffers before copy_data"""
+        implementation = self.implementation
+        if not self.ring:
+            if self._starts or not self.copied:
+                self._starts, self._stops = [], []
+                implementation.glBufferData( self.target, self.size, self.data, self.usage )
+                self.copied = True
+            return
+        if not self.copied:
+            implementation.glBufferData(
+                self.target, self.size * self.regions, None, self.usage,
+            )
+            self.copied = True
+        if self._starts:
+            self._generation += 1
+            self._history.append(
+                (self._generation,) + _coalesce( self._starts, self._stops, self.merge_gap )
+            )
+            self._starts, self._stops = [], []
+        region = self.region
+        uploaded = self._uploaded[ region ]
+        if uploaded == self._generation:
+            return
+        self._wait( region )
+        if uploaded is None or self._history[0][0] > uploaded + 1:
+            # the region has missed writes no longer recorded
+            starts, stops = [0], [len(self.data)]
+        else:
+            missed = [entry for entry in self._history if entry[0] > uploaded]
+            if len(missed) == 1:
+                _, starts, stops = missed[0]
+            else:
+                starts, stops = _coalesce(
+                    sum( [entry[1] for entry in missed], [] ),
+                    sum( [entry[2] for entry in missed], [] ),
+                    self.merge_gap,
+                )
+        self._write( region, starts, stops )
+        self._uploaded[ region ] = self._generation
+    def _write( self, region, starts, stops ):
+        """Copy the (sorted, disjoint) rows into region through one mapping"""
+        implementation = self.implementation
+        row = self.row_size
+        first = starts[0] * row
+        pointer = implementation.glMapBufferRange(
+            self.target, self.offset + first, stops[-1] * row - first,
+            implementation.GL_MAP_WRITE_BIT
+            | implementation.GL_MAP_FLUSH_EXPLICIT_BIT
+            | implementation.GL_MAP_UNSYNCHRONIZED_BIT,
+        )
+        source = self.data.ctypes.data
+        try:
+            for start, stop in zip( starts, stops ):
+                start, size = start * row, (stop - start) * row
+                ctypes.memmove( pointer + start - first, source + start, size )
+                implementation.glFlushMappedBufferRange( self.target, start - first, size )
+        finally:
+            implementation.glUnmapBuffer( self.target )
+    def _wait( self, region ):
+        """Wait until the draws fenced for region are done with it"""
+        fence = self._fences[ region ]
+        if fence is None:
+            return
+        self._fences[ region ] = None
+        implementation = self.implementation
+        flags = implementation.GL_SYNC_FLUSH_COMMANDS_BIT
+        while implementation.glClientWaitSync( fence, flags, 1000000000 ) == implementation.GL_TIMEOUT_EXPIRED:
+            flags = 0
+        implementation.glDeleteSync( fence )
+    def bind( self ):
+        """Bind the buffer, sending the writes since the last bind"""
+        if not self.buffers:
+            self.create_buffers()
+        self.implementation.glBindBuffer( self.target, self.buffers[0] )
+        _noteBuffer( self.target, self.buffers[0] )
+        self.copy_data()
+    def unbind( self ):
+        """Unbind the buffer, fencing the current region and moving to the next"""
+        implementation = self.implementation
+        if self.ring and self.copied:
+            fence = self._fences[ self.region ]
+            if fence is not None:
+                implementation.glDeleteSync( fence )
+            self._fences[ self.region ] = implementation.glFenceSync(
+                implementation.GL_SYNC_GPU_COMMANDS_COMPLETE, 0
+            )
+            self.region = (self.region + 1) % self.regions
+        implementation.glBindBuffer( self.target, 0 )
+        _noteBuffer( self.target, 0 )
+    __enter__ = bind
+    def __exit__( self, exc_type=None, exc_val=None, exc_tb=None ):
+        """Context manager exit"""
+        self.unbind()
+        return False # do not supress exceptions...
+    def delete( self ):
+        """Delete the buffer and any pending fences explicitly"""
+        for region, fence in enumerate( self._fences ):
+            if fence is not None:
+                self._fences[ region ] = None
+                try:
+                    self.implementation.glDeleteSync( fence )
+                except (AttributeError,error.NullFunctionError) as err:
+                    pass
+        if self.buffers:
+            _forgetBuffers()
+        while self.buffers:
+            try:
+                self.implementation.glDeleteBuffers(1, self.buffers.pop(0))
+            except (AttributeError,error.NullFunctionError) as err:
+                pass
+
+class StreamingVBOHandler( FormatHandler ):
+    """Handles StreamingVBO instances passed in as array data
+
+    The pointer is the offset of the instance's current region
+    """
+    def dataPointer( self, instance ):
+        return instance.offset
+    def from_param( self, instance, typeCode=None ):
+        return ctypes.c_void_p( instance.offset )
+    def zeros( self, dims, typeCode ):
+        """Not implemented"""
+        raise NotImplementedError( """Don't have VBO output support yet""" )
+    ones = zeros
+    def asArray( self, value, typeCode=None ):
+        """Given a value, convert to array representation"""
+        return value
+    def arrayToGLType( self, value ):
+        """Given a value, guess OpenGL type of the corresponding pointer"""
+        return ArrayDatatype.arrayToGLType( value.data )
+    def arrayByteCount( self, value ):
+        return ArrayDatatype.arrayByteCount( value.data )
+    def arraySize( self, value, typeCode = None ):
+        """Given a data-value, calculate dimensions for the array"""
+        return ArrayDatatype.arraySize( value.data )
+    def unitSize( self, value, typeCode=None ):
+        """Determine unit size of an array (if possible)"""
+        return ArrayDatatype.unitSize( value.data )
+    def dimensions( self, value, typeCode=None ):
+        """Determine dimensions of the passed array value (if possible)"""
+        return ArrayDatatype.dimensions( value.data )
+
 _cleaners = {}
 def _cleaner( vbo ):
     """Construct a mapped-array cleaner function to unmap vbo.target"""
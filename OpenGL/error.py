@@ -57,7 +57,13 @@ class GLError( Error ):
         cArguments -- ctypes-level arguments to the operation,
             often raw integers for pointers and the like
         description -- OpenGL description of the error (textual)
+        recentCalls -- with deferred error checking, the (baseOperation,
+            arguments) of the calls made since the last clean check,
+            oldest first; the failing call is usually among them rather
+            than baseOperation itself.  Numeric arguments are kept as
+            they are, anything else only as its type and shape
     """
+    recentCalls = None
     def __init__( 
         self, 
         err=None, 
@@ -86,6 +92,7 @@ class GLError( Error ):
         'cArgs',
         'cArguments',
         'result', 
+        'recentCalls',
     )
     def __str__( self ):
         """Create a fully formatted representation of the error"""
@@ -145,6 +152,17 @@ class GLError( Error ):
             return r
         else:
             return r[:117] + '...'
+    def format_recentCalls( self, property, value ):
+        """Format recorded (baseOperation, arguments) pairs one call per line"""
+        if not value:
+            return None
+        return '%s = [\n\t\t%s\n\t]'%( property, ',\n\t\t'.join([
+            '%s(%s)'%(
+                getattr( baseOperation, '__name__', baseOperation ),
+                ', '.join([ str( argument ) for argument in arguments ]),
+            )
+            for baseOperation, arguments in value
+        ]))
     def format_baseOperation( self, property, value ):
         """Format a baseOperation reference for display"""
         if hasattr( value, '__name__' ):
@@ -163,7 +181,7 @@ class EGLError( GLError ):
 if _configflags.ERROR_CHECKING:
     from OpenGL import acceleratesupport
     _ErrorChecker = None
-    if acceleratesupport.ACCELERATE_AVAILABLE:
+    if acceleratesupport.ACCELERATE_AVAILABLE and _configflags.ERROR_CHECKING != 'deferred':
         try:
             from OpenGL_accelerate.errorchecker import _ErrorChecker
         except ImportError as err:
@@ -201,7 +219,7 @@ if _configflags.ERROR_CHECKING:
                 """Check for error, testing for context before operation"""
                 if self._isValid():
                     return self._getErrors()
-                return None 
+                return self._noErrorResult
             def nullGetError( self ):
                 """Used as error-checker when no error checking should be done"""
                 return self._noErrorResult
@@ -240,8 +258,118 @@ if _configflags.ERROR_CHECKING:
             def onEnd( self ):
                 """Called by glEnd to record the fact that glGetError will work"""
                 self._currentChecker = self._registeredChecker
+    _DeferredErrorChecker = None
+    if _configflags.ERROR_CHECKING == 'deferred':
+        import collections, ctypes, numbers
+        class _ArgumentSummary( object ):
+            """Type and shape of a recorded argument, keeping no reference to it"""
+            __slots__ = ('type','shape')
+            def __init__( self, argument ):
+                self.type = type( argument ).__name__
+                self.shape = getattr( argument, 'shape', None )
+            def __str__( self ):
+                if self.shape is None:
+                    return '<%s>'%( self.type, )
+                return '<%s %s>'%( self.type, 'x'.join([ str( size ) for size in self.shape ]) )
+            __repr__ = __str__
+        _NUMERIC_CODES = 'bBhHiIlLqQfdg?'
+        def _takesOnlyNumbers( baseOperation ):
+            """Whether every C argument of baseOperation is a plain number"""
+            argtypes = getattr( baseOperation, 'argtypes', None )
+            if argtypes is None:
+                return False
+            for argtype in argtypes:
+                if not (
+                    issubclass( argtype, ctypes._SimpleCData ) and
+                    argtype._type_ in _NUMERIC_CODES
+                ):
+                    return False
+            return True
+        def _summariseArguments( cArguments ):
+            """Arguments to record: numbers as they are, anything else as an _ArgumentSummary"""
+            return tuple([
+                argument if argument is None or isinstance( argument, numbers.Number )
+                else _ArgumentSummary( argument )
+                for argument in cArguments or ()
+            ])
+        class _DeferredErrorChecker( _ErrorChecker ):
+            """GL error-checking object which only calls glGetError at sync points
+
+            Used for the GL API when OpenGL.ERROR_CHECKING is 'deferred'.
+            Each call is merely recorded in a ring buffer of the last
+            ERROR_CHECKING_HISTORY calls; glGetError runs in checkpoint(),
+            which is called after glFinish and glutSwapBuffers, by
+            OpenGL.error.checkpoint() and every ERROR_CHECKING_INTERVAL
+            calls.  The GLError raised names the call which triggered the
+            check as baseOperation and carries the calls recorded since
+            the last clean check as recentCalls.  Only numbers and the
+            type and shape of the other arguments are recorded, so the
+            history never keeps arrays alive.
+            """
+            def __init__( self, platform, baseOperation=None, noErrorResult=0, errorClass=GLError ):
+                super( _DeferredErrorChecker, self ).__init__(
+                    platform, baseOperation, noErrorResult, errorClass,
+                )
+                self.interval = _configflags.ERROR_CHECKING_INTERVAL
+                self.recentCalls = collections.deque( maxlen=_configflags.ERROR_CHECKING_HISTORY )
+                self.pending = 0
+            def glCheckError(
+                self,
+                result,
+                baseOperation=None,
+                cArguments=None,
+                *args
+            ):
+                """Record the call, checking for errors once interval calls are pending"""
+                numeric = getattr( baseOperation, 'takesOnlyNumbers', None )
+                if numeric is None:
+                    numeric = _takesOnlyNumbers( baseOperation )
+                    try:
+                        baseOperation.takesOnlyNumbers = numeric
+                    except (AttributeError, TypeError):
+                        pass
+                if not numeric:
+                    cArguments = _summariseArguments( cArguments )
+                self.recentCalls.append( (baseOperation, cArguments) )
+                self.pending += 1
+                if self.pending >= self.interval:
+                    self.checkpoint( baseOperation, cArguments )
+                return result
+            def checkpoint( self, baseOperation=None, cArguments=None ):
+                """Raise a GLError if any error was flagged since the last checkpoint
+
+                Inside glBegin/glEnd glGetError is not allowed, the check then
+                happens on the first call after glEnd instead.  Every check
+                drops the recorded calls, so an error only lists the calls
+                made since the last clean check.
+                """
+                if self._currentChecker is self.nullGetError:
+                    return None
+                self.pending = 0
+                err = self._currentChecker()
+                if err != self._noErrorResult:
+                    error = self._errorClass(
+                        err,
+                        cArguments = cArguments,
+                        baseOperation = baseOperation,
+                    )
+                    error.recentCalls = list( self.recentCalls )
+                    self.recentCalls.clear()
+                    raise error
+                self.recentCalls.clear()
+                return None
 else:
-    _ErrorChecker = None
+    _ErrorChecker = _DeferredErrorChecker = None
+
+def checkpoint( ):
+    """Check for GL errors flagged since the last check
+
+    Only does anything when OpenGL.ERROR_CHECKING is 'deferred', otherwise
+    errors have already been raised by the calls producing them.
+    """
+    from OpenGL.raw.GL._errors import _error_checker
+    if _DeferredErrorChecker and isinstance( _error_checker, _DeferredErrorChecker ):
+        _error_checker.checkpoint( checkpoint )
 # Compatibility with PyOpenGL 2.x series
 GLUerror = GLUError
 GLerror = GLError 
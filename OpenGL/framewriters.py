@@ -0,0 +1,262 @@
+"""Binary image writers for captured frames
+
+Writes (height, width[, components]) uint8 (or uint16, either byte
+order) arrays, as OpenGL.GL.readback returns them, as binary PNM (P5/P6,
+PAM for images with alpha) or PNG files using whole-array numpy
+operations and zlib, no per-pixel Python.  glReadPixels' arrays hold the same rows but are shaped
+(width, height, components), reshape them to (height, width, -1) first.
+GL returns rows bottom to top, pass flip=True (or flip_rows() the array)
+to store them top to bottom as image formats expect.
+
+FrameWriter moves the encoding and writing to a background thread behind
+a bounded queue, so a capture loop only pays for copying each frame:
+
+    with framewriters.FrameWriter("frames/%05d.png") as writer:
+        for frame in range(count):
+            draw(frame)
+            writer.write(pool.read(0, 0, width, height))
+"""
+import os
+import queue
+import struct
+import threading
+import zlib
+
+import numpy
+
+__all__ = (
+    "flip_rows",
+    "write_pnm",
+    "write_pgm",
+    "write_ppm",
+    "write_pam",
+    "write_png",
+    "write_image",
+    "FrameWriter",
+)
+
+PAM_TUPLTYPES = {
+    1: "GRAYSCALE",
+    2: "GRAYSCALE_ALPHA",
+    3: "RGB",
+    4: "RGB_ALPHA",
+}
+PNG_COLOUR_TYPES = {
+    1: 0,  # greyscale
+    2: 4,  # greyscale with alpha
+    3: 2,  # truecolour
+    4: 6,  # truecolour with alpha
+}
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _as_image(image):
+    """View image as a (height, width, components) uint8/uint16 array"""
+    image = numpy.asarray(image)
+    if image.ndim == 2:
+        image = image[:, :, numpy.newaxis]
+    if image.ndim != 3 or image.shape[2] not in PAM_TUPLTYPES:
+        raise ValueError(
+            "Need a (height, width[, 1-4 components]) image, not shape %s"
+            % (image.shape,)
+        )
+    # any byte order, _pixels writes 16 bit samples big-endian either way
+    if image.dtype.kind != "u" or image.dtype.itemsize not in (1, 2):
+        raise ValueError("Need uint8 or uint16 pixels, not %s" % (image.dtype,))
+    return image
+
+
+def flip_rows(image):
+    """Reverse the order of image's rows in place, returns image
+
+    Swaps pairs of rows through a single row of scratch space, where
+    image[::-1] assignment would copy the whole image.
+    """
+    height = len(image)
+    scratch = numpy.empty_like(image[0])
+    for top in range(height // 2):
+        bottom = height - 1 - top
+        scratch[...] = image[top]
+        image[top] = image[bottom]
+        image[bottom] = scratch
+    return image
+
+
+def _pixels(image, flip):
+    """Big-endian, C-contiguous pixel data of image, flipped if requested"""
+    if flip:
+        image = image[::-1]
+    if image.dtype.itemsize > 1:
+        image = image.astype(">u2", copy=False)
+    return numpy.ascontiguousarray(image)
+
+
+def write_pnm(filename, image, flip=False, pam=False):
+    """Write image as binary PGM (P5), PPM (P6) or, with alpha (or pam), PAM (P7)"""
+    image = _as_image(image)
+    height, width, components = image.shape
+    maxval = 255 if image.dtype.itemsize == 1 else 65535
+    if components in (1, 3) and not pam:
+        magic = 5 if components == 1 else 6
+        header = "P%d\n%d %d\n%d\n" % (magic, width, height, maxval)
+    else:
+        header = "P7\nWIDTH %d\nHEIGHT %d\nDEPTH %d\nMAXVAL %d\nTUPLTYPE %s\nENDHDR\n" % (
+            width,
+            height,
+            components,
+            maxval,
+            PAM_TUPLTYPES[components],
+        )
+    with open(filename, "wb") as f:
+        f.write(header.encode("ascii"))
+        f.write(_pixels(image, flip))
+
+
+def write_pgm(filename, image, flip=False):
+    """Write a single channel image as a binary PGM (P5)"""
+    image = _as_image(image)
+    if image.shape[2] != 1:
+        raise ValueError(
+            "PGM holds one channel, not %d; use .ppm, .pam or .png" % (image.shape[2],)
+        )
+    write_pnm(filename, image, flip)
+
+
+def write_pam(filename, image, flip=False):
+    """Write image as a PAM (P7) of its own depth"""
+    write_pnm(filename, image, flip, pam=True)
+
+
+def write_ppm(filename, image, flip=False):
+    """Write the colour channels of image as a binary PPM (P6), dropping alpha"""
+    image = _as_image(image)
+    if image.shape[2] < 3:
+        image = image[:, :, :1].repeat(3, axis=2)
+    write_pnm(filename, image[:, :, :3], flip)
+
+
+def _chunk(kind, data):
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)))
+    )
+
+
+def write_png(filename, image, flip=False, level=1):
+    """Write image as an 8 or 16 bit PNG, zlib level `level` (1 is fast)
+
+    Rows are stored unfiltered: filtering per row would cost more than
+    the better compression saves when capturing frames.
+    """
+    image = _as_image(image)
+    height, width, components = image.shape
+    pixels = _pixels(image, flip).reshape(height, -1).view(numpy.uint8)
+    rows = numpy.zeros((height, pixels.shape[1] + 1), dtype=numpy.uint8)
+    rows[:, 1:] = pixels  # each row starts with filter type 0
+    header = struct.pack(
+        ">IIBBBBB",
+        width,
+        height,
+        image.dtype.itemsize * 8,
+        PNG_COLOUR_TYPES[components],
+        0,
+        0,
+        0,
+    )
+    with open(filename, "wb") as f:
+        f.write(PNG_SIGNATURE)
+        f.write(_chunk(b"IHDR", header))
+        f.write(_chunk(b"IDAT", zlib.compress(rows, level)))
+        f.write(_chunk(b"IEND", b""))
+
+
+WRITERS = {
+    ".png": write_png,
+    ".pnm": write_pnm,
+    ".pam": write_pam,
+    ".pgm": write_pgm,
+    ".ppm": write_ppm,
+}
+
+
+def write_image(filename, image, flip=False):
+    """Write image in the format filename's extension names"""
+    writer_for(filename)(filename, image, flip)
+
+
+def writer_for(filename):
+    """The write_* function for filename's extension"""
+    extension = os.path.splitext(filename)[1].lower()
+    try:
+        return WRITERS[extension]
+    except KeyError:
+        raise ValueError(
+            "Unknown image extension %r, use one of %s"
+            % (extension, ", ".join(sorted(WRITERS)))
+        )
+
+
+class FrameWriter(object):
+    """Write frames to numbered files from a background thread
+
+    pattern -- filename %-format taking the frame number, its extension
+        picks the format (see write_image)
+    flip -- reverse the row order (for images straight from the GL)
+    maxsize -- frames waiting to be written at most, write() blocks when
+        this many are queued so a slow disk holds the capture loop back
+        rather than letting frames pile up in memory
+
+    write() copies the frame (so arrays from a ReadbackPool can be reused
+    right away) and returns, close() waits for every frame to be written
+    and re-raises the first error the writer thread ran into.
+    """
+
+    def __init__(self, pattern, flip=True, maxsize=8):
+        writer_for(pattern)
+        self.pattern = pattern
+        self.flip = flip
+        self.queue = queue.Queue(maxsize)
+        self.count = 0
+        self.error = None
+        self.thread = threading.Thread(target=self.run, name="FrameWriter", daemon=True)
+        self.thread.start()
+
+    def write(self, image, filename=None):
+        """Queue a copy of image for writing to filename (default the next number)"""
+        if self.error is not None:
+            raise self.error
+        if filename is None:
+            filename = self.pattern % (self.count,)
+        self.count += 1
+        self.queue.put((filename, numpy.array(image)))
+        return filename
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                if self.error is None:
+                    write_image(item[0], item[1], self.flip)
+            except Exception as err:
+                self.error = err
+            finally:
+                self.queue.task_done()
+
+    def close(self):
+        """Write every queued frame and stop the thread"""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type=None, exc_val=None, exc_tb=None):
+        self.close()
+        return False
@@ -33,6 +33,11 @@ Attributes of Note:
     RANK_PACKINGS -- commands required to set up default array-transfer 
         operations for an array of the specified rank.
 
+The byte-order pixel-store values PyOpenGL sets for transfers are
+remembered per context (see packState) and only re-issued when they
+change.  The layout values (PACK_LAYOUT_STORES), which decide how many
+bytes a read writes, are set before every transfer.
+
 New image formats and types will need to be registered here to be supported,
 this means that extension modules which add image types/formats need to alter 
 the tables described above!
@@ -41,11 +46,26 @@ the tables described above!
 
 """
 from OpenGL.raw.GL.VERSION import GL_1_1 as _simple
+from OpenGL.raw.GL.VERSION import GL_1_2 as _simple_1_2
 from OpenGL import arrays
 from OpenGL import error
 from OpenGL import _configflags
+from OpenGL import contextdata
 import ctypes
 
+PACK_STATE = 'OpenGL.images.PACK_STATE'
+# pixel-store values deciding the size of the data a pack writes; these
+# are never trusted from PACK_STATE, code we cannot see (raw or C calls,
+# other libraries) may change them between reads
+PACK_LAYOUT_STORES = frozenset([
+    _simple.GL_PACK_ALIGNMENT,
+    _simple.GL_PACK_ROW_LENGTH,
+    _simple.GL_PACK_SKIP_ROWS,
+    _simple.GL_PACK_SKIP_PIXELS,
+    _simple_1_2.GL_PACK_SKIP_IMAGES,
+    _simple_1_2.GL_PACK_IMAGE_HEIGHT,
+])
+
 def SetupPixelRead( format, dims, type):
     """Setup transfer mode for a read into a numpy array return the array
     
@@ -67,9 +87,10 @@ def setupDefaultTransferMode( ):
     seldom matters in image data).  These assumptions are normally correct 
     when dealing with Python libraries which expose byte-arrays.
     """
+    state = packState()
     try:
-        _simple.glPixelStorei(_simple.GL_PACK_SWAP_BYTES, 0)
-        _simple.glPixelStorei(_simple.GL_PACK_LSB_FIRST, 0)
+        setPixelStore( state, _simple.glPixelStorei, _simple.GL_PACK_SWAP_BYTES, 0 )
+        setPixelStore( state, _simple.glPixelStorei, _simple.GL_PACK_LSB_FIRST, 0 )
     except error.GLError:
         # GLES doesn't support pixel storage swapping...
         pass
@@ -79,12 +100,56 @@ def rankPacking( rank ):
     
     Uses RANK_PACKINGS table to issue calls to glPixelStorei
     """
+    state = packState()
     for func,which,arg in RANK_PACKINGS[rank]:
         try:
-            func(which,arg)
+            setPixelStore( state, func, which, arg )
         except error.GLError:
             pass
 
+def packState( ):
+    """Get the pixel-store values PyOpenGL has set in the current context
+
+    Returns a dictionary of pname: value, stored as context data (so
+    contextdata.cleanupContext discards it), or None without a current
+    context, in which case nothing is cached.  OpenGL.GL's glPixelStore*
+    and glPopClientAttrib forget the values they change, changes through
+    the raw functions (or other libraries sharing the context) have to be
+    reported with forgetPixelStore.  Values in PACK_LAYOUT_STORES are not
+    cached at all.
+    """
+    try:
+        state = contextdata.getValue( PACK_STATE )
+        if state is None:
+            state = {}
+            contextdata.setValue( PACK_STATE, state )
+    except error.Error:
+        return None
+    return state
+
+def setPixelStore( state, func, which, arg ):
+    """Call func(which,arg) unless state records it as already done
+
+    Layout values (PACK_LAYOUT_STORES) are always set, a stale cached
+    alignment or row length would have the GL write more than the target
+    array holds.
+    """
+    if state is None or which in PACK_LAYOUT_STORES:
+        func( which, arg )
+    elif state.get( which ) != arg:
+        # recorded even if the GL rejects it, so GLES only fails once
+        state[ which ] = arg
+        func( which, arg )
+
+def forgetPixelStore( which=None ):
+    """Forget the cached value of pixel-store parameter which (default all)"""
+    state = packState()
+    if state:
+        if which is None:
+            state.clear()
+        else:
+            state.pop( which, None )
+
 def createTargetArray( format, dims, type ):
     """Create storage array for given parameters
     
@@ -3,7 +3,7 @@
 import ctypes
 from OpenGL.platform import ctypesloader
 from OpenGL._bytes import as_8_bit
-import sys, logging
+import sys, logging, threading
 from OpenGL import _configflags
 from OpenGL import logs, MODULE_ANNOTATIONS
 log = logging.getLogger(__name__)
@@ -17,11 +17,12 @@ class lazy_property( object ):
         return value 
 
 class _CheckContext( object ):
+    LOCAL_ATTRIBUTES = ('func','ccisvalid')
     def __init__( self, func, ccisvalid ):
         self.func = func 
         self.ccisvalid = ccisvalid
     def __setattr__( self, key, value ):
-        if key not in ('func','ccisvalid'):
+        if key not in self.LOCAL_ATTRIBUTES:
             return setattr( self.func, key, value )
         else:
             self.__dict__[key] = value 
@@ -40,6 +41,51 @@ class _CheckContext( object ):
             raise error.NoContext( self.func.__name__, args, named )
         return self.func( *args, **named )
 
+class _ContextChange( _CheckContext ):
+    """Function which may change the current context, tracker forgets it after the call"""
+    LOCAL_ATTRIBUTES = ('func','tracker')
+    def __init__( self, func, tracker ):
+        self.func = func
+        self.tracker = tracker
+    def __call__( self, *args, **named ):
+        try:
+            return self.func( *args, **named )
+        finally:
+            self.tracker.invalidate()
+
+class ContextTracker( object ):
+    """Per-thread cache of the current context
+    
+    Used as CurrentContextIsValid when CONTEXT_CHECKING is 'tracked'.
+    Calling the tracker returns the context current in the calling thread,
+    asking the platform only when none is cached.  The platform's
+    CONTEXT_CHANGING_FUNCTIONS (make-current, destroy and GLUT window
+    switches) invalidate the cache, as does platform.contextChanged(),
+    which code making contexts current outside of PyOpenGL (e.g. a GUI
+    toolkit) has to call.  "No context" is never cached.
+    """
+    def __init__( self, getCurrentContext ):
+        self.getCurrentContext = getCurrentContext
+        self.local = threading.local()
+    def __call__( self ):
+        context = getattr( self.local, 'context', None )
+        if context is None:
+            context = self.getCurrentContext()
+            if context:
+                self.local.context = context
+        return context
+    def invalidate( self ):
+        """Forget the calling thread's current context"""
+        self.local.context = None
+
+# GLUT switches contexts when windows are created, destroyed or set
+GLUT_CONTEXT_CHANGING_FUNCTIONS = (
+    'glutCreateWindow',
+    'glutCreateSubWindow',
+    'glutDestroyWindow',
+    'glutSetWindow',
+)
+
 def _find_module( exclude = (__name__,)):
     frame = sys._getframe()
     while frame and '__name__' in frame.f_globals:
@@ -73,11 +119,17 @@ class BasePlatform( object ):
         EXTENSIONS_USE_BASE_FUNCTIONS -- if True, uses regular
             dll attribute-based lookup to retrieve extension 
             function pointers.
+        
+        CONTEXT_CHANGING_FUNCTIONS -- names of the functions which 
+            may change the current context, or None if the platform 
+            can't track its context (CONTEXT_CHECKING='tracked' then 
+            queries the context on every check)
     """
     
     EXPORTED_NAMES = [
         'GetCurrentContext',
         'CurrentContextIsValid',
+        'contextChanged',
         'createBaseFunction', 
         'createExtensionFunction', 
         'copyBaseFunction',
@@ -90,6 +142,7 @@ class BasePlatform( object ):
     DEFAULT_FUNCTION_TYPE = None
     GLUT_GUARD_CALLBACKS = False
     EXTENSIONS_USE_BASE_FUNCTIONS = False
+    CONTEXT_CHANGING_FUNCTIONS = None
     
     def install( self, namespace ):
         """Install this platform instance into the platform module"""
@@ -123,9 +176,20 @@ class BasePlatform( object ):
         ) and not func.__name__.startswith( 'glX' ):
             return _CheckContext( func, self.CurrentContextIsValid )
         return func 
+    def wrapContextChange( self, func ):
+        """Wrap function to invalidate the context tracker if it may change the context"""
+        if self.contextTracker and func.__name__ in self.CONTEXT_CHANGING_FUNCTIONS:
+            return _ContextChange( func, self.contextTracker )
+        return func
     def wrapLogging( self, func ):
         """Wrap function with logging operations if appropriate"""
         return logs.logOnFail( func, logs.getLog( 'OpenGL.errors' ))
+    def wrapProfiling( self, func ):
+        """Wrap function with call-count/timing recording if appropriate"""
+        if _configflags.PROFILING:
+            from OpenGL import profiling
+            return profiling.profileFunction( func )
+        return func
     
     def finalArgType( self, typ ):
         """Retrieve a final type for arg-type"""
@@ -181,10 +245,14 @@ class BasePlatform( object ):
         func.DLL = dll
         func.extension = extension
         func.deprecated = deprecated
-        func = self.wrapLogging( 
-            self.wrapContextCheck(
-                self.errorChecking( func, dll, error_checker=error_checker ),
-                dll,
+        func = self.wrapContextChange(
+            self.wrapLogging( 
+                self.wrapContextCheck(
+                    self.wrapProfiling(
+                        self.errorChecking( func, dll, error_checker=error_checker ),
+                    ),
+                    dll,
+                )
             )
         )
         if MODULE_ANNOTATIONS:
@@ -350,10 +418,23 @@ class BasePlatform( object ):
         raise NotImplementedError( 
             """Platform does not define a GLUT font retrieval function""" 
         )
+    @lazy_property
+    def contextTracker( self ):
+        """ContextTracker if CONTEXT_CHECKING is 'tracked' and the platform supports it"""
+        if (
+            _configflags.CONTEXT_CHECKING == 'tracked' and 
+            self.CONTEXT_CHANGING_FUNCTIONS is not None
+        ):
+            return ContextTracker( self.GetCurrentContext )
+        return None
+    def contextChanged( self ):
+        """Tell the context tracker the current context was changed outside of PyOpenGL"""
+        if self.contextTracker:
+            self.contextTracker.invalidate()
     # names that are normally just references to other items...
     @lazy_property
     def CurrentContextIsValid( self ):
-        return self.GetCurrentContext
+        return self.contextTracker or self.GetCurrentContext
     @lazy_property
     def OpenGL(self): return self.GL
 
@@ -376,6 +457,10 @@ class _NullFunctionPointer( object ):
         self.deprecated = deprecated
         self.error_checker = error_checker
         self.force_extension = force_extension
+        if _configflags.PROFILING:
+            # the resolved function records calls under the same name
+            from OpenGL import profiling
+            self.profile = profiling.profile( name )
     resolved = False
     def __nonzero__( self ):
         """Make this object appear to be NULL"""
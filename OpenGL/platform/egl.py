@@ -101,6 +101,11 @@ class EGLPlatform( baseplatform.BasePlatform ):
             return None
 
     DEFAULT_FUNCTION_TYPE = staticmethod( ctypes.CFUNCTYPE )
+    CONTEXT_CHANGING_FUNCTIONS = baseplatform.GLUT_CONTEXT_CHANGING_FUNCTIONS + (
+        'eglMakeCurrent',
+        'eglDestroyContext',
+        'eglReleaseThread',
+    )
     @baseplatform.lazy_property
     def GetCurrentContext( self ):
         return self.EGL.eglGetCurrentContext
@@ -92,6 +92,12 @@ class GLXPlatform(baseplatform.BasePlatform):
             return None
 
     DEFAULT_FUNCTION_TYPE = staticmethod(ctypes.CFUNCTYPE)
+    CONTEXT_CHANGING_FUNCTIONS = baseplatform.GLUT_CONTEXT_CHANGING_FUNCTIONS + (
+        "glXMakeCurrent",
+        "glXMakeContextCurrent",
+        "glXMakeCurrentReadSGI",
+        "glXDestroyContext",
+    )
 
     # This loads the GLX functions from the GL .so, not sure if that's
     # really kosher...
@@ -60,14 +60,16 @@ class OSMesaPlatform( baseplatform.BasePlatform ):
     def OSMesa( self ): return self.GL
         
     DEFAULT_FUNCTION_TYPE = staticmethod( ctypes.CFUNCTYPE )
+    CONTEXT_CHANGING_FUNCTIONS = baseplatform.GLUT_CONTEXT_CHANGING_FUNCTIONS + (
+        'OSMesaMakeCurrent',
+        'OSMesaDestroyContext',
+    )
 
     @baseplatform.lazy_property
     def GetCurrentContext( self ):
         function = self.OSMesa.OSMesaGetCurrentContext
         function.restype = _types.OSMesaContext
         return function
-    @baseplatform.lazy_property
-    def CurrentContextIsValid( self ): return self.GetCurrentContext
     
     @baseplatform.lazy_property
     def getExtensionProcedure( self ):
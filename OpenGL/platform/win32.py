@@ -63,6 +63,11 @@ class Win32Platform( baseplatform.BasePlatform ):
         return None
 
     DEFAULT_FUNCTION_TYPE = staticmethod( ctypes.WINFUNCTYPE )
+    CONTEXT_CHANGING_FUNCTIONS = baseplatform.GLUT_CONTEXT_CHANGING_FUNCTIONS + (
+        'wglMakeCurrent',
+        'wglMakeContextCurrentARB',
+        'wglDeleteContext',
+    )
     # Win32 GLUT uses different types for callbacks and functions...
     GLUT_CALLBACK_TYPE = staticmethod( ctypes.CFUNCTYPE )
     GDI32 = ctypes.windll.gdi32
@@ -0,0 +1,185 @@
+"""Per-entry-point call counts and timings (PYOPENGL_PROFILING)
+
+When OpenGL.PROFILING is True before the first OpenGL.* entry point is
+loaded, every ctypes function created by the platform records how often it
+is called and how long the ctypes call and its errcheck take, and every
+Wrapper records the time spent in each stage of its conversion pipeline:
+
+    pyConverters -- Python argument conversion
+    cConverters -- calculation of C-level arguments
+    cResolvers -- conversion of C-level arguments to ctypes values
+    call -- the ctypes call itself (excluding errcheck)
+    errcheck -- glGetError checking after the call
+    storeValues -- storage of persistent argument values
+    returnValues -- calculation of the Python return value
+
+Usage:
+
+    import OpenGL
+    OpenGL.PROFILING = True
+    from OpenGL.GL import *
+    from OpenGL import profiling
+    ...
+    print( profiling.table( limit=20 ) )
+    profiling.writeStacks( 'frame.stacks' ) # for flamegraph.pl et al
+
+Profiling adds noticeable overhead to every call, the absolute numbers
+are only useful for comparing entry points against each other.
+"""
+import time
+timer = time.perf_counter
+
+STAGES = (
+    'pyConverters',
+    'cConverters',
+    'cResolvers',
+    'call',
+    'errcheck',
+    'storeValues',
+    'returnValues',
+)
+
+class FunctionProfile( object ):
+    """Accumulated calls and per-stage seconds for a single entry point"""
+    __slots__ = ('name','calls') + STAGES
+    def __init__( self, name ):
+        self.name = name
+        self.reset()
+    def reset( self ):
+        self.calls = 0
+        for stage in STAGES:
+            setattr( self, stage, 0.0 )
+    @property
+    def total( self ):
+        """Total seconds recorded across all stages"""
+        return sum( [getattr( self, stage ) for stage in STAGES] )
+    def __repr__( self ):
+        return '<%s %s calls=%s total=%.6fs>'%(
+            self.__class__.__name__, self.name, self.calls, self.total,
+        )
+
+_PROFILES = {}
+
+def profile( name ):
+    """Retrieve (creating if necessary) the FunctionProfile for name"""
+    record = _PROFILES.get( name )
+    if record is None:
+        record = _PROFILES[name] = FunctionProfile( name )
+    return record
+
+def profiles( ):
+    """Return the FunctionProfiles of all entry points which have been called"""
+    return [record for record in _PROFILES.values() if record.calls]
+
+def reset( ):
+    """Zero all recorded counts and timings"""
+    for record in _PROFILES.values():
+        record.reset()
+
+class ProfiledFunction( object ):
+    """Proxy recording call counts and ctypes-call time for a base function"""
+    def __init__( self, base, record ):
+        self.__dict__[''] = base
+        self.__dict__['profile'] = record
+    def __setattr__( self, key, value ):
+        if key != '':
+            setattr( self.__dict__[''], key, value )
+        else:
+            self.__dict__[''] = value
+    def __getattr__( self, key ):
+        if key == '':
+            return self.__dict__['']
+        else:
+            return getattr( self.__dict__[''], key )
+    def __bool__( self ):
+        return bool( self.__dict__[''] )
+    __nonzero__ = __bool__
+    def __repr__( self ):
+        return repr( self.__dict__[''] )
+    def __call__( self, *args, **named ):
+        record = self.__dict__['profile']
+        checked = record.errcheck
+        start = timer()
+        try:
+            return self.__dict__['']( *args, **named )
+        finally:
+            # errcheck runs inside the ctypes call, but is recorded separately
+            record.call += timer() - start - (record.errcheck - checked)
+            record.calls += 1
+
+def timedErrcheck( errcheck, record ):
+    """Produce an errcheck function which records its time in record"""
+    def profiledErrcheck( result, baseOperation=None, cArguments=None, *args ):
+        start = timer()
+        try:
+            return errcheck( result, baseOperation, cArguments, *args )
+        finally:
+            record.errcheck += timer() - start
+    profiledErrcheck.original = errcheck
+    return profiledErrcheck
+
+def profileFunction( func ):
+    """Wrap a base ctypes function (and its errcheck) with profiling"""
+    record = profile( func.__name__ )
+    errcheck = getattr( func, 'errcheck', None )
+    if errcheck is not None:
+        func.errcheck = timedErrcheck( errcheck, record )
+    return ProfiledFunction( func, record )
+
+def report( sort='total', limit=None ):
+    """Return FunctionProfiles sorted by sort (descending), at most limit
+
+    sort -- 'total', 'calls', 'perCall', 'name' or one of STAGES
+    """
+    records = profiles()
+    if sort == 'name':
+        records.sort( key=lambda record: record.name )
+    elif sort == 'perCall':
+        records.sort( key=lambda record: record.total/record.calls, reverse=True )
+    else:
+        records.sort( key=lambda record: getattr( record, sort ), reverse=True )
+    if limit is not None:
+        records = records[:limit]
+    return records
+
+def table( sort='total', limit=None ):
+    """Format report() as a plain-text table, times in milliseconds"""
+    headings = ('function','calls','total','us/call') + STAGES
+    rows = []
+    for record in report( sort, limit ):
+        rows.append(
+            (record.name, '%d'%(record.calls,), '%.3f'%(record.total*1000,),
+            '%.2f'%(record.total*1e6/record.calls,))
+            + tuple(['%.3f'%(getattr( record, stage )*1000,) for stage in STAGES])
+        )
+    widths = [
+        max([len(heading)] + [len(row[i]) for row in rows])
+        for i,heading in enumerate( headings )
+    ]
+    lines = []
+    for row in [headings] + rows:
+        lines.append( '  '.join([
+            (value.ljust if i == 0 else value.rjust)( widths[i] )
+            for i,value in enumerate( row )
+        ]).rstrip())
+    return '\n'.join( lines )
+
+def stacks( root='OpenGL' ):
+    """Produce collapsed-stack lines ("root;function;stage microseconds")
+
+    This is the input format of flamegraph.pl, speedscope and inferno,
+    so the per-stage cost of each entry point can be viewed as a flame graph.
+    """
+    lines = []
+    for record in report( 'name' ):
+        for stage in STAGES:
+            value = int( round( getattr( record, stage ) * 1e6 ) )
+            if value:
+                lines.append( '%s;%s;%s %d'%( root, record.name, stage, value ))
+    return lines
+
+def writeStacks( filename, root='OpenGL' ):
+    """Write stacks() to filename, one stack per line"""
+    with open( filename, 'w' ) as output:
+        for line in stacks( root ):
+            output.write( line + '\n' )
@@ -1,6 +1,8 @@
 from OpenGL.platform import PLATFORM as _p
-from OpenGL.error import _ErrorChecker
-if _ErrorChecker:
+from OpenGL.error import _ErrorChecker, _DeferredErrorChecker
+if _DeferredErrorChecker:
+    _error_checker = _DeferredErrorChecker( _p, _p.GL.glGetError )
+elif _ErrorChecker:
     _error_checker = _ErrorChecker( _p, _p.GL.glGetError )
 else:
     _error_checker = None
@@ -0,0 +1,132 @@
+"""Per-call cost of PyOpenGL calls taking array arguments
+
+Times the array-passing calls the course code (and its text and road
+caches) makes against an offscreen context, so changes to the array
+handlers in OpenGL/arrays can be compared before and after:
+
+    PYOPENGL_PLATFORM=osmesa python array_benchmark.py
+    PYOPENGL_PLATFORM=egl python array_benchmark.py --number 2000 --repeat 100
+
+Each case is run --repeat times --number calls in a row and the best run
+is reported, which keeps the numbers stable on a busy machine.
+
+With --lists no context is needed: converting lists of (x, y, z) vertices
+of growing size to ctypes arrays, as the lists handler does for every
+list passed to GL, is timed against the old item-by-item recursive
+conversion:
+
+    python array_benchmark.py --lists
+
+With --vbo frames of per-frame updates to single rows of a 10000 vertex
+buffer (bullets and particles moving) are timed through VBO.__setitem__,
+which sends every update as its own glBufferSubData, and through
+StreamingVBO, both as a fenced ring of three regions and orphaning a
+single buffer:
+
+    PYOPENGL_PLATFORM=egl python array_benchmark.py --vbo
+"""
+import argparse
+import timeit
+
+import numpy
+
+import replay
+
+
+def cases():
+    from OpenGL.GL import (
+        GL_ARRAY_BUFFER, GL_FLOAT, GL_STREAM_DRAW,
+        glBindBuffer, glBufferData, glBufferSubData, glGenBuffers,
+        glVertexPointer, glVertexPointerf,
+    )
+    vertices = numpy.zeros((100, 3), dtype=numpy.float32)
+    vertex_list = vertices[:4].tolist()
+    data = bytes(vertices)
+    glBindBuffer(GL_ARRAY_BUFFER, glGenBuffers(1))
+    glBufferData(GL_ARRAY_BUFFER, data, GL_STREAM_DRAW)
+    return [
+        ('glVertexPointer(ndarray)', lambda: glVertexPointer(3, GL_FLOAT, 0, vertices)),
+        ('glVertexPointerf(ndarray)', lambda: glVertexPointerf(vertices)),
+        ('glVertexPointerf(list)', lambda: glVertexPointerf(vertex_list)),
+        ('glBufferData(ndarray)', lambda: glBufferData(GL_ARRAY_BUFFER, vertices, GL_STREAM_DRAW)),
+        ('glBufferData(bytes)', lambda: glBufferData(GL_ARRAY_BUFFER, data, GL_STREAM_DRAW)),
+        ('glBufferSubData(bytes)', lambda: glBufferSubData(GL_ARRAY_BUFFER, 0, data)),
+    ]
+
+
+def list_conversion(sizes):
+    from OpenGL.arrays.lists import ListHandler
+    from OpenGL.raw.GL._types import GL_FLOAT
+    print(f"{'vertices':>9} {'one-pass ms':>12} {'recursive ms':>13} {'speedup':>8}")
+    for size in sizes:
+        vertices = [[i, i + 0.5, -i] for i in range(size)]
+        number = max(1, 10000 // size)
+        times = [
+            min(timeit.repeat(lambda: convert(vertices, GL_FLOAT), number=number, repeat=3)) / number
+            for convert in (ListHandler.asArray, ListHandler.asArrayRecursive)
+        ]
+        print(f"{size:9d} {times[0] * 1e3:12.3f} {times[1] * 1e3:13.3f} {times[1] / times[0]:7.1f}x")
+
+
+def vbo_updates(updates, frames=20, rows=10000):
+    """Milliseconds per frame of `updates` single-row writes, then a draw"""
+    from OpenGL.GL import GL_FLOAT, GL_POINTS, GL_VERTEX_ARRAY, glDrawArrays, glEnableClientState, glFinish, glVertexPointer
+    from OpenGL.arrays import vbo
+    glEnableClientState(GL_VERTEX_ARRAY)
+    random = numpy.random.default_rng(1)
+    results = []
+    for make in (
+        lambda data: vbo.VBO(data),
+        lambda data: vbo.StreamingVBO(data),
+        lambda data: vbo.StreamingVBO(data, regions=1),
+    ):
+        buffer = make(numpy.zeros((rows, 3), dtype=numpy.float32))
+        indices = random.integers(0, rows, size=(frames, updates))
+        position = numpy.ones(3, dtype=numpy.float32)
+
+        def frame(frame_indices):
+            for index in frame_indices.tolist():
+                buffer[index:index + 1] = position
+            buffer.bind()
+            glVertexPointer(3, GL_FLOAT, 0, buffer)
+            glDrawArrays(GL_POINTS, 0, rows)
+            buffer.unbind()
+
+        frame(indices[0])
+        glFinish()
+        start = timeit.default_timer()
+        for frame_indices in indices:
+            frame(frame_indices)
+        glFinish()
+        results.append((timeit.default_timer() - start) / frames * 1e3)
+        buffer.delete()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=40)
+    parser.add_argument('--lists', action='store_true')
+    parser.add_argument('--vbo', action='store_true')
+    args = parser.parse_args()
+
+    if args.lists:
+        list_conversion([10, 100, 1000, 10000, 100000, 1000000])
+        return
+
+    context = replay.HeadlessContext(64, 64)  # keep the OSMesa buffer alive
+    if args.vbo:
+        print(f"{'updates':>8} {'VBO ms':>8} {'ring ms':>8} {'orphan ms':>10}")
+        for updates in (10, 100, 1000, 5000):
+            best = [min(times) for times in zip(*(vbo_updates(updates) for _ in range(5)))]
+            print(f"{updates:8d} {best[0]:8.2f} {best[1]:8.2f} {best[2]:10.2f}")
+        return
+    print(f"{'us/call':>8}  call")
+    for name, call in cases():
+        best = min(timeit.repeat(call, number=args.number, repeat=args.repeat))
+        print(f"{best / args.number * 1e6:8.2f}  {name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""Cached GLUT bitmap font text for the course games
+
+Drawing a string with a glutBitmapCharacter loop costs one wrapped GLUT call
+(and a glBitmap inside it) per glyph, every frame, even when the text has not
+changed.  BitmapText instead renders every printable glyph of a font once
+into a texture atlas (through a framebuffer object, so nothing on screen is
+touched), and compiles each (font, text) pair into a display list drawing
+one textured quad per glyph with a single glDrawArrays.  A string that was
+drawn before then costs four calls (push, translate, call list, pop) no
+matter how long it is.
+
+Strings such as scores change constantly, so the string lists are kept in a
+least-recently-used cache of limited size and deleted when evicted.
+
+The quads are drawn in object coordinates, so text lines up with what
+glRasterPos2f would give only under a pixel-aligned projection such as the
+gluOrtho2D(0, width, 0, height) both games use.  Colour comes from the
+current glColor, exactly as the raster colour did.  Without framebuffer
+objects (GL < 3.0) text falls back to the per-glyph loop.
+
+Display lists and textures belong to the context they were created in:
+create the renderer after the window (or offscreen context) exists.
+"""
+from collections import OrderedDict
+
+import numpy
+from OpenGL.GL import (
+    GL_ALPHA, GL_ALPHA_TEST, GL_BLEND, GL_CLIENT_VERTEX_ARRAY_BIT,
+    GL_COLOR_ATTACHMENT0, GL_COLOR_BUFFER_BIT, GL_COMPILE, GL_CURRENT_BIT,
+    GL_CURRENT_RASTER_POSITION, GL_ENABLE_BIT, GL_FLOAT, GL_FRAMEBUFFER, GL_FRAMEBUFFER_BINDING,
+    GL_FRAMEBUFFER_COMPLETE, GL_GREATER, GL_MODULATE, GL_NEAREST, GL_QUADS,
+    GL_RGBA, GL_RGBA8, GL_SCISSOR_TEST, GL_TEXTURE_2D, GL_TEXTURE_BIT,
+    GL_TEXTURE_COORD_ARRAY, GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE,
+    GL_TEXTURE_MAG_FILTER, GL_TEXTURE_MIN_FILTER, GL_UNSIGNED_BYTE,
+    GL_VERTEX_ARRAY, GL_VIEWPORT_BIT,
+    glAlphaFunc, glBindFramebuffer, glBindTexture, glCallList,
+    glCheckFramebufferStatus, glClear, glClearColor, glColor4f,
+    glDeleteFramebuffers, glDeleteLists, glDeleteTextures, glDisable,
+    glDrawArrays, glEnable, glEnableClientState, glEndList,
+    glFramebufferTexture2D, glGenFramebuffers, glGenLists, glGenTextures,
+    glGetFloatv, glGetIntegerv, glNewList, glPopAttrib, glPopClientAttrib,
+    glPopMatrix, glPushAttrib, glPushClientAttrib, glPushMatrix,
+    glRasterPos2f, glReadPixels, glTexCoordPointer, glTexEnvi, glTexImage2D,
+    glTexParameteri, glTranslatef, glVertexPointer, glViewport, glWindowPos2i,
+)
+from OpenGL.GL import statecache
+from OpenGL.GLUT import glutBitmapCharacter
+
+FIRST_GLYPH = 32
+LAST_GLYPH = 126
+# Every glyph gets a CELL x CELL square of the atlas with its origin at
+# ORIGIN inside it, leaving room for descenders and overhangs
+CELL = 32
+ORIGIN = (4, 8)
+COLUMNS = 16
+ATLAS_WIDTH = COLUMNS * CELL
+ATLAS_HEIGHT = 256
+
+
+def font_key(font):
+    """Hashable identity of a GLUT font (a c_void_p on GLX, an int on Windows)"""
+    return getattr(font, 'value', font)
+
+
+def _ink_quads(alpha):
+    """Return (quad corners relative to each glyph's origin, atlas texcoords) per glyph
+
+    The quads are trimmed to the pixels a glyph actually covers in the atlas,
+    so no fragments are spent on the empty parts of its cell; glyphs without
+    any pixels (the space) get a degenerate quad.
+    """
+    count = LAST_GLYPH - FIRST_GLYPH + 1
+    rows = -(-count // COLUMNS)
+    cells = alpha[:rows * CELL].reshape(rows, CELL, COLUMNS, CELL).transpose(0, 2, 1, 3)
+    cells = cells.reshape(rows * COLUMNS, CELL, CELL)[:count] > 0
+    columns, lines = cells.any(axis=1), cells.any(axis=2)
+    left = columns.argmax(axis=1)
+    right = CELL - columns[:, ::-1].argmax(axis=1)
+    bottom = lines.argmax(axis=1)
+    top = CELL - lines[:, ::-1].argmax(axis=1)
+    empty = ~columns.any(axis=1)
+    right[empty], top[empty] = left[empty], bottom[empty]
+
+    corners = numpy.stack([
+        numpy.column_stack(corner) for corner in
+        ((left, bottom), (right, bottom), (right, top), (left, top))
+    ], axis=1).astype(numpy.float32)
+    index = numpy.arange(count)
+    cell_origins = numpy.column_stack((index % COLUMNS, index // COLUMNS)) * CELL
+    texcoords = (cell_origins[:, None, :] + corners) / (ATLAS_WIDTH, ATLAS_HEIGHT)
+    return corners - ORIGIN, texcoords.astype(numpy.float32)
+
+
+class BitmapText:
+    def __init__(self, bitmap_character=glutBitmapCharacter, max_strings=256, cached=True):
+        self.bitmap_character = bitmap_character
+        self.max_strings = max_strings
+        self.cached = cached
+        self.atlases = {}
+        self.strings = OrderedDict()
+
+    def glyphs(self, font):
+        """(texture, advances by character code, glyph quads, texcoords) or None without FBOs"""
+        key = font_key(font)
+        if key not in self.atlases:
+            self.atlases[key] = self.build_atlas(font) if bool(glGenFramebuffers) else None
+        return self.atlases[key]
+
+    def build_atlas(self, font):
+        """Render font's printable glyphs into a texture, measuring their advances"""
+        previous = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        glPushAttrib(GL_CURRENT_BIT | GL_ENABLE_BIT | GL_VIEWPORT_BIT
+                     | GL_COLOR_BUFFER_BIT | GL_TEXTURE_BIT)
+        texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, ATLAS_WIDTH, ATLAS_HEIGHT, 0,
+                     GL_RGBA, GL_UNSIGNED_BYTE, None)
+        framebuffer = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, texture, 0)
+        advances = numpy.zeros(256, dtype=numpy.float32)
+        try:
+            if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+                glDeleteTextures([texture])
+                return None
+            glViewport(0, 0, ATLAS_WIDTH, ATLAS_HEIGHT)
+            for capability in (GL_TEXTURE_2D, GL_BLEND, GL_ALPHA_TEST, GL_SCISSOR_TEST):
+                glDisable(capability)
+            glClearColor(0, 0, 0, 0)
+            glClear(GL_COLOR_BUFFER_BIT)
+            glColor4f(1, 1, 1, 1)
+            for code in range(FIRST_GLYPH, LAST_GLYPH + 1):
+                index = code - FIRST_GLYPH
+                x = index % COLUMNS * CELL + ORIGIN[0]
+                y = index // COLUMNS * CELL + ORIGIN[1]
+                glWindowPos2i(x, y)
+                self.bitmap_character(font, code)
+                advances[code] = glGetFloatv(GL_CURRENT_RASTER_POSITION)[0] - x
+            alpha = glReadPixels(0, 0, ATLAS_WIDTH, ATLAS_HEIGHT, GL_ALPHA, GL_UNSIGNED_BYTE)
+            quads, texcoords = _ink_quads(
+                numpy.frombuffer(alpha, dtype=numpy.uint8).reshape(ATLAS_HEIGHT, ATLAS_WIDTH))
+        finally:
+            glBindFramebuffer(GL_FRAMEBUFFER, previous)
+            glDeleteFramebuffers(1, [framebuffer])
+            glPopAttrib()
+            # bound with the functions imported here, maybe from before statecache.install()
+            statecache.invalidate('textures')
+        return texture, advances, quads, texcoords
+
+    def compile(self, font, text):
+        """Display list drawing text from font's atlas with its origin at (0, 0)"""
+        texture, advances, quads, texcoords = self.atlases[font_key(font)]
+        codes = numpy.frombuffer(text.encode('latin-1', 'replace'), dtype=numpy.uint8)
+        pen = numpy.cumsum(advances[codes]) - advances[codes]
+        printable = (codes >= FIRST_GLYPH) & (codes <= LAST_GLYPH)
+        glyphs = codes[printable] - FIRST_GLYPH
+        offsets = numpy.column_stack((pen, numpy.zeros_like(pen)))[printable]
+        vertices = quads[glyphs] + offsets[:, None, :]
+        texcoords = texcoords[glyphs]
+
+        string_list = glGenLists(1)
+        glNewList(string_list, GL_COMPILE)
+        glPushAttrib(GL_ENABLE_BIT | GL_TEXTURE_BIT | GL_COLOR_BUFFER_BIT)
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, texture)
+        glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_MODULATE)
+        glEnable(GL_ALPHA_TEST)
+        glAlphaFunc(GL_GREATER, 0.5)
+        if len(vertices):
+            # Client array state is not compiled into lists, it applies right away
+            glPushClientAttrib(GL_CLIENT_VERTEX_ARRAY_BIT)
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+            glVertexPointer(2, GL_FLOAT, 0, vertices)
+            glTexCoordPointer(2, GL_FLOAT, 0, texcoords)
+            glDrawArrays(GL_QUADS, 0, len(vertices) * 4)
+            glPopClientAttrib()
+        glPopAttrib()
+        glEndList()
+        return string_list
+
+    def draw(self, font, text, x, y):
+        """Draw text with its baseline starting at (x, y) in the current colour"""
+        if not self.cached or self.glyphs(font) is None:
+            glRasterPos2f(x, y)
+            for c in text:
+                self.bitmap_character(font, ord(c))
+            return
+
+        key = (font_key(font), text)
+        string_list = self.strings.get(key)
+        if string_list is None:
+            string_list = self.strings[key] = self.compile(font, text)
+            if len(self.strings) > self.max_strings:
+                _, oldest = self.strings.popitem(last=False)
+                glDeleteLists(oldest, 1)
+        else:
+            self.strings.move_to_end(key)
+        glPushMatrix()
+        glTranslatef(round(x), round(y), 0)
+        glCallList(string_list)
+        glPopMatrix()
+
+    def clear(self):
+        """Delete every display list and atlas, e.g. before the context is destroyed"""
+        for string_list in self.strings.values():
+            glDeleteLists(string_list, 1)
+        textures = [atlas[0] for atlas in self.atlases.values() if atlas is not None]
+        if textures:
+            glDeleteTextures(textures)
+            statecache.invalidate('textures')
+        self.strings.clear()
+        self.atlases.clear()
@@ -0,0 +1,181 @@
+"""Frame capture throughput at 800x600 RGBA
+
+Draws a frame of a few hundred quads into an offscreen context and reads
+it back, every frame, in each of the ways OpenGL.GL offers:
+
+    glReadPixels  a new array per frame (and the bytes copy of it)
+    pool          OpenGL.GL.readback.ReadbackPool, the same arrays reused
+    ring N        OpenGL.GL.readback.PixelPackRing of depth N, each read
+                  returning the frame from N reads earlier
+
+    PYOPENGL_PLATFORM=osmesa python capture_benchmark.py
+    PYOPENGL_PLATFORM=egl python capture_benchmark.py --frames 300
+
+With --writers no context is needed: writing one 800x600 frame to a
+temporary directory is timed for the old per-pixel ASCII write_ppm and
+each OpenGL.framewriters format, then --frames frames are streamed through
+a FrameWriter, timing how long write() held the loop up and how long the
+thread took to finish:
+
+    python capture_benchmark.py --writers
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import replay
+
+WIDTH, HEIGHT = 800, 600
+
+
+def draw(frame):
+    from OpenGL.GL import GL_COLOR_BUFFER_BIT, GL_QUADS, glBegin, glClear, glColor3f, glEnd, glVertex2f
+    glClear(GL_COLOR_BUFFER_BIT)
+    glBegin(GL_QUADS)
+    for i in range(300):
+        x = (i * 37 + frame * 5) % 200 / 100 - 1
+        y = (i * 53) % 200 / 100 - 1
+        glColor3f(i % 7 / 7, i % 5 / 5, i % 3 / 3)
+        glVertex2f(x, y)
+        glVertex2f(x + 0.1, y)
+        glVertex2f(x + 0.1, y + 0.1)
+        glVertex2f(x, y + 0.1)
+    glEnd()
+
+
+def capture_methods():
+    from OpenGL.GL import GL_RGBA, GL_UNSIGNED_BYTE, glReadPixels
+    from OpenGL.GL import readback
+    pool = readback.ReadbackPool()
+    rings = {depth: readback.PixelPackRing(depth) for depth in (2, 3)}
+    return [
+        ('glReadPixels', lambda: glReadPixels(0, 0, WIDTH, HEIGHT, GL_RGBA, GL_UNSIGNED_BYTE), None),
+        ('pool', lambda: pool.read(0, 0, WIDTH, HEIGHT), None),
+    ] + [
+        (f'ring {depth}', lambda ring=ring: ring.read(0, 0, WIDTH, HEIGHT), ring.flush)
+        for depth, ring in rings.items()
+    ]
+
+
+def check_pack_state():
+    """Read an odd-sized RGB block back after the pack state changed behind PyOpenGL's back
+
+    Sets GL_PACK_ALIGNMENT (and, for the readback classes, which reset it,
+    GL_PACK_ROW_LENGTH) through the raw entry point before each read.  The
+    GL then padded rows past the end of the array while PyOpenGL trusted
+    its cached pack state.
+    """
+    import numpy
+    from OpenGL.GL import GL_RGB, GL_UNSIGNED_BYTE, glReadPixels, readback
+    from OpenGL.raw.GL.VERSION.GL_1_0 import GL_PACK_ALIGNMENT, GL_PACK_ROW_LENGTH, glPixelStorei
+    x, y, width, height = 11, 7, 13, 5
+    pool = readback.ReadbackPool()
+    ring = readback.PixelPackRing(2)
+    layouts = [(4, 0), (8, 0)]
+    reads = [
+        ('glReadPixels', lambda: glReadPixels(x, y, width, height, GL_RGB, GL_UNSIGNED_BYTE), layouts),
+        ('pool', lambda: pool.read(x, y, width, height, GL_RGB), layouts + [(1, WIDTH)]),
+        ('ring 2', lambda: ring.read(x, y, width, height, GL_RGB) or ring.flush()[-1], layouts + [(1, WIDTH)]),
+    ]
+    draw(3)
+    glPixelStorei(GL_PACK_ALIGNMENT, 1)
+    glPixelStorei(GL_PACK_ROW_LENGTH, 0)
+    expected = pool.read(x, y, width, height, GL_RGB).copy()
+    for name, read, layouts in reads:
+        for alignment, row_length in layouts:
+            glPixelStorei(GL_PACK_ALIGNMENT, alignment)
+            glPixelStorei(GL_PACK_ROW_LENGTH, row_length)
+            image = numpy.frombuffer(memoryview(read()).tobytes(), dtype=numpy.uint8)
+            assert numpy.array_equal(image, expected.ravel()), \
+                f"{name} with pack alignment {alignment}, row length {row_length} read other pixels"
+    ring.delete()
+    print("reads after raw glPixelStorei changes match")
+
+
+def ascii_write_ppm(buf, filename):
+    """OpenGL.EGL.debug.write_ppm as it was, one formatted string per pixel"""
+    with open(filename, "w") as f:
+        (h, w, c) = buf.shape
+        f.write("P3\n")
+        f.write("# ascii ppm file created by pyopengl\n")
+        f.write("%i %i\n" % (w, h))
+        f.write("255\n")
+        for y in range(h - 1, -1, -1):
+            for x in range(w):
+                pixel = buf[y, x]
+                l = " %3d %3d %3d" % (pixel[0], pixel[1], pixel[2])
+                f.write(l)
+            f.write("\n")
+
+
+def writers(frames):
+    import numpy
+    from OpenGL import framewriters
+    # a frame of the game is mostly flat colour with some detail
+    image = numpy.zeros((HEIGHT, WIDTH, 4), dtype=numpy.uint8)
+    image[:, :, 1] = 120
+    image[::7, ::3] = numpy.random.default_rng(1).integers(0, 256, (HEIGHT // 7 + 1, WIDTH // 3 + 1, 4))
+    with tempfile.TemporaryDirectory() as directory:
+        cases = [
+            ('ASCII P3 (old)', lambda path: ascii_write_ppm(image, path), 'old.ppm', 1),
+            ('P6', lambda path: framewriters.write_ppm(path, image, flip=True), 'frame.ppm', 20),
+            ('PAM', lambda path: framewriters.write_pnm(path, image, flip=True), 'frame.pam', 20),
+            ('PNG', lambda path: framewriters.write_png(path, image, flip=True), 'frame.png', 20),
+        ]
+        print(f"{'writer':>15} {'ms/frame':>9} {'frames/s':>9} {'KiB':>6}")
+        for name, write, filename, repeat in cases:
+            path = os.path.join(directory, filename)
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                write(path)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"{name:>15} {best * 1e3:9.2f} {1 / best:9.1f} {os.path.getsize(path) // 1024:6d}")
+
+        for extension in ('ppm', 'png'):
+            pattern = os.path.join(directory, '%05d.' + extension)
+            start = time.perf_counter()
+            with framewriters.FrameWriter(pattern) as writer:
+                for frame in range(frames):
+                    writer.write(image)
+                queued = time.perf_counter() - start
+            total = time.perf_counter() - start
+            print(f"FrameWriter {extension}: {frames} frames queued in {queued * 1e3:.0f} ms "
+                  f"({queued / frames * 1e3:.2f} ms/frame in the loop), all written after "
+                  f"{total * 1e3:.0f} ms ({frames / total:.1f} frames/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--writers', action='store_true')
+    args = parser.parse_args()
+
+    if args.writers:
+        writers(args.frames)
+        return
+
+    context = replay.HeadlessContext(WIDTH, HEIGHT)  # keep the OSMesa buffer alive
+    from OpenGL.GL import glFinish
+    check_pack_state()
+    print(f"{'capture':>13} {'fps':>7} {'ms/frame':>9}")
+    for name, capture, flush in capture_methods():
+        best = None
+        for _ in range(args.runs):
+            glFinish()
+            start = time.perf_counter()
+            for frame in range(args.frames):
+                draw(frame)
+                capture()
+            if flush is not None:
+                flush()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"{name:>13} {args.frames / best:7.1f} {best / args.frames * 1e3:9.2f}")
+
+
+if __name__ == '__main__':
+    main()
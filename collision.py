@@ -0,0 +1,44 @@
+"""Uniform lane grid for broad-phase collision checks in Car Destroyer
+
+Cars sit in lanes, so bucketing objects by lane column and a y band means a
+bullet or player only has to be tested against the handful of objects in the
+neighbouring cells instead of against everything on the road.
+"""
+from math import floor
+
+
+class LaneGrid:
+    def __init__(self, left, lane_width, band_height):
+        self.left = left
+        self.lane_width = lane_width
+        self.band_height = band_height
+        self.cells = {}
+        self.count = 0
+
+    def cell(self, x, y):
+        return (floor((x - self.left) / self.lane_width), floor(y / self.band_height))
+
+    def insert(self, obj):
+        """Add an object by its centre; objects are returned in insertion order"""
+        self.cells.setdefault(self.cell(obj.x, obj.y), []).append((self.count, obj))
+        self.count += 1
+
+    def extend(self, objects):
+        for obj in objects:
+            self.insert(obj)
+
+    def nearby(self, x, y, reach_x, reach_y):
+        """Objects whose centre may lie within reach_x/reach_y of (x, y)
+
+        This is only the broad phase: callers still apply their exact overlap
+        test to each candidate.
+        """
+        col1, row1 = self.cell(x - reach_x, y - reach_y)
+        col2, row2 = self.cell(x + reach_x, y + reach_y)
+        found = []
+        for col in range(col1, col2 + 1):
+            for row in range(row1, row2 + 1):
+                found.extend(self.cells.get((col, row), ()))
+        if len(found) > 1:
+            found.sort(key=lambda entry: entry[0])
+        return [obj for _, obj in found]
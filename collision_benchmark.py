@@ -0,0 +1,96 @@
+"""Car Destroyer collision checks with the lane grid and with all pairs
+
+Runs Game.update headless (firing every fifth tick, like --headless) with
+--max-cars cars allowed in each direction, once with the collision.LaneGrid
+broad phase and once with a stand-in that hands every bullet and player
+all objects on the road, which is what the nested loops before the grid
+did.  Both runs start from the same seed and must end every tick with the
+same scores, health and cars, so the grid is checked to find exactly the
+hits the all-pairs loops found.
+
+    python collision_benchmark.py
+    python collision_benchmark.py --max-cars 8 --ticks 5000
+"""
+import argparse
+import time
+
+import CSE423_project_fall2024 as game
+import collision
+
+
+class AllObjects:
+    """LaneGrid interface returning every object, in insertion order"""
+
+    def __init__(self, left, lane_width, band_height):
+        self.objects = []
+
+    def insert(self, obj):
+        self.objects.append(obj)
+
+    def extend(self, objects):
+        self.objects.extend(objects)
+
+    def nearby(self, x, y, reach_x, reach_y):
+        return self.objects
+
+
+def run(grid, max_cars, ticks, seed):
+    """Seconds for ticks updates, average cars on the road and per-tick state"""
+    game.LaneGrid = grid
+    game.MAX_CARS = max_cars
+    game.seed_game(seed)
+    session = game.Game()
+    states, cars = [], 0
+
+    def restart():
+        session.start_game()
+        session.show_controls = False
+
+    restart()
+    elapsed = 0.0
+    for tick in range(ticks):
+        if session.game_state == game.STATE_GAME_OVER:
+            restart()
+        if tick % 5 == 0:
+            session.keyboard(b' ', 0, 0)
+        start = time.perf_counter()
+        session.update()
+        elapsed += time.perf_counter() - start
+        road = session.traffic_cars + session.oncoming_cars
+        cars += len(road)
+        states.append((
+            session.player.score, session.player.health, len(session.bullets),
+            tuple((round(car.x, 6), round(car.y, 6), car.health) for car in road),
+        ))
+    return elapsed, cars / ticks, states
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-cars', type=int, default=60, help='cars allowed in each direction')
+    parser.add_argument('--ticks', type=int, default=3000, help='updates per run')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per broad phase, best kept')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    modes = [('all pairs', AllObjects), ('lane grid', collision.LaneGrid)]
+    best = {}
+    states = {}
+    # interleave the runs so drift on a noisy machine hits both
+    for _ in range(args.repeat):
+        for name, grid in modes:
+            elapsed, cars, states[name] = run(grid, args.max_cars, args.ticks, args.seed)
+            best[name] = min(best.get(name, elapsed), elapsed)
+    if states['all pairs'] != states['lane grid']:
+        tick = next(i for i, (a, b) in enumerate(zip(states['all pairs'], states['lane grid'])) if a != b)
+        raise SystemExit(f"lane grid and all pairs differ from tick {tick}")
+
+    print(f"--max-cars {args.max_cars}: {cars:.1f} cars on the road on average, "
+          f"same state every tick both ways")
+    for name, _ in modes:
+        print(f"{name:>10}: {best[name] / args.ticks * 1e3:.3f} ms/tick")
+    print(f"speedup {best['all pairs'] / best['lane grid']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Structure-of-arrays entity storage for Car Destroyer
+
+Every pool keeps one NumPy array per field (position, velocity, health,
+lifetime, size, colour) with a free list of unused slots, so per-frame work
+like movement, deceleration, lifetime decay and off-screen culling is a
+single vectorised step over all live entities instead of a Python loop.
+
+Game code keeps working with objects: EntityView subclasses allocate a slot
+in their class's pool and expose the slot's fields as plain attributes.
+"""
+import numpy
+
+
+class EntityPool:
+    FIELDS = (
+        ('x', numpy.float64),
+        ('y', numpy.float64),
+        ('prev_x', numpy.float64),
+        ('prev_y', numpy.float64),
+        ('dx', numpy.float64),
+        ('dy', numpy.float64),
+        ('health', numpy.int64),
+        ('lifetime', numpy.int64),
+        ('size', numpy.int64),
+        ('group', numpy.int64),
+        ('colour', (numpy.float32, 4)),
+    )
+    NAMES = tuple(name for name, _ in FIELDS)
+
+    def __init__(self, capacity):
+        self.capacity = 0
+        self.alive = numpy.zeros(0, dtype=bool)
+        for name, dtype in self.FIELDS:
+            setattr(self, name, numpy.zeros(0, dtype=dtype))
+        self.free = []
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        """Enlarge every field array to hold capacity entities"""
+        old = self.capacity
+        if capacity <= old:
+            return
+        for name in self.NAMES + ('alive',):
+            array = getattr(self, name)
+            bigger = numpy.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            bigger[:old] = array
+            setattr(self, name, bigger)
+        # new slots go underneath the existing free ones so those are reused first
+        self.free = list(range(capacity - 1, old - 1, -1)) + self.free
+        self.capacity = capacity
+
+    def allocate(self, count=None, **values):
+        """Claim one slot (or an array of count slots) and set its fields"""
+        wanted = 1 if count is None else count
+        if len(self.free) < wanted:
+            self.grow(max(self.capacity * 2, self.capacity + wanted))
+        slots = numpy.array([self.free.pop() for _ in range(wanted)], dtype=numpy.intp)
+        # new entities start without motion to interpolate from
+        values.setdefault('prev_x', values.get('x', 0))
+        values.setdefault('prev_y', values.get('y', 0))
+        for name in self.NAMES:
+            getattr(self, name)[slots] = values.get(name, 0)
+        self.alive[slots] = True
+        return int(slots[0]) if count is None else slots
+
+    def release(self, slots):
+        """Return slots (an index, index array or boolean mask) to the free list"""
+        slots = numpy.asarray(slots)
+        if slots.dtype == bool:
+            slots = numpy.flatnonzero(slots & self.alive)
+        else:
+            slots = slots[self.alive[slots]].reshape(-1)
+        self.alive[slots] = False
+        self.free.extend(slots.tolist())
+
+    def clear(self):
+        self.release(self.alive.copy())
+
+    def live(self):
+        """Indices of all live entities"""
+        return numpy.flatnonzero(self.alive)
+
+    def snapshot(self):
+        """Remember current positions as the start of the next step"""
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+
+    def interpolate(self, slots, alpha):
+        """Positions of slots blended alpha of the way from the last snapshot"""
+        x = self.prev_x[slots] + (self.x[slots] - self.prev_x[slots]) * alpha
+        y = self.prev_y[slots] + (self.y[slots] - self.prev_y[slots]) * alpha
+        return x, y
+
+    def advance(self):
+        """Move every live entity by its velocity"""
+        live = self.live()
+        self.x[live] += self.dx[live]
+        self.y[live] += self.dy[live]
+
+    def damp(self, factor):
+        """Scale every live entity's velocity by factor"""
+        live = self.live()
+        self.dx[live] *= factor
+        self.dy[live] *= factor
+
+    def age(self):
+        """Count down lifetimes and release entities whose time is up"""
+        live = self.live()
+        self.lifetime[live] -= 1
+        self.release(live[self.lifetime[live] <= 0])
+
+
+class Field:
+    """Attribute of an EntityView that lives in its pool's field array"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        return getattr(view.pool, self.name)[view.slot].item()
+
+    def __set__(self, view, value):
+        getattr(view.pool, self.name)[view.slot] = value
+
+
+class EntityView:
+    """Object-style access to one slot of the subclass's pool"""
+    pool = None
+    x = Field('x')
+    y = Field('y')
+    dx = Field('dx')
+    dy = Field('dy')
+
+    def __init__(self, **values):
+        self.slot = self.pool.allocate(**values)
+
+    @classmethod
+    def at(cls, slot):
+        """View onto an already allocated slot"""
+        view = cls.__new__(cls)
+        view.slot = int(slot)
+        return view
+
+    @property
+    def alive(self):
+        return bool(self.pool.alive[self.slot])
+
+    def release(self):
+        self.pool.release(self.slot)
+
+    def render_position(self, alpha):
+        """Position to draw at, alpha of the way through the current step"""
+        x, y = self.pool.interpolate(self.slot, alpha)
+        return x.item(), y.item()
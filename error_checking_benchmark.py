@@ -0,0 +1,102 @@
+"""GL call throughput with each PyOpenGL error (or context) checking mode
+
+Runs a state-heavy mix of GL calls (the kind a frame of the course games
+makes outside glBegin/glEnd) against an offscreen context, once per
+PYOPENGL_ERROR_CHECKING mode, each in a fresh interpreter because the flag
+is read when OpenGL is first imported:
+
+    0         no glGetError at all
+    1         glGetError after every call (the default)
+    deferred  glGetError at glFinish/glutSwapBuffers/checkpoint() and
+              every PYOPENGL_ERROR_CHECKING_INTERVAL calls
+
+With --flag CONTEXT_CHECKING the PYOPENGL_CONTEXT_CHECKING modes are
+compared instead:
+
+    0         no context check (the default)
+    1         ask the platform for the current context before every call
+    tracked   use the context cached for the thread since the last
+              make-current
+
+With --flag STATE_CACHE the frame is run without and with
+OpenGL.GL.statecache, which drops the repeated glColor3f, glBindTexture,
+glMatrixMode and glEnable/glDisable pairs that would not change anything:
+
+    0         every call goes to the GL (the default)
+    1         calls setting the state already current are skipped
+
+    PYOPENGL_PLATFORM=osmesa python error_checking_benchmark.py
+    PYOPENGL_PLATFORM=egl python error_checking_benchmark.py --frames 500
+    PYOPENGL_PLATFORM=egl python error_checking_benchmark.py --flag CONTEXT_CHECKING
+    PYOPENGL_PLATFORM=egl python error_checking_benchmark.py --flag STATE_CACHE
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+MODES = {
+    'ERROR_CHECKING': ['0', '1', 'deferred'],
+    'CONTEXT_CHECKING': ['0', '1', 'tracked'],
+    'STATE_CACHE': ['0', '1'],
+}
+
+PROBE = """
+import sys, time
+import replay
+context = replay.HeadlessContext(64, 64)
+from OpenGL.GL import *
+
+frames = int(sys.argv[1])
+texture = glGenTextures(1)
+
+def frame():
+    glMatrixMode(GL_MODELVIEW)
+    for i in range(20):
+        glPushMatrix()
+        glTranslatef(i, i, 0)
+        glColor3f(1, 0, 0)
+        glEnable(GL_BLEND)
+        glBindTexture(GL_TEXTURE_2D, texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glLineWidth(1.0)
+        glDisable(GL_BLEND)
+        glPopMatrix()
+    glFinish()
+
+frame()
+start = time.perf_counter()
+for _ in range(frames):
+    frame()
+elapsed = time.perf_counter() - start
+print(elapsed, frames * (20 * 9 + 2))
+"""
+
+
+def run(flag, mode, frames):
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, **{'PYOPENGL_' + flag: mode},
+               PYTHONPATH=here + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, str(frames)],
+        capture_output=True, text=True, env=env, check=True,
+    ).stdout
+    elapsed, calls = output.split()
+    return float(elapsed), int(calls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--flag', choices=sorted(MODES), default='ERROR_CHECKING')
+    args = parser.parse_args()
+
+    print(f"{'mode':>9} {'calls/s':>10} {'us/call':>8}")
+    for mode in MODES[args.flag]:
+        elapsed, calls = min(run(args.flag, mode, args.frames) for _ in range(args.runs))
+        print(f"{mode:>9} {calls / elapsed:10.0f} {elapsed / calls * 1e6:8.3f}")
+
+
+if __name__ == '__main__':
+    main()
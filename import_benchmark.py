@@ -0,0 +1,73 @@
+"""Cold-start cost of importing PyOpenGL the ways the course code does
+
+Every statement is run in a fresh interpreter, several times, and the best
+run is reported: the wall time of the statement itself, the total of the
+self times "python -X importtime" reports for OpenGL modules, and the
+number of OpenGL modules that ended up imported.  Run it once beforehand
+(or compileall the tree) so bytecode caching doesn't skew the first run.
+
+    python import_benchmark.py
+    python import_benchmark.py --runs 10 "from OpenGL.GL import glClear"
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+STATEMENTS = [
+    'import OpenGL.GL',
+    'from OpenGL.GL import glClear, glBegin, glEnd, glVertex2f, GL_POINTS',
+    'from OpenGL.GL import *',
+    'from OpenGL.GL import *; from OpenGL.GLUT import *; from OpenGL.GLU import *',
+]
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+exec(compile(sys.argv[1], '<benchmark>', 'exec'), {})
+elapsed = time.perf_counter() - start
+print(elapsed, sum(1 for name in sys.modules if name.split('.')[0] == 'OpenGL'))
+"""
+
+
+def run(statement, *options):
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=here + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    return subprocess.run(
+        [sys.executable, *options, '-c', PROBE, statement],
+        capture_output=True, text=True, env=env, check=True,
+    )
+
+
+def measure(statement):
+    """Return (wall seconds, OpenGL self-time seconds, OpenGL module count)
+
+    -X importtime slows imports down noticeably, so the wall time comes
+    from a separate plain run.
+    """
+    elapsed, modules = run(statement).stdout.split()
+    self_time = 0
+    for line in run(statement, '-X', 'importtime').stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, _, name = line[len('import time:'):].split('|')
+        if name.strip().split('.')[0] == 'OpenGL':
+            self_time += int(own)
+    return float(elapsed), self_time / 1e6, int(modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('statements', nargs='*', default=STATEMENTS)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'wall ms':>9} {'OpenGL ms':>10} {'modules':>8}  statement")
+    for statement in args.statements:
+        runs = [measure(statement) for _ in range(args.runs)]
+        elapsed, self_time, modules = min(runs)
+        print(f"{elapsed * 1000:9.1f} {self_time * 1000:10.1f} {modules:8d}  {statement}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""Render-once background layers for the GLUT games
+
+Backgrounds like the Car Destroyer road are mostly static but were redrawn
+from scratch every frame.  ScrollingLayer renders them with the game's own
+drawing code into textures through a framebuffer object, once, and then
+puts them on screen as a single textured quad per frame:
+
+    static -- drawn in window coordinates over the clear colour, the part
+        that never moves
+    tile -- optional, one vertical period of content that scrolls (lane
+        markers), drawn on a transparent background between y=0 and
+        y=period; it repeats up the screen and scrolling it only changes
+        a texture matrix
+
+Both textures go on the same quad, the tile decalled over the static layer
+on the second texture unit, so the quad is opaque: it replaces whatever was
+drawn before it, which is what a background drawn right after glClear
+wants.  The textures are rebuilt whenever the viewport size or the key
+passed to draw() (whatever the drawing depends on) changes.  Without
+framebuffer object support the layers are simply drawn every frame.
+"""
+from OpenGL.GL import (
+    GL_BLEND, GL_COLOR_BUFFER_BIT, GL_COLOR_CLEAR_VALUE, GL_COMPILE,
+    GL_DECAL, GL_ENABLE_BIT, GL_MODELVIEW, GL_NEAREST, GL_PROJECTION,
+    GL_QUADS, GL_REPEAT, GL_REPLACE, GL_RGBA, GL_RGBA8, GL_TEXTURE,
+    GL_TEXTURE0, GL_TEXTURE1, GL_TEXTURE_2D, GL_TEXTURE_BIT, GL_TEXTURE_ENV,
+    GL_TEXTURE_ENV_MODE, GL_TEXTURE_MAG_FILTER, GL_TEXTURE_MIN_FILTER,
+    GL_TEXTURE_WRAP_S, GL_TEXTURE_WRAP_T, GL_TRANSFORM_BIT, GL_UNSIGNED_BYTE,
+    GL_VIEWPORT, GL_VIEWPORT_BIT,
+    glActiveTexture, glBegin, glBindTexture, glCallList, glClear,
+    glClearColor, glDeleteLists, glDeleteTextures, glDisable, glEnable,
+    glEnd, glEndList, glGenLists, glGenTextures, glGetFloatv, glGetIntegerv,
+    glLoadIdentity, glMatrixMode, glMultiTexCoord2f, glNewList, glPopAttrib,
+    glPopMatrix, glPushAttrib, glPushMatrix, glTexEnvi, glTexImage2D,
+    glTexParameteri, glTranslatef, glVertex2f, glViewport,
+)
+from OpenGL.GL.framebufferobjects import (
+    GL_COLOR_ATTACHMENT0, GL_FRAMEBUFFER, GL_FRAMEBUFFER_BINDING,
+    checkFramebufferStatus, glBindFramebuffer, glDeleteFramebuffers,
+    glFramebufferTexture2D, glGenFramebuffers,
+)
+from OpenGL.GL import statecache
+from OpenGL.GLU import gluOrtho2D
+
+
+def render_to_texture(draw, width, height, pixels_wide, pixels_high, clear_colour):
+    """Texture of pixels_wide x pixels_high holding what draw() draws in (0..width, 0..height)"""
+    texture = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, texture)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
+    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, pixels_wide, pixels_high, 0,
+                 GL_RGBA, GL_UNSIGNED_BYTE, None)
+
+    previous = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+    framebuffer = glGenFramebuffers(1)
+    glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+    glPushAttrib(GL_VIEWPORT_BIT | GL_COLOR_BUFFER_BIT | GL_TRANSFORM_BIT)
+    try:
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, texture, 0)
+        checkFramebufferStatus()
+        glViewport(0, 0, pixels_wide, pixels_high)
+        glClearColor(*clear_colour)
+        glClear(GL_COLOR_BUFFER_BIT)
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        gluOrtho2D(0, width, 0, height)
+        try:
+            draw()
+        finally:
+            glPopMatrix()
+            glMatrixMode(GL_PROJECTION)
+            glPopMatrix()
+    finally:
+        glPopAttrib()
+        glBindFramebuffer(GL_FRAMEBUFFER, previous)
+        glDeleteFramebuffers(1, [framebuffer])
+        # bound with the functions imported here, maybe from before statecache.install()
+        statecache.invalidate('textures')
+    return texture
+
+
+class ScrollingLayer:
+    def __init__(self, draw_static, draw_tile=None, period=0):
+        self.draw_static = draw_static
+        self.draw_tile = draw_tile
+        self.period = period
+        self.built_for = None
+        self.textures = []
+        self.quad = None
+
+    def build(self, width, height, pixels_wide, pixels_high):
+        """Render the layers into textures and compile the quad showing them"""
+        self.release()
+        textures = self.textures = [render_to_texture(
+            self.draw_static, width, height, pixels_wide, pixels_high,
+            glGetFloatv(GL_COLOR_CLEAR_VALUE))]
+        # how many tile periods the quad spans, for its texture coordinates
+        repeats = 0
+        if self.draw_tile is not None:
+            tile_pixels = max(1, round(self.period * pixels_high / height))
+            textures.append(render_to_texture(
+                self.draw_tile, width, self.period, pixels_wide, tile_pixels, (0, 0, 0, 0)))
+            repeats = height / self.period
+
+        self.quad = glGenLists(1)
+        glNewList(self.quad, GL_COMPILE)
+        glDisable(GL_BLEND)
+        for unit, texture in enumerate(textures):
+            glActiveTexture(GL_TEXTURE0 + unit)
+            glEnable(GL_TEXTURE_2D)
+            glBindTexture(GL_TEXTURE_2D, texture)
+            glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_DECAL if unit else GL_REPLACE)
+        glBegin(GL_QUADS)
+        for s, t in ((0, 0), (1, 0), (1, 1), (0, 1)):
+            glMultiTexCoord2f(GL_TEXTURE0, s, t)
+            if repeats:
+                glMultiTexCoord2f(GL_TEXTURE1, s, t * repeats)
+            glVertex2f(s * width, t * height)
+        glEnd()
+        glEndList()
+
+    def draw(self, width, height, scroll=0, key=()):
+        """Show the layers over (0..width, 0..height), the tile moved up by scroll
+
+        key holds whatever else the drawing depends on; the textures are
+        rebuilt when it, the size or the viewport's size changes.
+        """
+        if not bool(glGenFramebuffers):
+            self.draw_uncached(height, scroll)
+            return
+        _, _, pixels_wide, pixels_high = glGetIntegerv(GL_VIEWPORT)
+        built_for = (width, height, pixels_wide, pixels_high, self.period, key)
+        if built_for != self.built_for:
+            self.build(width, height, pixels_wide, pixels_high)
+            self.built_for = built_for
+
+        glPushAttrib(GL_ENABLE_BIT | GL_TEXTURE_BIT | GL_TRANSFORM_BIT)
+        if self.draw_tile is not None:
+            glActiveTexture(GL_TEXTURE1)
+            glMatrixMode(GL_TEXTURE)
+            glLoadIdentity()
+            glTranslatef(0, -scroll / self.period, 0)
+        glCallList(self.quad)
+        glPopAttrib()
+
+    def draw_uncached(self, height, scroll):
+        self.draw_static()
+        if self.draw_tile is None:
+            return
+        y = scroll % self.period - self.period
+        while y < height:
+            glPushMatrix()
+            glTranslatef(0, y, 0)
+            self.draw_tile()
+            glPopMatrix()
+            y += self.period
+
+    def release(self):
+        """Delete the textures and quad, e.g. before the context is destroyed"""
+        if self.textures:
+            glDeleteTextures(self.textures)
+            statecache.invalidate('textures')
+        if self.quad is not None:
+            glDeleteLists(self.quad, 1)
+        self.textures = []
+        self.quad = None
+        self.built_for = None
@@ -0,0 +1,202 @@
+"""Batched midpoint line/circle rasteriser shared by the course games
+
+Each function takes many primitives at once and returns every rasterised
+pixel as one contiguous (N, 2) int32 array, in the same order the scalar
+glBegin/glVertex2f loops in the games would emit them, so a whole set of
+outlines can be drawn with a single draw_points() call.
+
+Two variants of each algorithm exist because the games use different ones:
+
+    line_points / circle_points
+        draw_line / draw_circle in CSE423_project_fall2024.py
+    stepped_line_points / octant_circle_points
+        midpoint_line / midpoint_circle in the Circle Shooting assignment
+
+Float coordinates are floored to the pixel they rasterise to (see
+stepped_line_points for the one restriction on float input).
+"""
+from functools import lru_cache
+
+import numpy
+from OpenGL.GL import (
+    GL_COLOR_ARRAY, GL_FLOAT, GL_INT, GL_POINTS, GL_VERTEX_ARRAY,
+    glColorPointer, glDisableClientState, glDrawArrays,
+    glEnableClientState, glVertexPointer,
+)
+
+
+def _ragged_index(counts):
+    """Return (primitive index, step index) for each of sum(counts) pixels"""
+    counts = numpy.asarray(counts, dtype=numpy.int64)
+    owner = numpy.repeat(numpy.arange(len(counts)), counts)
+    starts = numpy.cumsum(counts) - counts
+    step = numpy.arange(int(counts.sum()), dtype=numpy.int64) - starts[owner]
+    return owner, step
+
+
+def _as_rows(values, width):
+    values = numpy.asarray(values, dtype=numpy.float64)
+    return values.reshape(-1, width)
+
+
+def _finish(points, counts, return_counts):
+    points = numpy.ascontiguousarray(numpy.floor(points), dtype=numpy.int32)
+    if return_counts:
+        return points, counts
+    return points
+
+
+def line_points(lines, return_counts=False):
+    """Rasterise (x1, y1, x2, y2) rows with draw_line's midpoint algorithm
+
+    Steep lines are walked along y, and every line is walked from its lower
+    end, exactly like the scalar version.
+    """
+    lines = numpy.asarray(lines, dtype=numpy.int64).reshape(-1, 4)
+    x1, y1, x2, y2 = lines.T
+    steep = abs(y2 - y1) > abs(x2 - x1)
+    # swap to walk along the major axis
+    x1, y1 = numpy.where(steep, y1, x1), numpy.where(steep, x1, y1)
+    x2, y2 = numpy.where(steep, y2, x2), numpy.where(steep, x2, y2)
+    # walk from the lower end
+    flip = x1 > x2
+    x1, x2 = numpy.where(flip, x2, x1), numpy.where(flip, x1, x2)
+    y1, y2 = numpy.where(flip, y2, y1), numpy.where(flip, y1, y2)
+    dx = x2 - x1
+    dy = abs(y2 - y1)
+    y_step = numpy.where(y1 < y2, 1, -1)
+    counts = dx + 1
+
+    owner, i = _ragged_index(counts)
+    # number of times the error term went negative after i steps
+    bumps = -((dx[owner] // 2 - i * dy[owner]) // numpy.maximum(dx[owner], 1))
+    bumps = numpy.maximum(bumps, 0)
+    major = x1[owner] + i
+    minor = y1[owner] + y_step[owner] * bumps
+    is_steep = steep[owner]
+    points = numpy.empty((len(i), 2), dtype=numpy.int64)
+    points[:, 0] = numpy.where(is_steep, minor, major)
+    points[:, 1] = numpy.where(is_steep, major, minor)
+    return _finish(points, counts, return_counts)
+
+
+def stepped_line_points(lines, return_counts=False):
+    """Rasterise (x0, y0, x1, y1) rows with midpoint_line's error stepping
+
+    Lines are walked from (x0, y0) to (x1, y1) in whole pixel steps, so
+    the endpoints may be any floats but their differences have to be
+    whole numbers (midpoint_line never reaches its end point otherwise).
+    Differences within 1e-6 of a whole number, as float arithmetic leaves
+    them, are rounded to it; anything else raises ValueError.  Pixel i of
+    a line is floor(x0 + step_x, y0 + step_y) for the whole steps
+    midpoint_line takes from (0, 0).
+    """
+    lines = _as_rows(lines, 4)
+    x0, y0, x1, y1 = lines.T
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    whole_dx, whole_dy = numpy.rint(dx), numpy.rint(dy)
+    if not (numpy.all(abs(dx - whole_dx) <= 1e-6) and numpy.all(abs(dy - whole_dy) <= 1e-6)):
+        raise ValueError("stepped_line_points needs whole number differences between endpoints")
+    dx, dy = whole_dx, whole_dy
+    sx = numpy.where(x0 < x1, 1, -1)
+    sy = numpy.where(y0 < y1, 1, -1)
+    x_major = dx >= dy
+    major_len = numpy.where(x_major, dx, dy)
+    minor_len = numpy.where(x_major, dy, dx)
+    counts = major_len.astype(numpy.int64) + 1
+
+    owner, i = _ragged_index(counts)
+    length = numpy.maximum(major_len[owner], 1)
+    minor = numpy.floor((2 * i * minor_len[owner] + major_len[owner] - 1) / (2 * length))
+    minor = numpy.maximum(minor, 0)
+    is_x_major = x_major[owner]
+    points = numpy.empty((len(i), 2), dtype=numpy.float64)
+    points[:, 0] = x0[owner] + sx[owner] * numpy.where(is_x_major, i, minor)
+    points[:, 1] = y0[owner] + sy[owner] * numpy.where(is_x_major, minor, i)
+    return _finish(points, counts, return_counts)
+
+
+@lru_cache(maxsize=None)
+def _circle_pattern(radius):
+    """Pixel offsets draw_circle emits for a circle of the given radius"""
+    offsets = []
+    x = radius
+    y = 0
+    decision = 1 - radius
+    while x >= y:
+        offsets.extend((
+            (x, y), (-x, y), (x, -y), (-x, -y),
+            (y, x), (-y, x), (y, -x), (-y, -x),
+        ))
+        y += 1
+        if decision <= 0:
+            decision += 2 * y + 1
+        else:
+            x -= 1
+            decision += 2 * (y - x) + 1
+    return numpy.array(offsets, dtype=numpy.float64).reshape(-1, 2)
+
+
+@lru_cache(maxsize=None)
+def _octant_pattern(radius):
+    """Pixel offsets midpoint_circle emits for a circle of the given radius"""
+    offsets = []
+    x, y = 0, radius
+    p = 1 - radius
+    while True:
+        offsets.extend((
+            (x, y), (-x, y), (x, -y), (-x, -y),
+            (y, x), (-y, x), (y, -x), (-y, -x),
+        ))
+        if not x < y:
+            break
+        x += 1
+        if p < 0:
+            p += 2 * x + 1
+        else:
+            y -= 1
+            p += 2 * (x - y) + 1
+    return numpy.array(offsets, dtype=numpy.float64).reshape(-1, 2)
+
+
+def _stamp(circles, pattern, return_counts):
+    """Place the cached offset pattern for each circle's radius at its centre"""
+    circles = _as_rows(circles, 3)
+    radii, which = numpy.unique(circles[:, 2], return_inverse=True)
+    patterns = [pattern(radius.item()) for radius in radii]
+    lengths = numpy.array([len(p) for p in patterns], dtype=numpy.int64)
+    table = numpy.concatenate(patterns) if patterns else numpy.empty((0, 2))
+    table_starts = numpy.cumsum(lengths) - lengths
+
+    counts = lengths[which]
+    owner, i = _ragged_index(counts)
+    points = table[table_starts[which][owner] + i] + circles[owner, :2]
+    return _finish(points, counts, return_counts)
+
+
+def circle_points(circles, return_counts=False):
+    """Rasterise (x_center, y_center, radius) rows like draw_circle"""
+    circles = numpy.asarray(circles, dtype=numpy.int64)
+    return _stamp(circles, _circle_pattern, return_counts)
+
+
+def octant_circle_points(circles, return_counts=False):
+    """Rasterise (xc, yc, r) rows like midpoint_circle"""
+    return _stamp(circles, _octant_pattern, return_counts)
+
+
+def draw_points(points, colours=None):
+    """Draw an (N, 2) int32 pixel array (with optional per-pixel colours) at once"""
+    if not len(points):
+        return
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(2, GL_INT, 0, points)
+    if colours is not None:
+        colours = numpy.ascontiguousarray(colours, dtype=numpy.float32)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glColorPointer(colours.shape[1], GL_FLOAT, 0, colours)
+    glDrawArrays(GL_POINTS, 0, len(points))
+    if colours is not None:
+        glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
@@ -0,0 +1,358 @@
+"""Drawing a frame of car outlines per pixel and with midpoint.py
+
+Keeps copies of the scalar glBegin/glVertex2f routines midpoint.py stands in for:
+
+    draw_line / draw_circle             CSE423_project_fall2024.py
+    midpoint_line / midpoint_circle     the Circle Shooting assignment
+
+First checks that line_points, stepped_line_points, circle_points and
+octant_circle_points return exactly the pixels, in the same order, that
+these routines emit, on --primitives random lines and circles of each
+kind: integer ones for draw_line/draw_circle (which only take integers)
+and float ones for midpoint_line/midpoint_circle (line endpoints in
+sixteenths of a pixel with whole differences, any float centres and
+radii).  midpoint_line only stops for whole differences, so lines
+between arbitrary float endpoints are checked against the contract
+stepped_line_points documents instead: the pixels midpoint_line steps
+through from (0, 0), moved to each start and floored, and ValueError
+for lengths that aren't whole.  No GL context is needed for that part,
+so --check-only runs it on its own.
+
+Then draws a frame of --cars cars the way the game does (body, windows,
+health bar and, for every fifth car, the boss outline) offscreen:
+
+    scalar   glColor3f and one draw_line per outline segment
+    batched  every segment through line_points and one draw_points call
+
+timing the best of --repeat frames each way and checking both leave the
+same pixels in the framebuffer.
+
+    python midpoint_benchmark.py --check-only
+    PYOPENGL_PLATFORM=osmesa python midpoint_benchmark.py
+    PYOPENGL_PLATFORM=egl python midpoint_benchmark.py --cars 100
+"""
+import argparse
+import math
+import time
+
+import numpy
+
+import replay
+from midpoint import circle_points, draw_points, line_points, octant_circle_points, stepped_line_points
+
+WIDTH, HEIGHT = 800, 600
+CAR_WIDTH = 40
+CAR_HEIGHT = 60
+BOSS_HEALTH = 10
+
+# The scalar routines below call these; emit_to() points them at the GL or
+# at a list collecting the vertices
+GL_POINTS = 0
+glBegin = glVertex2f = glEnd = None
+
+
+def emit_to(begin, vertex, end):
+    global glBegin, glVertex2f, glEnd
+    glBegin, glVertex2f, glEnd = begin, vertex, end
+
+
+def draw_line(x1, y1, x2, y2):
+    """Midpoint line drawing algorithm"""
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    steep = dy > dx
+
+    if steep:
+        x1, y1 = y1, x1
+        x2, y2 = y2, x2
+
+    if x1 > x2:
+        x1, x2 = x2, x1
+        y1, y2 = y2, y1
+
+    dx = x2 - x1
+    dy = abs(y2 - y1)
+    error = dx // 2
+    y = y1
+    y_step = 1 if y1 < y2 else -1
+
+    glBegin(GL_POINTS)
+    for x in range(x1, x2 + 1):
+        glVertex2f(y, x) if steep else glVertex2f(x, y)
+        error -= dy
+        if error < 0:
+            y += y_step
+            error += dx
+    glEnd()
+
+
+def draw_circle(x_center, y_center, radius):
+    """Midpoint circle drawing algorithm"""
+    x = radius
+    y = 0
+    decision = 1 - radius
+
+    glBegin(GL_POINTS)
+    while x >= y:
+        glVertex2f(x_center + x, y_center + y)
+        glVertex2f(x_center - x, y_center + y)
+        glVertex2f(x_center + x, y_center - y)
+        glVertex2f(x_center - x, y_center - y)
+        glVertex2f(x_center + y, y_center + x)
+        glVertex2f(x_center - y, y_center + x)
+        glVertex2f(x_center + y, y_center - x)
+        glVertex2f(x_center - y, y_center - x)
+
+        y += 1
+        if decision <= 0:
+            decision += 2 * y + 1
+        else:
+            x -= 1
+            decision += 2 * (y - x) + 1
+    glEnd()
+
+
+def midpoint_line(x0, y0, x1, y1):
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx - dy
+
+    glBegin(GL_POINTS)
+    while True:
+        glVertex2f(x0, y0)
+        if x0 == x1 and y0 == y1:
+            break
+        e2 = err * 2
+        if e2 > -dy:
+            err -= dy
+            x0 += sx
+        if e2 < dx:
+            err += dx
+            y0 += sy
+    glEnd()
+
+
+def midpoint_circle(xc, yc, r):
+    x, y = 0, r
+    p = 1 - r
+    plot_circle_points(xc, yc, x, y)
+    while x < y:
+        x += 1
+        if p < 0:
+            p += 2 * x + 1
+        else:
+            y -= 1
+            p += 2 * (x - y) + 1
+        plot_circle_points(xc, yc, x, y)
+
+
+def plot_circle_points(xc, yc, x, y):
+    glBegin(GL_POINTS)
+    points = [
+        (xc + x, yc + y), (xc - x, yc + y),
+        (xc + x, yc - y), (xc - x, yc - y),
+        (xc + y, yc + x), (xc - y, yc + x),
+        (xc + y, yc - x), (xc - y, yc - x)
+    ]
+    for px, py in points:
+        glVertex2f(px, py)
+    glEnd()
+
+
+def scalar_pixels(routine, rows):
+    """Every vertex routine emits for each row, floored like midpoint.py"""
+    vertices = []
+    emit_to(lambda mode: None, lambda x, y: vertices.append((x, y)), lambda: None)
+    for row in rows:
+        routine(*row)
+    return numpy.floor(numpy.array(vertices, dtype=numpy.float64).reshape(-1, 2)).astype(numpy.int32)
+
+
+def shifted_pixels(routine, starts, steps):
+    """Pixels of routine run from (0, 0) over each whole step, moved to each float start"""
+    vertices = []
+    for (x0, y0), (dx, dy) in zip(starts, steps):
+        emit_to(lambda mode: None, lambda x, y: vertices.append((x0 + x, y0 + y)), lambda: None)
+        routine(0, 0, dx, dy)
+    return numpy.floor(numpy.array(vertices, dtype=numpy.float64).reshape(-1, 2)).astype(numpy.int32)
+
+
+def random_primitives(count, rng):
+    """(int lines, int circles, float lines, float circles) with a few degenerate rows"""
+    int_lines = rng.integers(-200, 1000, (count, 4))
+    int_lines[:count // 20, 2:] = int_lines[:count // 20, :2]  # single points
+    int_lines[count // 20:count // 10, 2] = int_lines[count // 20:count // 10, 0]  # vertical
+    int_circles = numpy.c_[rng.integers(-200, 1000, (count, 2)), rng.integers(0, 80, count)]
+
+    # fractions in sixteenths so adding whole steps stays exact, as midpoint_line needs
+    starts = rng.integers(-200, 1000, (count, 2)) + rng.integers(0, 16, (count, 2)) / 16
+    float_lines = numpy.c_[starts, starts + rng.integers(-300, 300, (count, 2))]
+    float_lines[:count // 20, 2:] = float_lines[:count // 20, :2]
+    float_circles = numpy.c_[rng.uniform(-200, 1000, (count, 2)), rng.uniform(0, 80, count)]
+    float_circles[:count // 10, 2] = rng.integers(0, 160, count // 10) / 2  # the assignment's radii
+    return int_lines, int_circles, float_lines, float_circles
+
+
+def compare(name, points, counts, expected):
+    assert counts.sum() == len(points), name
+    if points.shape != expected.shape or not numpy.array_equal(points, expected):
+        mismatch = numpy.flatnonzero((points[:len(expected)] != expected[:len(points)]).any(axis=1))
+        first = mismatch[0] if len(mismatch) else min(len(points), len(expected))
+        raise AssertionError(
+            f"{name}: {len(points)} pixels, the scalar routine emits {len(expected)}; first difference at {first}")
+
+
+def check(count):
+    rng = numpy.random.default_rng(7)
+    int_lines, int_circles, float_lines, float_circles = random_primitives(count, rng)
+    cases = [
+        ('line_points', line_points, draw_line, int_lines.tolist()),
+        ('circle_points', circle_points, draw_circle, int_circles.tolist()),
+        ('stepped_line_points', stepped_line_points, midpoint_line, float_lines.tolist()),
+        ('octant_circle_points', octant_circle_points, midpoint_circle, float_circles.tolist()),
+    ]
+    print(f"{'':>21} {'pixels':>9} {'scalar ms':>10} {'batched ms':>11}")
+    for name, batched, scalar, rows in cases:
+        start = time.perf_counter()
+        expected = scalar_pixels(scalar, rows)
+        scalar_time = time.perf_counter() - start
+        start = time.perf_counter()
+        points, counts = batched(rows, return_counts=True)
+        batched_time = time.perf_counter() - start
+        compare(name, points, counts, expected)
+        print(f"{name:>21} {len(points):9d} {scalar_time * 1e3:10.1f} {batched_time * 1e3:11.1f}")
+
+    # Arbitrary float endpoints: midpoint_line would step past end points
+    # its whole steps can't land on exactly, so hold stepped_line_points to
+    # its contract instead, the steps from (0, 0) moved to each start
+    starts = rng.uniform(-200, 1000, (count, 2))
+    steps = rng.integers(-300, 300, (count, 2))
+    points, counts = stepped_line_points(numpy.c_[starts, starts + steps], return_counts=True)
+    compare('stepped_line_points', points, counts, shifted_pixels(midpoint_line, starts.tolist(), steps.tolist()))
+    try:
+        stepped_line_points([(0.25, 0.0, 10.75, 3.0)])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("stepped_line_points accepted a line 10.5 pixels long")
+    print(f"stepped_line_points on {count} lines between arbitrary floats matches its contract")
+
+
+def cars(count, rng):
+    """(x, y, direction, health, is_boss, colour) for a screen full of traffic"""
+    result = []
+    for i in range(count):
+        is_boss = i % 5 == 0
+        health = rng.integers(1, (BOSS_HEALTH if is_boss else 3) + 1)
+        colour = (1.0, 0.0, 0.0) if is_boss else tuple(rng.uniform(0.3, 1.0, 3))
+        result.append((rng.uniform(60, WIDTH - 60), rng.uniform(60, HEIGHT - 60),
+                       1 if i % 2 else -1, health, is_boss, colour))
+    return result
+
+
+def car_outline(x, y, direction, health, is_boss, colour):
+    """(colour, segments) pairs for one car, as Car.draw builds them"""
+    x1 = int(x - CAR_WIDTH // 2)
+    y1 = int(y - CAR_HEIGHT // 2)
+    x2 = int(x + CAR_WIDTH // 2)
+    y2 = int(y + CAR_HEIGHT // 2)
+    parts = [(colour, [(x1, y1, x2, y1), (x2, y1, x2, y2), (x2, y2, x1, y2), (x1, y2, x1, y1)])]
+
+    window_height = CAR_HEIGHT // 4
+    window_y = int(y + window_height // 2 if direction == 1 else y - window_height // 2)
+    wx1 = int(x - CAR_WIDTH // 3)
+    wx2 = int(x + CAR_WIDTH // 3)
+    wy2 = window_y + window_height
+    parts.append(((0.7, 0.9, 1.0), [(wx1, window_y, wx2, window_y), (wx2, window_y, wx2, wy2),
+                                    (wx2, wy2, wx1, wy2), (wx1, wy2, wx1, window_y)]))
+
+    if is_boss:
+        extra_width = 10
+        parts.append((colour, [(x1 - extra_width, y1, x2 + extra_width, y1),
+                               (x2 + extra_width, y1, x2 + extra_width, y2),
+                               (x2 + extra_width, y2, x1 - extra_width, y2),
+                               (x1 - extra_width, y2, x1 - extra_width, y1)]))
+
+    health_width = int((CAR_WIDTH * health) / (BOSS_HEALTH if is_boss else 3))
+    hx1 = int(x - CAR_WIDTH / 2)
+    hy1 = int(y - CAR_HEIGHT / 2 - 8) if direction == 1 else int(y + CAR_HEIGHT / 2 + 5)
+    hx2 = int(hx1 + health_width)
+    hy2 = hy1 + 3
+    parts.append(((0.0, 1.0, 0.0), [(hx1, hy1, hx2, hy1), (hx2, hy1, hx2, hy2),
+                                    (hx2, hy2, hx1, hy2), (hx1, hy2, hx1, hy1)]))
+    return parts
+
+
+def best_of(call, repeat):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def frame(count, repeat):
+    context = replay.HeadlessContext(WIDTH, HEIGHT)  # keep the OSMesa buffer alive
+    from OpenGL import GL
+    from OpenGL.GLU import gluOrtho2D
+    GL.glMatrixMode(GL.GL_PROJECTION)
+    GL.glLoadIdentity()
+    gluOrtho2D(0, WIDTH, 0, HEIGHT)
+    GL.glMatrixMode(GL.GL_MODELVIEW)
+    GL.glLoadIdentity()
+    emit_to(GL.glBegin, GL.glVertex2f, GL.glEnd)
+    traffic = [car_outline(*car) for car in cars(count, numpy.random.default_rng(11))]
+    segments = sum(len(lines) for parts in traffic for _, lines in parts)
+
+    def scalar():
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+        for parts in traffic:
+            for colour, lines in parts:
+                GL.glColor3f(*colour)
+                for line in lines:
+                    draw_line(*line)
+        GL.glFinish()
+
+    def batched():
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+        lines, colours = [], []
+        for parts in traffic:
+            for colour, part in parts:
+                lines += part
+                colours += [colour] * len(part)
+        points, counts = line_points(lines, return_counts=True)
+        draw_points(points, numpy.repeat(numpy.asarray(colours, dtype=numpy.float32), counts, axis=0))
+        GL.glFinish()
+
+    images = []
+    for draw in (scalar, batched):
+        draw()
+        images.append(GL.glReadPixels(0, 0, WIDTH, HEIGHT, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE))
+    assert numpy.array_equal(images[0], images[1]), "scalar and batched frames differ"
+
+    pixels = len(line_points([line for parts in traffic for _, lines in parts for line in lines]))
+    scalar_time = best_of(scalar, repeat)
+    batched_time = best_of(batched, repeat)
+    print(f"{count} cars, {segments} segments, {pixels} pixels per frame (frames identical)")
+    print(f"{'scalar':>8} {scalar_time * 1e3:8.1f} ms/frame")
+    print(f"{'batched':>8} {batched_time * 1e3:8.1f} ms/frame  ({scalar_time / batched_time:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--primitives', type=int, default=2000, help='random lines and circles of each kind to check')
+    parser.add_argument('--cars', type=int, default=60)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--check-only', action='store_true', help='only compare pixels, no GL context')
+    args = parser.parse_args()
+
+    check(args.primitives)
+    if not args.check_only:
+        frame(args.cars, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""Evaluating NURBS surfaces with GLU callbacks and with OpenGL.GLU.evaluator
+
+Builds --surfaces bicubic NURBS surfaces (8x8 control nets sharing one
+knot vector, as a terrain or a set of hull panels would) and evaluates
+them on a --samples x --samples grid:
+
+    glu        gluNurbsSurface in GLU_NURBS_TESSELLATOR mode with Python
+               vertex and normal callbacks collecting the output, timed on
+               --glu-surfaces of them
+    each       nurbsSurfaceMesh per surface
+    batch      nurbsSurfaceMesh on all control nets stacked, one call
+    cached     nurbsSurfaceMesh per surface from a filled NurbsCache
+
+then uploads the batch with NurbsMesh.vbos and draws it offscreen with
+glInterleavedArrays/glDrawElements.  The evaluated points are checked
+against a point-at-a-time de Boor evaluation on a few surfaces, and
+against evaluating with NumPy integer sample counts.
+
+    PYOPENGL_PLATFORM=osmesa python nurbs_benchmark.py
+    PYOPENGL_PLATFORM=egl python nurbs_benchmark.py --surfaces 200 --samples 128
+"""
+import argparse
+import time
+
+import numpy
+
+import replay
+
+ORDER = 4
+
+
+def knot_vector(count):
+    inner = numpy.linspace(0, 1, count - ORDER + 2)[1:-1]
+    return numpy.r_[[0.0] * ORDER, inner, [1.0] * ORDER]
+
+
+def control_nets(surfaces, size):
+    rng = numpy.random.default_rng(3)
+    grid = numpy.stack(numpy.meshgrid(numpy.linspace(0, 10, size), numpy.linspace(0, 10, size), indexing='ij'), -1)
+    nets = numpy.empty((surfaces, size, size, 3))
+    nets[..., :2] = grid + rng.uniform(-0.3, 0.3, (surfaces, size, size, 2))
+    nets[..., 2] = rng.uniform(-2, 2, (surfaces, size, size))
+    return nets
+
+
+def de_boor(knots, control, u):
+    """One point of a B-spline curve, de Boor's algorithm"""
+    degree = ORDER - 1
+    span = min(max(numpy.searchsorted(knots, u, side='right') - 1, degree), len(control) - 1)
+    points = [control[j + span - degree].copy() for j in range(ORDER)]
+    for r in range(1, ORDER):
+        for j in range(degree, r - 1, -1):
+            i = j + span - degree
+            alpha = (u - knots[i]) / (knots[i + degree - r + 1] - knots[i])
+            points[j] = (1 - alpha) * points[j - 1] + alpha * points[j]
+    return points[degree]
+
+
+def de_boor_surface(knots, control, u, v):
+    return de_boor(knots, numpy.array([de_boor(knots, row, v) for row in control]), u)
+
+
+class GLUSurfaces:
+    """Surfaces through gluNurbsSurface's tessellator callbacks"""
+
+    def __init__(self, samples):
+        from OpenGL import GLU
+        self.GLU = GLU
+        self.nurb = GLU.gluNewNurbsRenderer()
+        self.vertices, self.normals = [], []
+        for name, value in (
+            ('GLU_NURBS_MODE', GLU.GLU_NURBS_TESSELLATOR),
+            ('GLU_AUTO_LOAD_MATRIX', 0),
+            ('GLU_SAMPLING_METHOD', GLU.GLU_DOMAIN_DISTANCE),
+            ('GLU_U_STEP', samples - 1),
+            ('GLU_V_STEP', samples - 1),
+        ):
+            GLU.gluNurbsProperty(self.nurb, getattr(GLU, name), value)
+        GLU.gluNurbsCallback(self.nurb, GLU.GLU_NURBS_BEGIN, lambda mode: None)
+        GLU.gluNurbsCallback(self.nurb, GLU.GLU_NURBS_VERTEX, self.vertices.append)
+        GLU.gluNurbsCallback(self.nurb, GLU.GLU_NURBS_NORMAL, self.normals.append)
+        GLU.gluNurbsCallback(self.nurb, GLU.GLU_NURBS_END, lambda: None)
+
+    def __call__(self, knots, control):
+        from OpenGL.GL import GL_MAP2_VERTEX_3
+        del self.vertices[:], self.normals[:]
+        self.GLU.gluBeginSurface(self.nurb)
+        self.GLU.gluNurbsSurface(self.nurb, knots, knots, control, GL_MAP2_VERTEX_3)
+        self.GLU.gluEndSurface(self.nurb)
+        return len(self.vertices)
+
+
+def best_of(call, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = call()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--surfaces', type=int, default=1000)
+    parser.add_argument('--samples', type=int, default=64)
+    parser.add_argument('--size', type=int, default=8, help='control points along each side')
+    parser.add_argument('--glu-surfaces', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    context = replay.HeadlessContext(512, 512)  # keep the OSMesa buffer alive
+    from OpenGL.GL import (
+        GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT, GL_DEPTH_TEST, GL_TRIANGLES, GL_UNSIGNED_INT,
+        glClear, glDrawElements, glEnable, glFinish, glInterleavedArrays,
+    )
+    from OpenGL.GLU import NurbsCache, nurbsCurvePoints, nurbsSurfaceMesh
+
+    knots = knot_vector(args.size)
+    nets = control_nets(args.surfaces, args.size)
+    samples = args.samples
+    vertices = args.surfaces * samples * samples
+    print(f"{args.surfaces} surfaces of {args.size}x{args.size} control points, {samples}x{samples} samples")
+
+    glu = GLUSurfaces(samples)
+    glu_count = min(args.glu_surfaces, args.surfaces)
+    glu_time, glu_vertices = best_of(lambda: sum(glu(knots, net) for net in nets[:glu_count]), 1)
+    glu_time *= args.surfaces / glu_count
+
+    cache = NurbsCache(max_bytes=vertices * 8 * 4 * 2)
+    for net in nets:
+        nurbsSurfaceMesh(knots, knots, net, samples, cache=cache)
+    runs = [
+        ('each', lambda: [nurbsSurfaceMesh(knots, knots, net, samples) for net in nets]),
+        ('batch', lambda: nurbsSurfaceMesh(knots, knots, nets, samples)),
+        ('cached', lambda: [nurbsSurfaceMesh(knots, knots, net, samples, cache=cache) for net in nets]),
+    ]
+    print(f"{'':>7} {'ms':>9} {'ms/surface':>11} {'Mvertices/s':>12}")
+    print(f"{'glu':>7} {glu_time * 1e3:9.1f} {glu_time / args.surfaces * 1e3:11.3f} {vertices / glu_time / 1e6:12.2f}"
+          f"  (timed on {glu_count}, {glu_vertices // glu_count} vertices each)")
+    for name, call in runs:
+        best, result = best_of(call, args.repeat)
+        print(f"{name:>7} {best * 1e3:9.1f} {best / args.surfaces * 1e3:11.3f} {vertices / best / 1e6:12.2f}")
+    print(f"cache: {cache.hits} hits, {cache.misses} misses, {cache.bytes / 2**20:.0f} MiB")
+
+    mesh = nurbsSurfaceMesh(knots, knots, nets, samples)
+    error = 0.0
+    for index in range(min(3, args.surfaces)):
+        grid = mesh.positions[index].reshape((samples, samples, 3))
+        for i, j in ((0, 0), (samples // 3, samples // 2), (samples - 1, samples - 1), (samples - 1, 5)):
+            u, v = i / (samples - 1), j / (samples - 1)
+            error = max(error, numpy.abs(grid[i, j] - de_boor_surface(knots, nets[index], u, v)).max())
+    print(f"largest difference from de Boor evaluation: {error:.2e}")
+    # sample counts computed with NumPy arrive as NumPy integers
+    for count in (numpy.int64(samples), numpy.int32(samples)):
+        assert numpy.array_equal(nurbsSurfaceMesh(knots, knots, nets[0], count).vertices,
+                                 nurbsSurfaceMesh(knots, knots, nets[0], samples).vertices)
+        assert numpy.array_equal(nurbsCurvePoints(knots, nets[0, 0], count),
+                                 nurbsCurvePoints(knots, nets[0, 0], samples))
+
+    start = time.perf_counter()
+    vertex_buffer, index_buffer = mesh.vbos()
+    vertex_buffer.bind()
+    index_buffer.bind()
+    glFinish()
+    upload = time.perf_counter() - start
+    glEnable(GL_DEPTH_TEST)
+    count = mesh.mergedIndices().size
+
+    def draw():
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glInterleavedArrays(mesh.FORMAT, 0, None)
+        glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
+        glFinish()
+
+    draw()
+    frame, _ = best_of(draw, args.repeat)
+    print(f"upload {mesh.vertices.nbytes / 2**20:.0f} MiB vertices + {count * 4 / 2**20:.0f} MiB indices: "
+          f"{upload * 1e3:.1f} ms, draw all {count // 3} triangles: {frame * 1e3:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Decoding selection and feedback buffers of 10000 records
+
+Fills a selection buffer with the hits of --records named triangles (one
+name each, and with a two-deep name stack) and feedback buffers with
+--records points and triangles, drawn into an offscreen context, then
+times turning each buffer into Python records both ways:
+
+    objects  GLSelectRecord.fromArrayObjects / feedback.parseFeedbackObjects,
+             one Python object per hit, vertex and name
+    numpy    GLSelectRecord.fromArray / feedback.parseFeedback (what
+             glRenderMode returns), decoded into arrays in a few passes
+    + all    the numpy decode and then every record's lazy object looked up
+
+    PYOPENGL_PLATFORM=osmesa python picking_benchmark.py
+    PYOPENGL_PLATFORM=egl python picking_benchmark.py --records 100000
+"""
+import argparse
+import timeit
+
+import replay
+
+
+def triangles(count, draw_one=None):
+    from OpenGL.GL import GL_TRIANGLES, glBegin, glEnd, glVertex3f
+    for i in range(count):
+        if draw_one is not None:
+            draw_one(i)
+        x = (i % 100) / 50 - 0.99
+        y = (i // 100 % 100) / 50 - 0.99
+        glBegin(GL_TRIANGLES)
+        glVertex3f(x, y, 0)
+        glVertex3f(x + 0.01, y, 0.5)
+        glVertex3f(x, y + 0.01, -0.5)
+        glEnd()
+
+
+def selection_buffer(records, depth):
+    from OpenGL.GL import GL_RENDER, GL_SELECT, glInitNames, glLoadName, glPushName, glSelectBuffer
+    from OpenGL.raw.GL.VERSION.GL_1_1 import glRenderMode
+    buffer = glSelectBuffer(records * (3 + depth))
+    glRenderMode(GL_SELECT)
+    glInitNames()
+    for level in range(depth):
+        glPushName(level)
+    triangles(records, lambda i: glLoadName(i))
+    return buffer, glRenderMode(GL_RENDER)
+
+
+def feedback_buffer(records, mode, primitive):
+    from OpenGL.GL import GL_FEEDBACK, GL_POINTS, GL_RENDER, glBegin, glEnd, glFeedbackBuffer, glVertex3f
+    from OpenGL.raw.GL.VERSION.GL_1_1 import glRenderMode
+    buffer = glFeedbackBuffer(records * 64, mode)
+    glRenderMode(GL_FEEDBACK)
+    if primitive == 'points':
+        glBegin(GL_POINTS)
+        for i in range(records):
+            glVertex3f((i % 100) / 50 - 0.99, (i // 100 % 100) / 50 - 0.99, 0)
+        glEnd()
+    else:
+        triangles(records)
+    return buffer, glRenderMode(GL_RENDER)
+
+
+def touch(records):
+    for record in records:
+        pass
+
+
+def cases(records):
+    from OpenGL.GL import GL_3D, GL_3D_COLOR
+    from OpenGL.GL import feedback
+    from OpenGL.GL.selection import GLSelectRecord
+    for depth in (1, 2):
+        buffer, total = selection_buffer(records, depth)
+        yield (
+            f'select {total} hits, {depth} names',
+            lambda: GLSelectRecord.fromArrayObjects(buffer, total),
+            lambda: GLSelectRecord.fromArray(buffer, total),
+        )
+    for mode, mode_name, primitive in (
+        (GL_3D, '3D', 'points'),
+        (GL_3D, '3D', 'triangles'),
+        (GL_3D_COLOR, '3D_COLOR', 'triangles'),
+    ):
+        buffer, count = feedback_buffer(records, mode, primitive)
+        # the parsers read the buffer type of the latest glFeedbackBuffer
+        yield (
+            f'feedback {mode_name} {records} {primitive}',
+            lambda: feedback.parseFeedbackObjects(buffer, count),
+            lambda: feedback.parseFeedback(buffer, count),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    context = replay.HeadlessContext(64, 64)  # keep the OSMesa buffer alive
+    print(f"{'buffer':>36} {'objects ms':>11} {'numpy ms':>9} {'+ all ms':>9} {'speedup':>8}")
+    for name, objects, decode in cases(args.records):
+        times = [
+            min(timeit.repeat(call, number=1, repeat=args.repeat)) * 1e3
+            for call in (objects, decode, lambda: touch(decode()))
+        ]
+        print(f"{name:>36} {times[0]:11.2f} {times[1]:9.2f} {times[2]:9.2f} {times[0] / times[1]:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Projecting 10000 points with gluProject/gluUnProject and the batched versions
+
+Sets up a gluPerspective/gluLookAt camera and a few model transforms in an
+offscreen context with OpenGL.GL.matrixstack installed, checks the mirrored
+matrices against glGetDoublev, then times mapping --points points to window
+coordinates and back:
+
+    glGet      gluProject/gluUnProject per point, reading both matrices
+               and the viewport from the GL each call (without the mirror)
+    mirror     gluProject/gluUnProject per point, matrices from the mirror
+    many       gluProjectMany/gluUnProjectMany, one call for every point
+
+and reports the largest difference from the per-point GLU results (GL
+keeps float32 matrices, the mirror float64).  Last, what the mirror adds
+to each matrix call it follows.
+
+    PYOPENGL_PLATFORM=osmesa python projection_benchmark.py
+    PYOPENGL_PLATFORM=egl python projection_benchmark.py --points 100000
+"""
+import argparse
+import timeit
+
+import numpy
+
+import replay
+
+
+def camera():
+    from OpenGL.GL import (
+        GL_MODELVIEW, GL_PROJECTION, glLoadIdentity, glMatrixMode, glRotatef,
+        glScalef, glTranslatef, glViewport,
+    )
+    from OpenGL.GLU import gluLookAt, gluPerspective
+    glViewport(0, 0, 800, 600)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    gluPerspective(60, 800 / 600, 0.5, 200)
+    glMatrixMode(GL_MODELVIEW)
+    glLoadIdentity()
+    gluLookAt(0, 20, 60, 0, 0, 0, 0, 1, 0)
+    glTranslatef(3, -2, 1)
+    glRotatef(25, 0.2, 1, 0.1)
+    glScalef(1.5, 1.5, 1.5)
+
+
+def mirror_error():
+    from OpenGL.GL import GL_MODELVIEW, GL_MODELVIEW_MATRIX, GL_PROJECTION, GL_PROJECTION_MATRIX, glGetDoublev
+    from OpenGL.GL import matrixstack
+    return max(
+        numpy.abs(matrixstack.STACKS.matrix(mode) - glGetDoublev(query)).max()
+        for mode, query in ((GL_MODELVIEW, GL_MODELVIEW_MATRIX), (GL_PROJECTION, GL_PROJECTION_MATRIX))
+    )
+
+
+def per_point(function, points):
+    return numpy.array([function(*point) for point in points])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--points', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    context = replay.HeadlessContext(800, 600)  # keep the OSMesa buffer alive
+    from OpenGL.GL import matrixstack
+    matrixstack.install()
+    from OpenGL import GL
+    from OpenGL.GLU import gluProject, gluProjectMany, gluUnProject, gluUnProjectMany
+    camera()
+    print(f"mirrored matrices differ from glGetDoublev by at most {mirror_error():.2e}")
+
+    def without_mirror(call):
+        def run():
+            stacks = matrixstack.STACKS
+            matrixstack.STACKS = None
+            try:
+                return call()
+            finally:
+                matrixstack.STACKS = stacks
+        return run
+
+    points = numpy.random.default_rng(1).uniform(-20, 20, (args.points, 3))
+    reference = without_mirror(lambda: per_point(gluProject, points))()
+    windows = reference.copy()
+    unprojected = without_mirror(lambda: per_point(gluUnProject, windows))()
+
+    cases = [
+        ('gluProject', [
+            ('glGet', without_mirror(lambda: per_point(gluProject, points)), reference),
+            ('mirror', lambda: per_point(gluProject, points), reference),
+            ('many', lambda: gluProjectMany(points), reference),
+        ]),
+        ('gluUnProject', [
+            ('glGet', without_mirror(lambda: per_point(gluUnProject, windows)), unprojected),
+            ('mirror', lambda: per_point(gluUnProject, windows), unprojected),
+            ('many', lambda: gluUnProjectMany(windows), unprojected),
+        ]),
+    ]
+    print(f"{args.points} points")
+    print(f"{'':>13} {'':>7} {'ms':>9} {'us/point':>9} {'max diff':>9}")
+    for name, runs in cases:
+        for label, call, expected in runs:
+            best = min(timeit.repeat(call, number=1, repeat=args.repeat))
+            error = numpy.abs(call() - expected).max()
+            print(f"{name:>13} {label:>7} {best * 1e3:9.2f} {best / args.points * 1e6:9.3f} {error:9.2e}")
+
+    print(f"{'call':>22} {'plain us':>9} {'mirrored us':>12}")
+    originals = matrixstack.STACKS.originals
+
+    def calls(get):
+        return [
+            ('glTranslatef', lambda: get('glTranslatef')(1.0, 2.0, 3.0)),
+            ('glRotatef', lambda: get('glRotatef')(10.0, 0.0, 1.0, 0.0)),
+            ('glPushMatrix+glPopMatrix', lambda: (get('glPushMatrix')(), get('glPopMatrix')())),
+        ]
+    plain = calls(lambda name: originals[('OpenGL.GL', name)])
+    mirrored = calls(lambda name: getattr(GL, name))
+    for (name, before), (_, after) in zip(plain, mirrored):
+        times = [
+            min(timeit.repeat(call, number=2000, repeat=args.repeat)) / 2000 * 1e6
+            for call in (before, after)
+        ]
+        print(f"{name:>22} {times[0]:9.2f} {times[1]:12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""Deterministic input replays and headless benchmarking helpers
+
+A replay file is the RNG seed plus every keyboard/special-key event tagged
+with the logic tick it arrived before, so re-running it against a freshly
+seeded game reproduces the session exactly.  Replays are re-run without a
+window against an offscreen context (OSMesa, selected with
+PYOPENGL_PLATFORM=osmesa, or EGL pbuffers) and can report time spent per
+drawing phase, GL calls made and a hash of the final game state.
+
+File layout (little endian):
+
+    header  4s magic, H version, Q seed
+    events  I tick, B kind, H key      (repeated)
+"""
+import struct
+import time
+from collections import Counter
+
+MAGIC = b'CDRP'
+VERSION = 1
+HEADER = struct.Struct('<4sHQ')
+EVENT = struct.Struct('<IBH')
+
+KEYBOARD = 0
+SPECIAL = 1
+END = 2
+
+
+class ReplayRecorder:
+    def __init__(self, path, seed):
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed))
+        self.file.flush()
+
+    def record(self, tick, kind, key):
+        if kind == KEYBOARD:
+            key = key[0]  # GLUT hands keyboard keys over as one byte
+        self.file.write(EVENT.pack(tick, kind, key))
+        self.file.flush()
+
+    def close(self, tick):
+        """Mark how many ticks the session ran for and close the file"""
+        if not self.file.closed:
+            self.file.write(EVENT.pack(tick, END, 0))
+            self.file.close()
+
+
+def load_replay(path):
+    """Return (seed, events, end_tick) where events are (tick, kind, key)"""
+    with open(path, 'rb') as replay_file:
+        data = replay_file.read()
+    magic, version, seed = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} replay file")
+
+    events = []
+    end_tick = 0
+    for tick, kind, key in EVENT.iter_unpack(data[HEADER.size:]):
+        end_tick = max(end_tick, tick)
+        if kind == KEYBOARD:
+            events.append((tick, kind, bytes([key])))
+        elif kind == SPECIAL:
+            events.append((tick, kind, key))
+    return seed, events, end_tick
+
+
+class HeadlessContext:
+    """Offscreen GL context for the platform PyOpenGL was loaded with"""
+
+    def __init__(self, width, height):
+        from OpenGL import platform
+        self.width = width
+        self.height = height
+        name = type(platform.PLATFORM).__name__
+        if name == 'OSMesaPlatform':
+            self.make_osmesa()
+        elif name == 'EGLPlatform':
+            self.make_egl()
+        else:
+            raise RuntimeError(
+                f"No headless context for {name}, run with PYOPENGL_PLATFORM=osmesa (or egl)")
+
+    def make_osmesa(self):
+        from OpenGL import GL, arrays, osmesa
+        self.context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        self.buffer = arrays.GLubyteArray.zeros((self.height, self.width, 4))
+        if not osmesa.OSMesaMakeCurrent(self.context, self.buffer, GL.GL_UNSIGNED_BYTE,
+                                        self.width, self.height):
+            raise RuntimeError("OSMesaMakeCurrent failed")
+
+    def make_egl(self):
+        import ctypes
+        from OpenGL import EGL
+        display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise RuntimeError("eglInitialize failed")
+        attributes = (EGL.EGLint * 11)(
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE,
+        )
+        config = EGL.EGLConfig()
+        count = EGL.EGLint()
+        EGL.eglChooseConfig(display, attributes, ctypes.pointer(config), 1, ctypes.pointer(count))
+        size = (EGL.EGLint * 5)(EGL.EGL_WIDTH, self.width, EGL.EGL_HEIGHT, self.height, EGL.EGL_NONE)
+        surface = EGL.eglCreatePbufferSurface(display, config, size)
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self.context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, None)
+        if not EGL.eglMakeCurrent(display, surface, surface, self.context):
+            raise RuntimeError("eglMakeCurrent failed")
+        self.display = display
+        self.surface = surface
+
+
+class PhaseTimer:
+    """Times calls to named methods of an object by wrapping them in place"""
+
+    def __init__(self, target, phases):
+        self.totals = dict.fromkeys(phases.values(), 0.0)
+        self.calls = Counter()
+        for method, phase in phases.items():
+            setattr(target, method, self.wrap(getattr(target, method), phase))
+
+    def wrap(self, function, phase):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.totals[phase] += time.perf_counter() - start
+                self.calls[phase] += 1
+        return timed
+
+
+class CallCounter:
+    """Counts calls to the gl*/glu*/glut* functions a set of modules imported"""
+
+    def __init__(self, *modules):
+        self.counts = Counter()
+        for module in modules:
+            for name, value in list(vars(module).items()):
+                if name.startswith('gl') and callable(value) and not isinstance(value, type):
+                    setattr(module, name, self.wrap(value, name))
+
+    def wrap(self, function, name):
+        counts = self.counts
+
+        def counted(*args, **kwargs):
+            counts[name] += 1
+            return function(*args, **kwargs)
+        return counted
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
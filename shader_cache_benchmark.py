@@ -0,0 +1,132 @@
+"""Startup cost of building shader programs with and without the binary cache
+
+Each run is a fresh interpreter building --programs lit, textured GLSL
+programs (variations of one shader, as a game's material set would be)
+with OpenGL.GL.shaders.compileProgram, then drawing a triangle with each
+(llvmpipe generates its machine code at the first draw):
+
+    source  no cache, every program compiled and linked
+    cold    an empty OpenGL.GL.programcache directory, so compiled and
+            linked as well as stored
+    warm    the directory the cold run filled, programs loaded with
+            glProgramBinary
+
+Every run gets a new, empty Mesa shader cache (MESA_SHADER_CACHE_DIR), so
+Mesa's own cache never hides the compile cost.  (It can't be disabled
+instead: Mesa only offers program binaries with its cache enabled.)
+
+    PYOPENGL_PLATFORM=osmesa python shader_cache_benchmark.py
+    PYOPENGL_PLATFORM=egl python shader_cache_benchmark.py --programs 60
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+PROBE = """
+import sys, time
+import replay
+context = replay.HeadlessContext(64, 64)
+from OpenGL.GL import *
+from OpenGL.GL import shaders, programcache
+
+VERTEX = '''#version 120
+attribute vec3 position;
+attribute vec3 normal;
+attribute vec2 uv;
+uniform mat4 mvp;
+uniform mat3 normalMatrix;
+varying vec3 vNormal;
+varying vec2 vUv;
+varying float vFog;
+void main() {
+    vec4 p = mvp * vec4(position, 1.0);
+    vNormal = normalize(normalMatrix * normal);
+    vUv = uv * %(scale)d.0;
+    vFog = clamp(p.z / 100.0, 0.0, 1.0);
+    gl_Position = p;
+}
+'''
+FRAGMENT = '''#version 120
+uniform sampler2D diffuse;
+uniform vec3 lights[4];
+uniform vec3 lightColors[4];
+uniform vec3 fogColor;
+varying vec3 vNormal;
+varying vec2 vUv;
+varying float vFog;
+void main() {
+    vec3 base = texture2D(diffuse, vUv).rgb * vec3(%(tint)s);
+    vec3 colour = vec3(0.1) * base;
+    for (int i = 0; i < 4; i++) {
+        float d = max(dot(normalize(vNormal), normalize(lights[i])), 0.0);
+        colour += base * lightColors[i] * pow(d, %(power)d.0);
+    }
+    gl_FragColor = vec4(mix(colour, fogColor, vFog), 1.0);
+}
+'''
+
+count, directory = int(sys.argv[1]), sys.argv[2]
+cache = programcache.ProgramCache(directory) if directory != '-' else False
+start = time.perf_counter()
+programs = []
+for i in range(count):
+    values = {'scale': i + 1, 'tint': '%.2f' % (i / count), 'power': i % 8 + 1}
+    programs.append(shaders.compileProgram(
+        (VERTEX % values, GL_VERTEX_SHADER),
+        (FRAGMENT % values, GL_FRAGMENT_SHADER),
+        cache=cache,
+    ))
+built = time.perf_counter()
+for program in programs:
+    glUseProgram(program)
+    glBegin(GL_TRIANGLES)
+    glVertexAttrib3f(0, -1, -1, 0)
+    glVertexAttrib3f(0, 1, -1, 0)
+    glVertexAttrib3f(0, -1, 1, 0)
+    glEnd()
+glFinish()
+drawn = time.perf_counter()
+print(built - start, drawn - built, cache.hits if cache else 0)
+"""
+
+
+def run(programs, directory):
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as mesa_cache:
+        env = dict(
+            os.environ,
+            PYTHONPATH=here + os.pathsep + os.environ.get('PYTHONPATH', ''),
+            MESA_SHADER_CACHE_DIR=mesa_cache,
+        )
+        env.pop('MESA_SHADER_CACHE_DISABLE', None)
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE, str(programs), directory],
+            capture_output=True, text=True, env=env, check=True,
+        ).stdout
+    build, draw, hits = output.split()
+    return float(build), float(draw), int(hits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--programs', type=int, default=40)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    results = {'source': [], 'cold': [], 'warm': []}
+    for _ in range(args.runs):
+        results['source'].append(run(args.programs, '-'))
+        with tempfile.TemporaryDirectory() as directory:
+            results['cold'].append(run(args.programs, directory))
+            results['warm'].append(run(args.programs, directory))
+    print(f"{args.programs} programs")
+    print(f"{'':>7} {'build ms':>9} {'ms/program':>11} {'first draws ms':>15} {'cache hits':>11}")
+    for name, times in results.items():
+        build, draw, hits = min(times)
+        print(f"{name:>7} {build * 1e3:9.1f} {build / args.programs * 1e3:11.2f} {draw * 1e3:15.1f} {hits:11d}")
+
+
+if __name__ == '__main__':
+    main()
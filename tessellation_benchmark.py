@@ -0,0 +1,149 @@
+"""Tessellating glyph-like polygons with GLU callbacks and with tessellate()
+
+Builds --polygons polygons shaped like letter outlines (a wavy outer
+contour with one or two holes, --points points on the outer one) and
+triangulates them with GLU:
+
+    callbacks  gluTessVertex per point with Python vertex, begin, end and
+               combine callbacks collecting the triangles, as GLU code
+               written against OpenGL.GLU does
+    tessellate OpenGL.GLU.tessellate, contour arrays in and vertex and
+               triangle index arrays out
+    threads    tessellate mapped over a --threads thread pool
+
+checking that every triangulation covers the polygon's area, and reports
+the memory still held by the callback tessellator once all polygons are
+done.  No GL context is needed.
+
+    python tessellation_benchmark.py
+    python tessellation_benchmark.py --polygons 5000 --points 200
+"""
+import argparse
+import math
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+
+from OpenGL import GLU
+from OpenGL.GLU import tessellate
+
+
+def ring(centre, radius, points, wobble, clockwise=False):
+    angles = numpy.linspace(0, 2 * math.pi, points, endpoint=False)
+    if clockwise:
+        angles = angles[::-1]
+    radii = radius * (1 + wobble * numpy.sin(angles * 7))
+    return numpy.c_[centre[0] + radii * numpy.cos(angles), centre[1] + radii * numpy.sin(angles)]
+
+
+def glyphs(count, points):
+    rng = numpy.random.default_rng(5)
+    result = []
+    for i in range(count):
+        x, y = rng.uniform(0, 1000, 2)
+        size = rng.uniform(5, 20)
+        contours = [ring((x, y), size, points, 0.1)]
+        holes = 1 + i % 2
+        for hole in range(holes):
+            offset = (hole - (holes - 1) / 2) * size * 0.8
+            contours.append(ring((x + offset, y), size * 0.3, points // 3, 0.05, clockwise=True))
+        result.append(contours)
+    return result
+
+
+def area(contours):
+    total = 0.0
+    for contour in contours:
+        x, y = contour[:, 0], contour[:, 1]
+        total += (numpy.dot(x, numpy.roll(y, -1)) - numpy.dot(y, numpy.roll(x, -1))) / 2
+    return abs(total)
+
+
+def triangle_area(vertices, triangles):
+    a, b, c = (vertices[triangles[:, i], :2] for i in range(3))
+    ab, ac = b - a, c - a
+    return numpy.abs(ab[:, 0] * ac[:, 1] - ab[:, 1] * ac[:, 0]).sum() / 2
+
+
+class Callbacks:
+    """Triangles through the per-vertex callback API"""
+
+    def __init__(self):
+        self.tess = GLU.gluNewTess()
+        self.triangles = []
+        GLU.gluTessProperty(self.tess, GLU.GLU_TESS_WINDING_RULE, GLU.GLU_TESS_WINDING_ODD)
+        GLU.gluTessCallback(self.tess, GLU.GLU_TESS_EDGE_FLAG_DATA, lambda flag, data: None)
+        GLU.gluTessCallback(self.tess, GLU.GLU_TESS_BEGIN_DATA, lambda mode, data: None)
+        GLU.gluTessCallback(self.tess, GLU.GLU_TESS_VERTEX_DATA, lambda vertex, data: data.append(vertex))
+        GLU.gluTessCallback(self.tess, GLU.GLU_TESS_END_DATA, lambda data: None)
+        GLU.gluTessCallback(self.tess, GLU.GLU_TESS_COMBINE_DATA, lambda coords, vertex, weight, data: tuple(coords))
+        GLU.gluTessNormal(self.tess, 0, 0, 1)
+
+    def __call__(self, contours):
+        vertices = []
+        GLU.gluTessBeginPolygon(self.tess, vertices)
+        for contour in contours:
+            GLU.gluTessBeginContour(self.tess)
+            for x, y in contour:
+                point = (x, y, 0.0)
+                GLU.gluTessVertex(self.tess, point, point)
+            GLU.gluTessEndContour(self.tess)
+        GLU.gluTessEndPolygon(self.tess)
+        vertices = numpy.array(vertices, dtype='d')
+        return vertices, numpy.arange(len(vertices)).reshape((-1, 3))
+
+
+def held(tess):
+    return len(getattr(tess, 'dataPointers', ())), len(getattr(tess, 'vertexCache', ()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--polygons', type=int, default=2000)
+    parser.add_argument('--points', type=int, default=96)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    polygons = glyphs(args.polygons, args.points)
+    areas = numpy.array([area(contours) for contours in polygons])
+    callbacks = Callbacks()
+
+    def threaded():
+        with ThreadPoolExecutor(args.threads) as pool:
+            return list(pool.map(tessellate, polygons))
+
+    runs = [
+        ('callbacks', lambda: [callbacks(contours) for contours in polygons]),
+        ('tessellate', lambda: [tessellate(contours) for contours in polygons]),
+        ('threads', threaded),
+    ]
+    vertices = sum(len(contour) for contours in polygons for contour in contours)
+    print(f"{args.polygons} polygons, {vertices} vertices")
+    print(f"{'':>10} {'ms':>9} {'us/polygon':>11} {'triangles':>10} {'area err':>9}")
+    for name, call in runs:
+        best = math.inf
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results = call()
+            best = min(best, time.perf_counter() - start)
+        triangles = sum(len(result[1]) for result in results)
+        error = max(abs(triangle_area(*result) - expected) / expected for result, expected in zip(results, areas))
+        print(f"{name:>10} {best * 1e3:9.1f} {best / args.polygons * 1e6:11.1f} {triangles:10d} {error:9.1e}")
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    [callbacks(contours) for contours in polygons]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    pointers, cached = held(callbacks.tess)
+    print(
+        f"callback tessellator after {args.polygons} more polygons: {pointers} data pointers, "
+        f"{cached} cached vertex arrays, {(after - before) / 1024:.0f} KiB more allocated"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Fixed-timestep scheduler for the GLUT games
+
+GLUT timer callbacks fire late whenever drawing takes longer than expected,
+so advancing the simulation once per callback ties game speed to render cost.
+FixedTimestep instead accumulates real elapsed time and runs as many fixed
+logic steps as fit into it, capping the catch-up so a long stall cannot
+trigger an ever-growing burst of updates.  The leftover fraction of a step is
+exposed as alpha for interpolating positions when drawing.
+"""
+import time
+
+
+class FixedTimestep:
+    def __init__(self, step, max_steps=5, clock=time.perf_counter):
+        self.step = step
+        self.max_steps = max_steps
+        self.clock = clock
+        self.last = None
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.dropped = 0
+
+    def reset(self):
+        self.last = None
+        self.accumulator = 0.0
+
+    def advance(self, update):
+        """Run update() once per whole step of real time since the last call"""
+        now = self.clock()
+        if self.last is None:
+            self.last = now
+            return 0
+        self.accumulator += now - self.last
+        self.last = now
+
+        steps = 0
+        while self.accumulator >= self.step and steps < self.max_steps:
+            update()
+            self.accumulator -= self.step
+            steps += 1
+        if self.accumulator >= self.step:
+            # Too far behind to catch up, drop the backlog instead of spiralling
+            behind = int(self.accumulator // self.step)
+            self.dropped += behind
+            self.accumulator -= behind * self.step
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """How far (0..1) real time is between the last step and the next one"""
+        return self.accumulator / self.step
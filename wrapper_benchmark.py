@@ -0,0 +1,158 @@
+"""GL_1_0 wrapper call overhead with the old and the generated wrapper calls
+
+Calls 22 of the OpenGL.GL.VERSION.GL_1_0 wrappers (glGet*v, glColor*v,
+glLightfv, glLoadMatrixf, ...) against an offscreen context and reports
+the best time per call for each, once with OpenGL/wrapper.py as it is
+(one flat call generated per wrapper shape) and once with an older
+wrapper.py (the hand-expanded closures running the argument calculator
+generators), each in a fresh interpreter.  The raw ctypes call with
+ready-made arguments is timed too, as the floor neither can go below.
+
+By default the older wrapper.py is the most recent one in git history
+without generated calls; --old takes any other file:
+
+    PYOPENGL_PLATFORM=osmesa python wrapper_benchmark.py
+    PYOPENGL_PLATFORM=egl python wrapper_benchmark.py --old /tmp/wrapper.py
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+PROBE = """
+import importlib.util, sys, time
+if sys.argv[2]:
+    import OpenGL
+    spec = importlib.util.spec_from_file_location('OpenGL.wrapper', sys.argv[2])
+    module = sys.modules['OpenGL.wrapper'] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+import replay
+context = replay.HeadlessContext(64, 64)
+import numpy
+from OpenGL.GL import *
+from OpenGL.raw.GL.VERSION import GL_1_0 as raw
+
+calls_per_run = int(sys.argv[1])
+glBindTexture(GL_TEXTURE_2D, glGenTextures(1))
+matrix, matrix_d = numpy.identity(4, 'f'), numpy.identity(4)
+colour, vector = (1.0, 0.0, 0.0, 1.0), (0.0, 0.0, 1.0, 0.0)
+CALLS = [
+    (glGetIntegerv, (GL_VIEWPORT,)),
+    (glGetFloatv, (GL_MODELVIEW_MATRIX,)),
+    (glGetDoublev, (GL_PROJECTION_MATRIX,)),
+    (glGetBooleanv, (GL_BLEND,)),
+    (glColor3fv, (colour[:3],)),
+    (glColor4fv, (colour,)),
+    (glColor3dv, (colour[:3],)),
+    (glNormal3fv, (vector[:3],)),
+    (glTexCoord2fv, (vector[:2],)),
+    (glRasterPos2fv, (vector[:2],)),
+    (glLightfv, (GL_LIGHT0, GL_POSITION, vector)),
+    (glMaterialfv, (GL_FRONT, GL_DIFFUSE, colour)),
+    (glFogfv, (GL_FOG_COLOR, colour)),
+    (glLoadMatrixf, (matrix,)),
+    (glMultMatrixd, (matrix_d,)),
+    (glTexParameterfv, (GL_TEXTURE_2D, GL_TEXTURE_BORDER_COLOR, colour)),
+    (glGetTexParameteriv, (GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER)),
+    (glGetLightfv, (GL_LIGHT0, GL_POSITION)),
+    (glGetMaterialfv, (GL_FRONT, GL_DIFFUSE)),
+    (glClipPlane, (GL_CLIP_PLANE0, vector)),
+    (glGetClipPlane, (GL_CLIP_PLANE0,)),
+    (glGetTexLevelParameteriv, (GL_TEXTURE_2D, 0, GL_TEXTURE_WIDTH)),
+]
+
+def best(function, args):
+    for _ in range(200):
+        function(*args)
+    result = None
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(calls_per_run):
+            function(*args)
+        elapsed = (time.perf_counter() - start) / calls_per_run
+        result = elapsed if result is None else min(result, elapsed)
+    return result
+
+for function, args in CALLS:
+    print(function.__name__, best(function, args))
+buffer = (GLfloat * 16)()
+print('raw glGetFloatv', best(raw.glGetFloatv, (GL_MODELVIEW_MATRIX, buffer)))
+"""
+
+
+def old_wrapper():
+    """Source of the latest wrapper.py in git history without generated calls"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    revisions = subprocess.run(
+        ['git', 'log', '--format=%H', '--', 'OpenGL/wrapper.py'],
+        cwd=here, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    for revision in revisions:
+        source = subprocess.run(
+            ['git', 'show', f'{revision}:OpenGL/wrapper.py'],
+            cwd=here, capture_output=True, text=True, check=True,
+        ).stdout
+        if '_callFactory' not in source:
+            return revision[:7], source
+    raise SystemExit("no wrapper.py without generated calls in git history, use --old")
+
+
+def run(wrapper_path, calls):
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=here + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, str(calls), wrapper_path],
+        capture_output=True, text=True, env=env, check=True,
+    ).stdout
+    times = {}
+    for line in output.splitlines():
+        name, seconds = line.rsplit(' ', 1)
+        times[name] = float(seconds)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--old', help='wrapper.py to compare with (default: from git history)')
+    parser.add_argument('--calls', type=int, default=3000, help='calls per timed run')
+    parser.add_argument('--runs', type=int, default=3, help='fresh interpreters per wrapper.py')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.old:
+            label, old_path = args.old, args.old
+        else:
+            revision, source = old_wrapper()
+            label = f'wrapper.py at {revision}'
+            old_path = os.path.join(directory, 'wrapper.py')
+            with open(old_path, 'w') as handle:
+                handle.write(source)
+        modes = [('old', old_path), ('generated', '')]
+        results = {name: [] for name, _ in modes}
+        # interleave the interpreters so drift on a noisy machine hits both
+        for _ in range(args.runs):
+            for name, path in modes:
+                results[name].append(run(path, args.calls))
+    best = {
+        name: {call: min(times[call] for times in runs) for call in runs[0]}
+        for name, runs in results.items()
+    }
+    old, generated = best['old'], best['generated']
+    print(f"old: {label}")
+    print(f"{'':>25} {'old us':>8} {'gen us':>8} {'change':>7}")
+    wrapped = [call for call in old if not call.startswith('raw ')]
+    for call in wrapped:
+        print(f"{call:>25} {old[call] * 1e6:8.2f} {generated[call] * 1e6:8.2f} "
+              f"{(generated[call] / old[call] - 1) * 100:6.1f}%")
+    old_mean = sum(old[call] for call in wrapped) / len(wrapped)
+    generated_mean = sum(generated[call] for call in wrapped) / len(wrapped)
+    print(f"{'mean':>25} {old_mean * 1e6:8.2f} {generated_mean * 1e6:8.2f} "
+          f"{(generated_mean / old_mean - 1) * 100:6.1f}%")
+    floor = min(old['raw glGetFloatv'], generated['raw glGetFloatv'])
+    print(f"raw glGetFloatv with a ready buffer: {floor * 1e6:.2f} us; wrapper overhead above it "
+          f"{(old_mean - floor) * 1e6:.2f} -> {(generated_mean - floor) * 1e6:.2f} us")
+
+
+if __name__ == '__main__':
+    main()